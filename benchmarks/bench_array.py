@@ -0,0 +1,66 @@
+"""
+Per-element throughput of the batched HurwitzQuaternionArray against a loop over HurwitzQuaternion.
+
+    python benchmarks/bench_array.py [--size N] [--sample N]
+
+The scalar loop is timed on a sample and scaled up to the full size.
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+
+from hurwitz.array import HurwitzQuaternionArray, snap_many
+from hurwitz.hurwitz import HurwitzQuaternion
+
+
+def timed(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=10 ** 6, help="number of quaternions per array")
+    parser.add_argument("--sample", type=int, default=50000, help="number of scalar operations actually timed")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    # an even mix of whole and half quaternions on both sides
+    x = rng.integers(-1000, 1000, (args.size, 4)) * 2
+    y = rng.integers(-1000, 1000, (args.size, 4)) * 2
+    x[::2] += 1
+    y[1::2] += 1
+    xs, ys = HurwitzQuaternionArray(x), HurwitzQuaternionArray(y)
+    xq, yq = xs[:args.sample].to_quaternions(), ys[:args.sample].to_quaternions()
+    points = rng.uniform(-1000, 1000, (args.size, 4))
+    point_tuples = [tuple(p) for p in points[:args.sample].tolist()]
+    origin = HurwitzQuaternion(0, 0, 0, 0)
+
+    cases = {
+        "add": (lambda: xs + ys, lambda: [p + q for p, q in zip(xq, yq)]),
+        "mul": (lambda: xs * ys, lambda: [p * q for p, q in zip(xq, yq)]),
+        "conjugate": (lambda: xs.conjugate(), lambda: [p.conjugate() for p in xq]),
+        "reduced_norm": (lambda: xs.reduced_norm(), lambda: [p.reduced_norm() for p in xq]),
+        "euclidean_division": (lambda: xs.euclidean_division(ys), lambda: [p.euclidean_division(q) for p, q in zip(xq, yq)]),
+        "snap": (lambda: snap_many(points), lambda: [origin.snap(p) for p in point_tuples]),
+    }
+    scale = args.size / args.sample
+    print(f"{'ns/element':<20}{'batched':>12}{'scalar':>12}{'speedup':>10}")
+    for name, (batched, scalar) in cases.items():
+        batched_time = timed(batched) / args.size
+        scalar_time = timed(scalar, repeat=1) * scale / args.size
+        print(f"{name:<20}{batched_time * 1e9:>12.1f}{scalar_time * 1e9:>12.1f}{scalar_time / batched_time:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Memory and throughput comparison of the compact HurwitzQuaternion against a baseline implementation.
+
+    python benchmarks/bench_compact.py [--baseline path/to/hurwitz.py] [--number N]
+
+The baseline defaults to the 1.0.0 release copy in build/lib, which still builds the unit sets per instance.
+"""
+import argparse
+import importlib.util
+import os
+import sys
+import timeit
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from hurwitz.hurwitz import HurwitzQuaternion
+
+DEFAULT_BASELINE = os.path.join(ROOT, "build", "lib", "hurwitz", "hurwitz.py")
+
+
+def load_baseline(path):
+    spec = importlib.util.spec_from_file_location("hurwitz_baseline", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.HurwitzQuaternion
+
+
+def bytes_per_instance(cls, count=10000):
+    # average traced allocation for `count` live instances, split evenly between whole and half
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    keep = [cls(i, i + 1, i + 2, i + 3) for i in range(count // 2)]
+    keep += [cls(2 * i + 1, 2 * i + 3, 2 * i + 5, 2 * i + 7, True) for i in range(count // 2)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del keep
+    return size / count
+
+
+def throughput(cls, number):
+    w1, w2 = cls(1, 2, 3, 4), cls(5, -6, 7, -8)
+    h1, h2 = cls(1, 3, 5, 7, True), cls(-3, 5, -7, 9, True)
+    cases = {
+        "construct": lambda: cls(1, 2, 3, 4),
+        "add whole": lambda: w1 + w2,
+        "add half": lambda: h1 + h2,
+        "sub": lambda: w1 - h1,
+        "mul whole": lambda: w1 * w2,
+        "mul mixed": lambda: w1 * h1,
+        "neg": lambda: -w1,
+        "conjugate": lambda: h1.conjugate(),
+    }
+    return {name: number / timeit.timeit(fn, number=number) for name, fn in cases.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="path to a hurwitz.py to compare against")
+    parser.add_argument("--number", type=int, default=100000, help="iterations per throughput case")
+    args = parser.parse_args()
+
+    classes = {"compact": HurwitzQuaternion}
+    if os.path.exists(args.baseline):
+        classes["baseline"] = load_baseline(args.baseline)
+    else:
+        print(f"baseline {args.baseline} not found, only measuring the compact class")
+
+    memory = {name: bytes_per_instance(cls) for name, cls in classes.items()}
+    rates = {name: throughput(cls, args.number) for name, cls in classes.items()}
+
+    print(f"{'bytes/instance':<16}" + "".join(f"{name:>14}" for name in classes))
+    print(f"{'':<16}" + "".join(f"{memory[name]:>14.1f}" for name in classes))
+    print()
+    print(f"{'ops/sec':<16}" + "".join(f"{name:>14}" for name in classes) + ("     speedup" if len(classes) > 1 else ""))
+    for case in rates["compact"]:
+        row = f"{case:<16}" + "".join(f"{rates[name][case]:>14,.0f}" for name in classes)
+        if "baseline" in rates:
+            row += f"{rates['compact'][case] / rates['baseline'][case]:>11.1f}x"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+End-to-end load test of hurwitz.server on localhost.
+
+    python benchmarks/bench_server.py [--requests N] [--clients N] [--workers N] [--batch-window S]
+
+Starts a server on a free port, sends a mix of divisions, gcds, factorizations and powers from several
+pipelined clients, checks every answer against the local computation and prints the server's metrics.
+The exit status is 1 on any wrong answer.
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from hurwitz.hurwitz import HurwitzQuaternion
+from hurwitz.server import HurwitzClient, HurwitzServer
+
+
+def random_quaternion(rng: random.Random, bound: int) -> HurwitzQuaternion:
+    values = [rng.randint(-bound, bound) for _ in range(4)]
+    if rng.random() < 0.5:
+        return HurwitzQuaternion(*(2 * val + 1 for val in values), True)
+    return HurwitzQuaternion(*values)
+
+
+def workload(rng: random.Random, count: int) -> list:
+    # (method name, args, expected result) triples
+    jobs = []
+    for _ in range(count):
+        a, b = random_quaternion(rng, 10 ** 6), random_quaternion(rng, 10 ** 6)
+        kind = rng.random()
+        if kind < 0.5:
+            jobs.append(('divide', (a, b), a.euclidean_division(b)))
+        elif kind < 0.8:
+            jobs.append(('gcd', (a, b), a.right_gcd(b)))
+        elif kind < 0.9:
+            q = random_quaternion(rng, 1000)
+            jobs.append(('factorize', (q,), q.factorize()))
+        else:
+            power, modulo = rng.randint(0, 100), rng.choice((None, 10 ** 9 + 7))
+            jobs.append(('power', (a, power, modulo), pow(a, power, modulo)))
+    return jobs
+
+
+async def client_run(port: int, jobs: list) -> int:
+    async with await HurwitzClient.connect(port=port) as client:
+        results = await asyncio.gather(*(getattr(client, name)(*args) for name, args, _ in jobs))
+    return sum(result != expected for result, (_, _, expected) in zip(results, jobs))
+
+
+async def run(args) -> int:
+    jobs = workload(random.Random(0), args.requests)
+    async with HurwitzServer(workers=args.workers, batch_window=args.batch_window) as server:
+        start = time.perf_counter()
+        wrong = sum(await asyncio.gather(*(client_run(server.port, jobs[i::args.clients]) for i in range(args.clients))))
+        elapsed = time.perf_counter() - start
+        metrics = server.metrics()
+    print(f"{args.requests} requests from {args.clients} clients in {elapsed:.2f} s "
+          f"({args.requests / elapsed:.0f}/s), {metrics['batches']} batches of {metrics['mean_batch_size']:.1f}")
+    print(f"{'ms':<12}{'count':>8}{'mean':>10}{'p50':>10}{'p99':>10}{'max':>10}")
+    for op, latency in sorted(metrics['operations'].items()):
+        print(f"{op:<12}{latency['count']:>8}" + "".join(f"{latency[key] * 1e3:>10.2f}" for key in ('mean', 'p50', 'p99', 'max')))
+    print(f"{wrong} wrong answers")
+    return wrong
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument("--batch-window", type=float, default=0.002, help="seconds to collect a batch")
+    args = parser.parse_args()
+    if asyncio.run(run(args)):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Checks the compiled core against the pure-Python HurwitzQuaternion methods, then times both.
+
+    python setup.py build_ext --inplace
+    python benchmarks/bench_speedups.py [--count N] [--number N]
+
+Every accelerated operation runs on the same random operands in both modes (small, near the 128-bit
+limits and far beyond them, whole and half, plus the error cases) and must give identical results,
+including the half flag. The exit status is 1 on any mismatch or when the compiled core is missing.
+"""
+import argparse
+import os
+import random
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from hurwitz.hurwitz import HurwitzQuaternion, use_speedups
+
+BITS = (4, 28, 29, 30, 59, 60, 61, 62, 100)
+
+
+def random_quaternion(rng: random.Random, bits: int, half: bool) -> HurwitzQuaternion:
+    values = [rng.getrandbits(bits) * rng.choice((1, -1)) for _ in range(4)]
+    if half:
+        return HurwitzQuaternion(*(2 * val + 1 for val in values), True)
+    return HurwitzQuaternion(*values)
+
+
+def outcome(fn):
+    # comparable result of fn(): quaternions by their stored values and half flag, exceptions by type and message
+    try:
+        result = fn()
+    except Exception as e:
+        return ("raised", type(e).__name__, str(e))
+
+    def flat(value):
+        if isinstance(value, HurwitzQuaternion):
+            return (value.a, value.b, value.c, value.d, value.half)
+        if isinstance(value, tuple):
+            return tuple(flat(val) for val in value)
+        return value
+    return flat(result)
+
+
+def operations(rng: random.Random, count: int) -> list:
+    ops = []
+    for _ in range(count):
+        x = random_quaternion(rng, rng.choice(BITS), rng.random() < 0.5)
+        y = random_quaternion(rng, rng.choice(BITS), rng.random() < 0.5)
+        values = [rng.getrandbits(rng.choice(BITS)) * rng.choice((1, -1)) for _ in range(4)]
+        ops += [
+            lambda x=x, y=y: x + y,
+            lambda x=x, y=y: x - y,
+            lambda x=x, y=y: x * y,
+            lambda x=x: x * 3,
+            lambda x=x: x * 2,
+            lambda x=x: x.reduced_norm(),
+            lambda x=x, y=y: x.euclidean_division(y),
+            lambda x=x, y=y: x.left_euclidean_division(y),
+            lambda v=values: HurwitzQuaternion(*v),
+            lambda v=values: HurwitzQuaternion(*v, half=True),
+            lambda v=values: HurwitzQuaternion(*(2 * val for val in v), True),
+            lambda v=values: HurwitzQuaternion(*(2 * val + 1 for val in v), half=1),
+            lambda v=values: HurwitzQuaternion._make(*v),
+            lambda v=values: HurwitzQuaternion._from_doubled(*(2 * val for val in v)),
+            lambda x=x: HurwitzQuaternion._from_doubled(*x.doubled()),
+        ]
+    zero = HurwitzQuaternion(0, 0, 0, 0)
+    ops += [
+        lambda: HurwitzQuaternion(1, 2, 3, 4).euclidean_division(zero),
+        lambda: HurwitzQuaternion(1, 2, 3, 4).left_euclidean_division(zero),
+        lambda: HurwitzQuaternion(1, 2, 3, 4).euclidean_division(5),
+        lambda: HurwitzQuaternion(1.0, 2, 3, 4),
+        lambda: HurwitzQuaternion(1, 2, 3, 4.0, True),
+        lambda: HurwitzQuaternion(1, 2, 3, 5, True),
+        lambda: HurwitzQuaternion(1, 2, 3),
+        lambda: HurwitzQuaternion(1, 2, 3, 4) + 1,
+        lambda: HurwitzQuaternion(1, 2, 3, 4) * "x",
+    ]
+    return ops
+
+
+def check(count: int) -> int:
+    ops = operations(random.Random(0), count)
+    use_speedups(False)
+    expected = [outcome(op) for op in ops]
+    use_speedups(True)
+    mismatches = 0
+    for op, want in zip(ops, expected):
+        got = outcome(op)
+        if got != want:
+            mismatches += 1
+            if mismatches <= 10:
+                print(f"mismatch: compiled {got!r}, pure Python {want!r}")
+    print(f"{len(ops)} operations checked, {mismatches} mismatches")
+    return mismatches
+
+
+def timings(number: int) -> None:
+    rng = random.Random(1)
+    w1, w2 = random_quaternion(rng, 16, False), random_quaternion(rng, 16, False)
+    h1, h2 = random_quaternion(rng, 16, True), random_quaternion(rng, 16, True)
+    cases = {
+        "construct": lambda: HurwitzQuaternion(1, 2, 3, 4),
+        "construct half": lambda: HurwitzQuaternion(1, 3, 5, 7, True),
+        "add": lambda: w1 + h1,
+        "sub": lambda: w1 - h2,
+        "mul whole": lambda: w1 * w2,
+        "mul half": lambda: h1 * h2,
+        "mul mixed": lambda: w1 * h1,
+        "reduced_norm": lambda: HurwitzQuaternion._from_doubled(*h1.doubled()).reduced_norm(),
+        "euclidean_division": lambda: w1.euclidean_division(h2),
+        "left_euclidean_division": lambda: h1.left_euclidean_division(w2),
+    }
+    print(f"{'ns/call':<28}{'python':>10}{'compiled':>10}{'speedup':>10}")
+    for name, fn in cases.items():
+        use_speedups(False)
+        python = min(timeit.repeat(fn, number=number, repeat=3)) / number
+        use_speedups(True)
+        compiled = min(timeit.repeat(fn, number=number, repeat=3)) / number
+        print(f"{name:<28}{python * 1e9:>10.0f}{compiled * 1e9:>10.0f}{python / compiled:>9.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=2000, help="random operand pairs to check")
+    parser.add_argument("--number", type=int, default=100000, help="calls per timing")
+    args = parser.parse_args()
+    if not use_speedups(True):
+        print("the compiled core is not built, run `python setup.py build_ext --inplace` first")
+        sys.exit(1)
+    if check(args.count):
+        sys.exit(1)
+    timings(args.number)
+
+
+if __name__ == "__main__":
+    main()
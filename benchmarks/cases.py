@@ -0,0 +1,132 @@
+"""
+Benchmark cases for the core HurwitzQuaternion arithmetic.
+
+Each case is a setup function registered with @case. It receives one parameter (usually a coefficient
+bit-size) and returns the zero-argument callable that gets timed.
+"""
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hurwitz.hurwitz import HurwitzQuaternion, sum_quaternions
+from hurwitz.modular import HurwitzModRing
+
+CASES = []
+BITS = (8, 32, 64, 256)
+
+
+def case(name: str, params: tuple = BITS):
+    def register(setup):
+        CASES.append((name, params, setup))
+        return setup
+    return register
+
+
+def random_quaternion(rng: random.Random, bits: int, half: bool) -> HurwitzQuaternion:
+    values = [rng.getrandbits(bits) * rng.choice((1, -1)) for _ in range(4)]
+    if half:
+        return HurwitzQuaternion(*(2 * val + 1 for val in values), True)
+    return HurwitzQuaternion(*values)
+
+
+def operands(bits: int, kinds: str = "ww") -> tuple:
+    # a fixed pair of operands, 'w' for a whole and 'h' for a half quaternion
+    rng = random.Random(bits)
+    return tuple(random_quaternion(rng, bits, kind == "h") for kind in kinds)
+
+
+@case("construct")
+def construct(bits):
+    x, = operands(bits, "w")
+    a, b, c, d = x.a, x.b, x.c, x.d
+    return lambda: HurwitzQuaternion(a, b, c, d)
+
+
+@case("construct_half")
+def construct_half(bits):
+    x, = operands(bits, "h")
+    a, b, c, d = x.a, x.b, x.c, x.d
+    return lambda: HurwitzQuaternion(a, b, c, d, True)
+
+
+for kinds in ("ww", "wh", "hw", "hh"):
+    @case(f"add_{kinds}")
+    def add(bits, kinds=kinds):
+        x, y = operands(bits, kinds)
+        return lambda: x + y
+
+    @case(f"sub_{kinds}")
+    def sub(bits, kinds=kinds):
+        x, y = operands(bits, kinds)
+        return lambda: x - y
+
+    @case(f"mul_{kinds}")
+    def mul(bits, kinds=kinds):
+        x, y = operands(bits, kinds)
+        return lambda: x * y
+
+
+@case("sum_quaternions", (100, 10000))
+def sum_many(count):
+    rng = random.Random(count)
+    terms = [random_quaternion(rng, 32, rng.random() < 0.5) for _ in range(count)]
+    return lambda: sum_quaternions(terms)
+
+
+@case("euclidean_division")
+def euclidean_division(bits):
+    x, y = operands(bits, "wh")
+    return lambda: x.euclidean_division(y)
+
+
+@case("euclidean_division_pro_max")
+def euclidean_division_pro_max(bits):
+    x, y = operands(bits, "wh")
+    return lambda: x.euclidean_division_pro_max(y)
+
+
+@case("pow", (2, 16, 128, 1024))
+def power(exponent):
+    x, = operands(4, "h")
+    return lambda: x ** exponent
+
+
+@case("associates")
+def associates(bits):
+    x, = operands(bits, "h")
+    return lambda: x.associates()
+
+
+@case("snap", (8, 32))
+def snap(bits):
+    rng = random.Random(bits)
+    point = tuple(rng.uniform(-2.0 ** bits, 2.0 ** bits) for _ in range(4))
+    x, = operands(bits, "w")
+    return lambda: x.snap(point)
+
+
+# the list form of decompose has an entry per unit of every coefficient, so it only gets small coefficients
+@case("decompose", (4, 8, 12))
+def decompose(bits):
+    x, = operands(bits, "h")
+    return lambda: x.decompose()
+
+
+@case("decompose_runs")
+def decompose_runs(bits):
+    x, = operands(bits, "h")
+    return lambda: x.decompose("runs")
+
+
+@case("decompose_binomial")
+def decompose_binomial(bits):
+    x, = operands(bits, "h")
+    return lambda: x.decompose_binomial()
+
+
+@case("mod_pow", (16, 128, 1024))
+def mod_pow(exponent):
+    x = HurwitzModRing(2 ** 61 - 1)(operands(64, "h")[0])
+    return lambda: x ** exponent
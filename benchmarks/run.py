@@ -0,0 +1,86 @@
+"""
+Runs the benchmark cases and checks them against a baseline.
+
+    python benchmarks/run.py [-k FILTER] [--output results.json] [--compare baseline.json] [--threshold 0.25]
+
+Results are written as JSON (seconds per call, best of --repeat runs). With --compare, every case that got
+slower than the baseline by more than --threshold is reported and the exit status is 1.
+"""
+import argparse
+import json
+import platform
+import sys
+import timeit
+
+from cases import CASES
+
+
+def measure(fn, repeat: int, min_time: float) -> dict:
+    timer = timeit.Timer(fn)
+    number = 1
+    while timer.timeit(number) < min_time:
+        number *= 2
+    best = min(timer.repeat(repeat, number))
+    return {"seconds": best / number, "number": number, "repeat": repeat}
+
+
+def run(pattern: str, repeat: int, min_time: float) -> dict:
+    results = {}
+    for name, params, setup in CASES:
+        for param in params:
+            key = f"{name}[{param}]"
+            if pattern and pattern not in key:
+                continue
+            results[key] = measure(setup(param), repeat, min_time)
+            print(f"{key:<40}{results[key]['seconds'] * 1e6:>14.3f} us", flush=True)
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    # cases slower than baseline * (1 + threshold), as (key, baseline seconds, current seconds)
+    regressions = []
+    print()
+    print(f"{'case':<40}{'baseline us':>14}{'current us':>14}{'ratio':>8}")
+    for key, result in results.items():
+        if key not in baseline:
+            continue
+        before, after = baseline[key]["seconds"], result["seconds"]
+        ratio = after / before
+        flag = "  REGRESSION" if ratio > 1 + threshold else ""
+        print(f"{key:<40}{before * 1e6:>14.3f}{after * 1e6:>14.3f}{ratio:>8.2f}{flag}")
+        if flag:
+            regressions.append((key, before, after))
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", dest="pattern", default="", help="only run cases whose id contains this string")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON file from an earlier run")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown, 0.25 means 25%%")
+    parser.add_argument("--repeat", type=int, default=5, help="timing runs per case, the best one counts")
+    parser.add_argument("--min-time", type=float, default=0.05, help="minimum seconds per timing run")
+    args = parser.parse_args()
+
+    results = run(args.pattern, args.repeat, args.min_time)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "python": platform.python_version(),
+                "implementation": platform.python_implementation(),
+                "machine": platform.machine(),
+                "results": results,
+            }, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} case(s) regressed by more than {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,559 @@
+/*
+ * Compiled core of HurwitzQuaternion: construction, addition, subtraction, the Hamilton product,
+ * the reduced norm and the right and left Euclidean division.
+ *
+ * install() reads the slot offsets of the HurwitzQuaternion class and returns replacement methods
+ * that work on those slots directly. Everything is computed on doubled coordinates in 128-bit
+ * integers. When a coordinate is too large for that, or an operand is not a HurwitzQuaternion, the
+ * method hands the call to the pure-Python implementation it was given, so results are identical.
+ */
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <structmember.h>
+
+#if PY_VERSION_HEX < 0x03090000
+/* Python 3.8 has no PyObject_CallOneArg */
+#define PyObject_CallOneArg(function, arg) PyObject_CallFunctionObjArgs((function), (arg), NULL)
+#endif
+
+typedef __int128 i128;
+
+/* doubled coordinates below these magnitudes cannot overflow the 128-bit intermediates */
+#define ARITHMETIC_LIMIT (1LL << 61)
+#define DIVISION_LIMIT (1LL << 30)
+
+static PyTypeObject *quaternion_type = NULL;
+static Py_ssize_t offset_a, offset_b, offset_c, offset_d, offset_half, offset_norm;
+static PyObject *fallback_init, *fallback_add, *fallback_sub, *fallback_mul;
+static PyObject *fallback_reduced_norm, *fallback_division, *fallback_left_division;
+
+#define SLOT(obj, offset) (*(PyObject **)((char *)(obj) + (offset)))
+
+static void
+set_slot(PyObject *obj, Py_ssize_t offset, PyObject *value)
+{
+    /* steals value */
+    PyObject *old = SLOT(obj, offset);
+    SLOT(obj, offset) = value;
+    Py_XDECREF(old);
+}
+
+static int
+is_quaternion(PyObject *obj)
+{
+    return PyObject_TypeCheck(obj, quaternion_type);
+}
+
+/* the value of an int that fits in a long long, with *ok cleared when it does not */
+static long long
+small_int(PyObject *value, int *ok)
+{
+    int overflow;
+    long long result;
+    if (value == NULL || !PyLong_Check(value)) {
+        *ok = 0;
+        return 0;
+    }
+    result = PyLong_AsLongLongAndOverflow(value, &overflow);
+    if (overflow || (result == -1 && PyErr_Occurred())) {
+        PyErr_Clear();
+        *ok = 0;
+        return 0;
+    }
+    return result;
+}
+
+/* doubled coordinates of q, 1 if all of them are below limit in magnitude and 0 otherwise */
+static int
+load(PyObject *q, long long limit, i128 x[4])
+{
+    PyObject *half = SLOT(q, offset_half);
+    Py_ssize_t offsets[4] = {offset_a, offset_b, offset_c, offset_d};
+    int ok = 1, is_half, i;
+    if (half == NULL)
+        return 0;
+    if (half == Py_True || half == Py_False) {
+        is_half = half == Py_True;
+    }
+    else {
+        is_half = PyObject_IsTrue(half);
+        if (is_half < 0) {
+            PyErr_Clear();
+            return 0;
+        }
+    }
+    for (i = 0; i < 4; i++) {
+        long long value = small_int(SLOT(q, offsets[i]), &ok);
+        if (!ok || value >= limit || value <= -limit)
+            return 0;
+        x[i] = is_half ? (i128)value : 2 * (i128)value;
+        if (x[i] >= limit || x[i] <= -limit)
+            return 0;
+    }
+    return 1;
+}
+
+static PyObject *
+int_from_i128(i128 value)
+{
+    PyObject *high, *shift, *shifted, *low, *result;
+    if (value >= LLONG_MIN && value <= LLONG_MAX)
+        return PyLong_FromLongLong((long long)value);
+    /* value = high * 2^64 + low with 0 <= low < 2^64 */
+    high = PyLong_FromLongLong((long long)(value >> 64));
+    if (high == NULL)
+        return NULL;
+    shift = PyLong_FromLong(64);
+    if (shift == NULL) {
+        Py_DECREF(high);
+        return NULL;
+    }
+    shifted = PyNumber_Lshift(high, shift);
+    Py_DECREF(high);
+    Py_DECREF(shift);
+    if (shifted == NULL)
+        return NULL;
+    low = PyLong_FromUnsignedLongLong((unsigned long long)value);
+    if (low == NULL) {
+        Py_DECREF(shifted);
+        return NULL;
+    }
+    result = PyNumber_Add(shifted, low);
+    Py_DECREF(shifted);
+    Py_DECREF(low);
+    return result;
+}
+
+static PyObject *
+new_quaternion(PyTypeObject *type, PyObject *a, PyObject *b, PyObject *c, PyObject *d, PyObject *half)
+{
+    /* steals a, b, c and d, which may be NULL after a failed conversion */
+    PyObject *q;
+    if (a == NULL || b == NULL || c == NULL || d == NULL)
+        goto error;
+    q = type->tp_alloc(type, 0);
+    if (q == NULL)
+        goto error;
+    SLOT(q, offset_a) = a;
+    SLOT(q, offset_b) = b;
+    SLOT(q, offset_c) = c;
+    SLOT(q, offset_d) = d;
+    Py_INCREF(half);
+    SLOT(q, offset_half) = half;
+    return q;
+error:
+    Py_XDECREF(a);
+    Py_XDECREF(b);
+    Py_XDECREF(c);
+    Py_XDECREF(d);
+    return NULL;
+}
+
+/* the quaternion with doubled coordinates x, all odd (half) or all even (whole) */
+static PyObject *
+from_doubled(const i128 x[4])
+{
+    if (x[0] & 1)
+        return new_quaternion(quaternion_type, int_from_i128(x[0]), int_from_i128(x[1]),
+                              int_from_i128(x[2]), int_from_i128(x[3]), Py_True);
+    return new_quaternion(quaternion_type, int_from_i128(x[0] >> 1), int_from_i128(x[1] >> 1),
+                          int_from_i128(x[2] >> 1), int_from_i128(x[3] >> 1), Py_False);
+}
+
+static void
+hamilton(const i128 x[4], const i128 y[4], i128 out[4])
+{
+    out[0] = x[0] * y[0] - x[1] * y[1] - x[2] * y[2] - x[3] * y[3];
+    out[1] = x[0] * y[1] + x[1] * y[0] + x[2] * y[3] - x[3] * y[2];
+    out[2] = x[0] * y[2] - x[1] * y[3] + x[2] * y[0] + x[3] * y[1];
+    out[3] = x[0] * y[3] + x[1] * y[2] - x[2] * y[1] + x[3] * y[0];
+}
+
+static PyObject *
+call_fallback(PyObject *function, PyObject *self, PyObject *other)
+{
+    return PyObject_CallFunctionObjArgs(function, self, other, NULL);
+}
+
+static PyObject *
+quaternion_add(PyObject *self, PyObject *other)
+{
+    i128 x[4], y[4], out[4];
+    int i;
+    if (!is_quaternion(other) || !load(self, ARITHMETIC_LIMIT, x) || !load(other, ARITHMETIC_LIMIT, y))
+        return call_fallback(fallback_add, self, other);
+    for (i = 0; i < 4; i++)
+        out[i] = x[i] + y[i];
+    return from_doubled(out);
+}
+
+static PyObject *
+quaternion_sub(PyObject *self, PyObject *other)
+{
+    i128 x[4], y[4], out[4];
+    int i;
+    if (!is_quaternion(other) || !load(self, ARITHMETIC_LIMIT, x) || !load(other, ARITHMETIC_LIMIT, y))
+        return call_fallback(fallback_sub, self, other);
+    for (i = 0; i < 4; i++)
+        out[i] = x[i] - y[i];
+    return from_doubled(out);
+}
+
+static PyObject *
+quaternion_mul(PyObject *self, PyObject *other)
+{
+    i128 x[4], y[4], out[4];
+    int i;
+    if (!is_quaternion(other) || !load(self, ARITHMETIC_LIMIT, x) || !load(other, ARITHMETIC_LIMIT, y))
+        return call_fallback(fallback_mul, self, other);
+    /* D(xy) = D(x)D(y)/2 */
+    hamilton(x, y, out);
+    for (i = 0; i < 4; i++)
+        out[i] >>= 1;
+    return from_doubled(out);
+}
+
+static PyObject *
+quaternion_reduced_norm(PyObject *self, PyObject *Py_UNUSED(ignored))
+{
+    PyObject *norm = SLOT(self, offset_norm);
+    i128 x[4];
+    if (norm != NULL) {
+        Py_INCREF(norm);
+        return norm;
+    }
+    if (!load(self, ARITHMETIC_LIMIT, x))
+        return PyObject_CallOneArg(fallback_reduced_norm, self);
+    norm = int_from_i128((x[0] * x[0] + x[1] * x[1] + x[2] * x[2] + x[3] * x[3]) >> 2);
+    if (norm == NULL)
+        return NULL;
+    Py_INCREF(norm);
+    set_slot(self, offset_norm, norm);
+    return norm;
+}
+
+static i128
+floor_divide(i128 a, i128 b)
+{
+    /* b > 0 */
+    i128 q = a / b;
+    if (a % b != 0 && a < 0)
+        q -= 1;
+    return q;
+}
+
+static PyObject *
+divide(PyObject *self, PyObject *other, int left)
+{
+    i128 x[4], y[4], conjugate[4], t[4], whole[4], half[4], q[4], qy[4], r[4];
+    i128 m, whole_dist = 0, half_dist = 0, residual;
+    PyObject *quotient, *remainder, *result;
+    int i;
+    if (!is_quaternion(other) || !load(self, DIVISION_LIMIT, x) || !load(other, DIVISION_LIMIT, y))
+        return call_fallback(left ? fallback_left_division : fallback_division, self, other);
+    if (y[0] == 0 && y[1] == 0 && y[2] == 0 && y[3] == 0) {
+        PyErr_SetString(PyExc_ZeroDivisionError, "Cannot divide by zero quaternion");
+        return NULL;
+    }
+    conjugate[0] = y[0];
+    for (i = 1; i < 4; i++)
+        conjugate[i] = -y[i];
+    m = y[0] * y[0] + y[1] * y[1] + y[2] * y[2] + y[3] * y[3];
+    if (left)
+        hamilton(conjugate, x, t);
+    else
+        hamilton(x, conjugate, t);
+    /* HurwitzQuaternion.nearest_hurwitz_doubled: round t/m into both cosets, keep the closer one */
+    for (i = 0; i < 4; i++) {
+        whole[i] = 2 * floor_divide(2 * t[i] + m, 2 * m);
+        half[i] = 2 * floor_divide(t[i], m) + 1;
+        residual = m * whole[i] - 2 * t[i];
+        whole_dist += residual * residual;
+        residual = m * half[i] - 2 * t[i];
+        half_dist += residual * residual;
+    }
+    for (i = 0; i < 4; i++)
+        q[i] = half_dist < whole_dist ? half[i] : whole[i];
+    if (left)
+        hamilton(y, q, qy);
+    else
+        hamilton(q, y, qy);
+    for (i = 0; i < 4; i++)
+        r[i] = x[i] - (qy[i] >> 1);
+    quotient = from_doubled(q);
+    if (quotient == NULL)
+        return NULL;
+    remainder = from_doubled(r);
+    if (remainder == NULL) {
+        Py_DECREF(quotient);
+        return NULL;
+    }
+    result = PyTuple_Pack(2, quotient, remainder);
+    Py_DECREF(quotient);
+    Py_DECREF(remainder);
+    return result;
+}
+
+static PyObject *
+quaternion_euclidean_division(PyObject *self, PyObject *other)
+{
+    return divide(self, other, 0);
+}
+
+static PyObject *
+quaternion_left_euclidean_division(PyObject *self, PyObject *other)
+{
+    return divide(self, other, 1);
+}
+
+static PyObject *
+init_fallback(PyObject *self, PyObject *args, PyObject *kwargs)
+{
+    PyObject *self_args = PyTuple_Pack(1, self), *full_args, *result;
+    if (self_args == NULL)
+        return NULL;
+    full_args = PySequence_Concat(self_args, args);
+    Py_DECREF(self_args);
+    if (full_args == NULL)
+        return NULL;
+    result = PyObject_Call(fallback_init, full_args, kwargs);
+    Py_DECREF(full_args);
+    return result;
+}
+
+static PyObject *
+quaternion_init(PyObject *self, PyObject *args, PyObject *kwargs)
+{
+    static char *keywords[] = {"a", "b", "c", "d", "half", NULL};
+    PyObject *values[4], *half = Py_False;
+    Py_ssize_t offsets[4] = {offset_a, offset_b, offset_c, offset_d};
+    long long small[4];
+    int ok = 1, is_half, i;
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "OOOO|O:__init__", keywords,
+                                     &values[0], &values[1], &values[2], &values[3], &half)) {
+        /* let Python report the bad arguments */
+        PyErr_Clear();
+        return init_fallback(self, args, kwargs);
+    }
+    for (i = 0; i < 4; i++)
+        small[i] = small_int(values[i], &ok);
+    is_half = PyObject_IsTrue(half);
+    if (is_half < 0)
+        return NULL;
+    if (!ok && is_half) {
+        /* type errors and the parity checks of big ints */
+        return init_fallback(self, args, kwargs);
+    }
+    if (!ok) {
+        for (i = 0; i < 4; i++) {
+            if (!PyLong_Check(values[i])) {
+                PyErr_SetString(PyExc_TypeError, "All values must be ints");
+                return NULL;
+            }
+        }
+    }
+    if (is_half) {
+        int odd = (small[0] & 1) + (small[1] & 1) + (small[2] & 1) + (small[3] & 1);
+        if (odd == 0) {
+            /* all even, so it is a whole quaternion */
+            for (i = 0; i < 4; i++) {
+                PyObject *value = PyLong_FromLongLong(small[i] >> 1);
+                if (value == NULL)
+                    return NULL;
+                set_slot(self, offsets[i], value);
+            }
+            Py_INCREF(Py_False);
+            set_slot(self, offset_half, Py_False);
+            Py_RETURN_NONE;
+        }
+        if (odd != 4) {
+            PyErr_SetString(PyExc_ValueError, "Half quaternions must not have individual values divisible by 2");
+            return NULL;
+        }
+    }
+    for (i = 0; i < 4; i++) {
+        Py_INCREF(values[i]);
+        set_slot(self, offsets[i], values[i]);
+    }
+    Py_INCREF(half);
+    set_slot(self, offset_half, half);
+    Py_RETURN_NONE;
+}
+
+static PyObject *
+quaternion_make(PyObject *Py_UNUSED(module), PyObject *const *args, Py_ssize_t nargs)
+{
+    int i;
+    if (nargs != 5 && nargs != 6) {
+        PyErr_SetString(PyExc_TypeError, "_make() takes 4 or 5 arguments");
+        return NULL;
+    }
+    for (i = 1; i < 5; i++)
+        Py_INCREF(args[i]);
+    return new_quaternion((PyTypeObject *)args[0], args[1], args[2], args[3], args[4],
+                          nargs == 6 ? args[5] : Py_False);
+}
+
+static PyObject *
+halve(PyObject *value)
+{
+    int ok = 1;
+    long long small = small_int(value, &ok);
+    PyObject *one, *result;
+    if (ok)
+        return PyLong_FromLongLong(small >> 1);
+    one = PyLong_FromLong(1);
+    if (one == NULL)
+        return NULL;
+    result = PyNumber_Rshift(value, one);
+    Py_DECREF(one);
+    return result;
+}
+
+static PyObject *
+quaternion_from_doubled(PyObject *Py_UNUSED(module), PyObject *const *args, Py_ssize_t nargs)
+{
+    int ok = 1, odd, i;
+    long long small;
+    if (nargs != 5) {
+        PyErr_SetString(PyExc_TypeError, "_from_doubled() takes 4 arguments");
+        return NULL;
+    }
+    for (i = 1; i < 5; i++) {
+        if (!PyLong_Check(args[i])) {
+            PyErr_SetString(PyExc_TypeError, "Doubled coordinates must be ints");
+            return NULL;
+        }
+    }
+    small = small_int(args[1], &ok);
+    if (ok) {
+        odd = small & 1;
+    }
+    else {
+        PyObject *one = PyLong_FromLong(1), *bit;
+        if (one == NULL)
+            return NULL;
+        bit = PyNumber_And(args[1], one);
+        Py_DECREF(one);
+        if (bit == NULL)
+            return NULL;
+        odd = PyObject_IsTrue(bit);
+        Py_DECREF(bit);
+    }
+    if (odd) {
+        for (i = 1; i < 5; i++)
+            Py_INCREF(args[i]);
+        return new_quaternion((PyTypeObject *)args[0], args[1], args[2], args[3], args[4], Py_True);
+    }
+    return new_quaternion((PyTypeObject *)args[0], halve(args[1]), halve(args[2]), halve(args[3]),
+                          halve(args[4]), Py_False);
+}
+
+static PyMethodDef quaternion_methods[] = {
+    {"__init__", (PyCFunction)(void (*)(void))quaternion_init, METH_VARARGS | METH_KEYWORDS, NULL},
+    {"__add__", quaternion_add, METH_O, NULL},
+    {"__sub__", quaternion_sub, METH_O, NULL},
+    {"__mul__", quaternion_mul, METH_O, NULL},
+    {"reduced_norm", quaternion_reduced_norm, METH_NOARGS, NULL},
+    {"euclidean_division", quaternion_euclidean_division, METH_O, NULL},
+    {"left_euclidean_division", quaternion_left_euclidean_division, METH_O, NULL},
+    {NULL, NULL, 0, NULL}
+};
+
+static PyMethodDef quaternion_classmethods[] = {
+    {"_make", (PyCFunction)(void (*)(void))quaternion_make, METH_FASTCALL, NULL},
+    {"_from_doubled", (PyCFunction)(void (*)(void))quaternion_from_doubled, METH_FASTCALL, NULL},
+    {NULL, NULL, 0, NULL}
+};
+
+static int
+slot_offset(PyTypeObject *type, const char *name, Py_ssize_t *offset)
+{
+    PyObject *descriptor = PyDict_GetItemString(type->tp_dict, name);
+    if (descriptor == NULL || Py_TYPE(descriptor) != &PyMemberDescr_Type) {
+        PyErr_Format(PyExc_TypeError, "%s is not a slot of %s", name, type->tp_name);
+        return -1;
+    }
+    *offset = ((PyMemberDescrObject *)descriptor)->d_member->offset;
+    return 0;
+}
+
+static int
+fallback(PyObject *fallbacks, const char *name, PyObject **target)
+{
+    PyObject *function = PyDict_GetItemString(fallbacks, name);
+    if (function == NULL) {
+        PyErr_Format(PyExc_KeyError, "no pure-Python %s given", name);
+        return -1;
+    }
+    Py_INCREF(function);
+    Py_XSETREF(*target, function);
+    return 0;
+}
+
+static PyObject *
+install(PyObject *module, PyObject *args)
+{
+    PyTypeObject *type;
+    PyObject *fallbacks, *methods;
+    PyMethodDef *def;
+    if (!PyArg_ParseTuple(args, "O!O!:install", &PyType_Type, &type, &PyDict_Type, &fallbacks))
+        return NULL;
+    if (slot_offset(type, "a", &offset_a) < 0 || slot_offset(type, "b", &offset_b) < 0 ||
+        slot_offset(type, "c", &offset_c) < 0 || slot_offset(type, "d", &offset_d) < 0 ||
+        slot_offset(type, "half", &offset_half) < 0 || slot_offset(type, "_reduced_norm", &offset_norm) < 0)
+        return NULL;
+    if (fallback(fallbacks, "__init__", &fallback_init) < 0 || fallback(fallbacks, "__add__", &fallback_add) < 0 ||
+        fallback(fallbacks, "__sub__", &fallback_sub) < 0 || fallback(fallbacks, "__mul__", &fallback_mul) < 0 ||
+        fallback(fallbacks, "reduced_norm", &fallback_reduced_norm) < 0 ||
+        fallback(fallbacks, "euclidean_division", &fallback_division) < 0 ||
+        fallback(fallbacks, "left_euclidean_division", &fallback_left_division) < 0)
+        return NULL;
+    Py_INCREF(type);
+    Py_XSETREF(quaternion_type, type);
+
+    methods = PyDict_New();
+    if (methods == NULL)
+        return NULL;
+    for (def = quaternion_methods; def->ml_name != NULL; def++) {
+        PyObject *descriptor = PyDescr_NewMethod(type, def);
+        if (descriptor == NULL || PyDict_SetItemString(methods, def->ml_name, descriptor) < 0) {
+            Py_XDECREF(descriptor);
+            Py_DECREF(methods);
+            return NULL;
+        }
+        Py_DECREF(descriptor);
+    }
+    for (def = quaternion_classmethods; def->ml_name != NULL; def++) {
+        PyObject *function = PyCFunction_NewEx(def, NULL, module), *method;
+        if (function == NULL) {
+            Py_DECREF(methods);
+            return NULL;
+        }
+        method = PyClassMethod_New(function);
+        Py_DECREF(function);
+        if (method == NULL || PyDict_SetItemString(methods, def->ml_name, method) < 0) {
+            Py_XDECREF(method);
+            Py_DECREF(methods);
+            return NULL;
+        }
+        Py_DECREF(method);
+    }
+    return methods;
+}
+
+static PyMethodDef module_methods[] = {
+    {"install", install, METH_VARARGS,
+     "install(cls, fallbacks) -> dict of compiled methods for cls, falling back to the functions in fallbacks"},
+    {NULL, NULL, 0, NULL}
+};
+
+static struct PyModuleDef module = {
+    PyModuleDef_HEAD_INIT, "_speedups", "Compiled core of HurwitzQuaternion.", -1, module_methods
+};
+
+PyMODINIT_FUNC
+PyInit__speedups(void)
+{
+    return PyModule_Create(&module);
+}
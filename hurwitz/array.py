@@ -0,0 +1,273 @@
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError("HurwitzQuaternionArray needs NumPy, install it with `pip install hurwitz[numpy]`") from e
+
+from .hurwitz import HurwitzQuaternion
+
+# largest magnitude we let an int64 intermediate reach before switching to Python ints (object dtype)
+INT64_LIMIT = 2 ** 62
+# rows per block in the Hamilton product, small enough that the temporaries stay in cache
+CHUNK = 16384
+
+
+def _max_abs(data) -> int:
+    if data.size == 0:
+        return 0
+    if data.dtype == object:
+        return int(np.abs(data).max())
+    return max(int(data.max()), -int(data.min()))
+
+
+def _as_object(data):
+    return data if data.dtype == object else data.astype(object)
+
+
+def _hamilton(x, y, halve: bool = False):
+    # Hamilton product of the rows of two (N, 4) arrays, broadcasting along the first axis.
+    # with halve the result is divided by 2, which is exact for products of doubled coordinates
+    n = max(len(x), len(y))
+    dtype = np.result_type(x, y)
+    out = np.empty((n, 4), dtype=dtype, order='F')
+    step = CHUNK if dtype != object else max(n, 1)
+    for start in range(0, n, step):
+        xs = x[start:start + step] if len(x) > 1 else x
+        ys = y[start:start + step] if len(y) > 1 else y
+        o = out[start:start + step]
+        a1, b1, c1, d1 = xs[:, 0], xs[:, 1], xs[:, 2], xs[:, 3]
+        a2, b2, c2, d2 = ys[:, 0], ys[:, 1], ys[:, 2], ys[:, 3]
+        o[:, 0] = a1 * a2 - b1 * b2 - c1 * c2 - d1 * d2
+        o[:, 1] = a1 * b2 + b1 * a2 + c1 * d2 - d1 * c2
+        o[:, 2] = a1 * c2 - b1 * d2 + c1 * a2 + d1 * b2
+        o[:, 3] = a1 * d2 + b1 * c2 - c1 * b2 + d1 * a2
+        if halve:
+            if dtype == object:
+                o //= 2
+            else:
+                np.right_shift(o, 1, out=o)
+    return out
+
+
+def _conjugate(x):
+    out = x.copy(order='F')
+    out[:, 1:] = -out[:, 1:]
+    return out
+
+
+def _nearest_hurwitz_doubled(t, m):
+    # vectorized HurwitzQuaternion.nearest_hurwitz_doubled: rows of t are rounded against m (shape (N,))
+    m = m[:, None]
+    whole = 2 * ((2 * t + m) // (2 * m))
+    half = 2 * (t // m) + 1
+    whole_dist = ((m * whole - 2 * t) ** 2).sum(axis=1)
+    half_dist = ((m * half - 2 * t) ** 2).sum(axis=1)
+    return np.where((half_dist < whole_dist)[:, None], half, whole)
+
+
+class HurwitzQuaternionArray:
+    """
+    A batch of Hurwitz quaternions stored as an (N, 4) array of doubled coordinates (2a, 2b, 2c, 2d).
+
+    Coordinates are int64 while they fit and an object array of Python ints once they might not,
+    operations promote on their own before anything can overflow.
+    """
+    __slots__ = ('data', '_bound')
+
+    def __init__(self, doubled) -> None:
+        data = np.asarray(doubled)
+        if data.ndim == 1 and data.size == 0:
+            data = data.reshape(0, 4)
+        if data.ndim != 2 or data.shape[1] != 4:
+            raise ValueError("Expected an (N, 4) array of doubled coordinates")
+        if data.dtype != object and not np.issubdtype(data.dtype, np.integer):
+            raise TypeError("All values must be ints")
+        if np.any((data[:, 1:] - data[:, :1]) % 2):
+            raise ValueError("Doubled coordinates must be all even (whole) or all odd (half)")
+        wrapped = HurwitzQuaternionArray._wrap(data if data.dtype == object else data.astype(np.int64, copy=False))
+        self.data = wrapped.data
+        self._bound = wrapped._bound
+
+    @classmethod
+    def _wrap(cls, data, bound: int = None) -> 'HurwitzQuaternionArray':
+        # internal constructor, skips the parity check for results of arithmetic on valid arrays.
+        # bound is an upper bound on the magnitude of the coordinates when the caller already knows one
+        arr = object.__new__(cls)
+        if data.dtype == object:
+            bound = _max_abs(data)
+            if bound < INT64_LIMIT:
+                data = data.astype(np.int64)
+        arr.data = np.asfortranarray(data)
+        arr._bound = bound
+        return arr
+
+    def bound(self, exact: bool = False) -> int:
+        # upper bound on the magnitude of the doubled coordinates, used to decide when to leave int64
+        if self._bound is None or exact:
+            self._bound = _max_abs(self.data)
+        return self._bound
+
+    @classmethod
+    def from_quaternions(cls, quaternions) -> 'HurwitzQuaternionArray':
+        rows = [q.doubled() for q in quaternions]
+        if not rows:
+            return cls._wrap(np.empty((0, 4), dtype=np.int64), 0)
+        bound = max(max(abs(val) for val in row) for row in rows)
+        if bound < INT64_LIMIT:
+            return cls._wrap(np.array(rows, dtype=np.int64), bound)
+        data = np.empty((len(rows), 4), dtype=object)
+        data[:] = rows
+        return cls._wrap(data)
+
+    def to_quaternions(self) -> list:
+        return [HurwitzQuaternion._from_doubled(*row) for row in self.data.tolist()]
+
+    def _coerce(self, other) -> 'HurwitzQuaternionArray':
+        if isinstance(other, HurwitzQuaternion):
+            other = HurwitzQuaternionArray.from_quaternions([other])
+        elif not isinstance(other, HurwitzQuaternionArray):
+            return None
+        if len(self) != len(other) and 1 not in (len(self), len(other)):
+            raise ValueError(f"Cannot broadcast {len(self)} quaternions against {len(other)}")
+        return other
+
+    def _operands(self, other: 'HurwitzQuaternionArray', fits) -> tuple:
+        # data of both operands, promoted to object dtype unless fits(bound_self, bound_other) holds
+        if fits(self.bound(), other.bound()) or fits(self.bound(True), other.bound(True)):
+            return self.data, other.data, True
+        return _as_object(self.data), _as_object(other.data), False
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            return HurwitzQuaternion._from_doubled(*self.data[key].tolist())
+        return HurwitzQuaternionArray._wrap(self.data[key], self._bound)
+
+    def __iter__(self):
+        for row in self.data.tolist():
+            yield HurwitzQuaternion._from_doubled(*row)
+
+    def __repr__(self) -> str:
+        return f"HurwitzQuaternionArray({len(self)} quaternions, dtype={self.data.dtype})"
+
+    @property
+    def half(self):
+        # bool mask of the half quaternions, whose doubled coordinates are odd
+        return (self.data[:, 0] % 2).astype(bool)
+
+    def __add__(self, other) -> 'HurwitzQuaternionArray':
+        other = self._coerce(other)
+        if other is None:
+            return NotImplemented
+        x, y, fits = self._operands(other, lambda a, b: a + b < INT64_LIMIT)
+        return HurwitzQuaternionArray._wrap(x + y, self.bound() + other.bound() if fits else None)
+
+    __radd__ = __add__
+
+    def __sub__(self, other) -> 'HurwitzQuaternionArray':
+        other = self._coerce(other)
+        if other is None:
+            return NotImplemented
+        x, y, fits = self._operands(other, lambda a, b: a + b < INT64_LIMIT)
+        return HurwitzQuaternionArray._wrap(x - y, self.bound() + other.bound() if fits else None)
+
+    def __rsub__(self, other) -> 'HurwitzQuaternionArray':
+        return -self + other
+
+    def __neg__(self) -> 'HurwitzQuaternionArray':
+        return HurwitzQuaternionArray._wrap(-self.data, self._bound)
+
+    @staticmethod
+    def _multiply(left: 'HurwitzQuaternionArray', right: 'HurwitzQuaternionArray') -> 'HurwitzQuaternionArray':
+        # D(xy) = D(x)D(y)/2, and that product is always even
+        x, y, fits = left._operands(right, lambda a, b: 4 * a * b < INT64_LIMIT)
+        return HurwitzQuaternionArray._wrap(_hamilton(x, y, halve=True), 2 * left.bound() * right.bound() if fits else None)
+
+    def __mul__(self, other) -> 'HurwitzQuaternionArray':
+        if isinstance(other, int):
+            other = HurwitzQuaternion._make(other, 0, 0, 0, False)
+        other = self._coerce(other)
+        if other is None:
+            return NotImplemented
+        return self._multiply(self, other)
+
+    def __rmul__(self, other) -> 'HurwitzQuaternionArray':
+        if isinstance(other, int):
+            return self * other
+        other = self._coerce(other)
+        if other is None:
+            return NotImplemented
+        return self._multiply(other, self)
+
+    def conjugate(self) -> 'HurwitzQuaternionArray':
+        return HurwitzQuaternionArray._wrap(_conjugate(self.data), self._bound)
+
+    def reduced_norm(self):
+        # N(q) for every element, int64 or object depending on size
+        x = self.data
+        if 4 * self.bound() ** 2 >= INT64_LIMIT and 4 * self.bound(True) ** 2 >= INT64_LIMIT:
+            x = _as_object(x)
+        return (x * x).sum(axis=1) // 4
+
+    def unitary(self):
+        return self.reduced_norm() == 1
+
+    def _divide(self, other, left: bool) -> ('HurwitzQuaternionArray', 'HurwitzQuaternionArray'):
+        other = self._coerce(other)
+        if other is None:
+            raise TypeError("Can only divide by HurwitzQuaternion or HurwitzQuaternionArray")
+        # t = D(a)D(conj b) is at most 4|a||b|, and the rounding compares squared residuals of up to 4m^2
+        # with m = 4N(b) <= 4|b|^2, so both have to fit before we stay on int64
+        a, b, _ = self._operands(other, lambda a, b: 16 * a * b + 64 * b ** 4 < INT64_LIMIT)
+        m = (b * b).sum(axis=1)
+        if np.any(m == 0):
+            raise ZeroDivisionError("Cannot divide by zero quaternion")
+        if left:
+            q = _nearest_hurwitz_doubled(_hamilton(_conjugate(b), a), m)
+            qb = _hamilton(b, q, halve=True)
+        else:
+            q = _nearest_hurwitz_doubled(_hamilton(a, _conjugate(b)), m)
+            qb = _hamilton(q, b, halve=True)
+        return (HurwitzQuaternionArray._wrap(q), HurwitzQuaternionArray._wrap(a - qb))
+
+    def euclidean_division(self, other) -> ('HurwitzQuaternionArray', 'HurwitzQuaternionArray'):
+        # elementwise right division, self = q*other + r, matching HurwitzQuaternion.euclidean_division
+        return self._divide(other, left=False)
+
+    def left_euclidean_division(self, other) -> ('HurwitzQuaternionArray', 'HurwitzQuaternionArray'):
+        # elementwise left division, self = other*q + r
+        return self._divide(other, left=True)
+
+    def __floordiv__(self, other) -> 'HurwitzQuaternionArray':
+        return self.euclidean_division(other)[0]
+
+    def __mod__(self, other) -> 'HurwitzQuaternionArray':
+        return self.euclidean_division(other)[1]
+
+
+def snap_many(points, quaternions: bool = False):
+    # the nearest Hurwitz quaternion to every row of an (N, 4) float array, as an (N, 4) int64 array of doubled
+    # coordinates (a list of HurwitzQuaternions with quaternions=True). like HurwitzQuaternion.snap, each row
+    # is rounded into Z^4 and into Z^4 + ½ and the closer candidate is kept, the whole one on a tie
+    points = np.asarray(points, dtype=np.float64)
+    if points.ndim != 2 or points.shape[1] != 4:
+        raise ValueError("Expected an (N, 4) array of points")
+    if not np.all(np.isfinite(points)):
+        raise ValueError("Cannot snap infinite or NaN coordinates")
+    if points.size and np.abs(points).max() >= INT64_LIMIT // 2:
+        raise OverflowError("Coordinates are too large for int64, snap them one at a time with HurwitzQuaternion.snap")
+    out = np.empty(points.shape, dtype=np.int64)
+    for start in range(0, len(points), CHUNK):
+        x = points[start:start + CHUNK]
+        whole = np.rint(x)
+        floors = np.floor(x)
+        whole_dist = np.square(x - whole).sum(axis=1)
+        # x - floor(x) is exact, floor(x) + 0.5 would lose the half once |x| >= 2^52
+        half_dist = np.square(x - floors - 0.5).sum(axis=1)
+        # both candidates as doubled int64, exact below the INT64_LIMIT // 2 guard
+        half = 2 * floors.astype(np.int64) + 1
+        np.copyto(out[start:start + CHUNK], np.where((half_dist < whole_dist)[:, None], half, 2 * whole.astype(np.int64)))
+    if quaternions:
+        return [HurwitzQuaternion._from_doubled(*row) for row in out.tolist()]
+    return out
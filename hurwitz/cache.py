@@ -0,0 +1,252 @@
+"""
+Opt-in result cache for the expensive HurwitzQuaternion methods.
+
+While a cache is enabled, euclidean_division, euclidean_division_pro_max, equivalence_class and __pow__ are
+swapped for wrappers that look their result up by the doubled coordinates of the operands (plus the exponent
+and modulus for powers) before computing it. Disabled, the original methods are back in place. Only calls from
+outside go through the cache, the divisions gcds and factorizations do internally are not cached.
+
+    with caching(ResultCache(maxsize=100000, max_bytes=64 << 20, path="results.sqlite")) as cache:
+        q ** 1000
+    print(cache.info())
+
+The default ResultCache is an LRU bounded by entries and by an estimate of its memory use, so it can be left
+on globally. With path, results are also written to a sqlite file that other processes (or later runs) read
+on a memory miss. Any object with get(key) (None on a miss) and put(key, value) can be plugged in instead.
+"""
+import json
+import os
+import sqlite3
+import sys
+import threading
+from collections import Counter, OrderedDict, namedtuple
+from contextlib import contextmanager
+from functools import partial, wraps
+
+from .hurwitz import HurwitzQuaternion, set_layer
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'disk_hits', 'evictions', 'currsize', 'bytes', 'maxsize', 'max_bytes'])
+
+# HurwitzQuaternion methods that can be cached
+CACHED = ('euclidean_division', 'euclidean_division_pro_max', 'equivalence_class', '__pow__')
+# estimated bookkeeping bytes per entry on top of its key and value (dict slot, linked list node, key tuple)
+ENTRY_OVERHEAD = 200
+
+_cache = None
+
+
+def _size(value) -> int:
+    # approximate bytes held by a key or cached value
+    if isinstance(value, HurwitzQuaternion):
+        return sys.getsizeof(value) + sum(sys.getsizeof(val) for val in (value.a, value.b, value.c, value.d))
+    if isinstance(value, tuple):
+        return sys.getsizeof(value) + sum(_size(val) for val in value)
+    return sys.getsizeof(value)
+
+
+def _encode(value):
+    # quaternions as lists of doubled coordinates, tuples of them as lists of those
+    if isinstance(value, HurwitzQuaternion):
+        return value.doubled()
+    return [val.doubled() for val in value]
+
+
+def _decode(value):
+    if isinstance(value[0], int):
+        return HurwitzQuaternion._from_doubled(*value)
+    return tuple(HurwitzQuaternion._from_doubled(*val) for val in value)
+
+
+class ResultCache:
+    """
+    An LRU of results bounded by maxsize entries and about max_bytes of memory (None for no bound), with an
+    optional sqlite file at path backing it. Writes to the file are committed every commit_every puts and on
+    flush() or close(). Safe to share between threads, and forked processes reopen the file.
+    """
+
+    def __init__(self, maxsize: int = 65536, max_bytes: int = 64 << 20, path: str = None,
+                 commit_every: int = 256) -> None:
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.path = path
+        self.commit_every = commit_every
+        self.hits = Counter()
+        self.misses = Counter()
+        self.disk_hits = 0
+        self.evictions = 0
+        self.bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._connection = None
+        self._pid = None
+        self._uncommitted = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return f"ResultCache({self.info()})"
+
+    def _database(self) -> sqlite3.Connection:
+        # the sqlite connection of this process, opened on first use and again after a fork
+        if self._connection is None or self._pid != os.getpid():
+            self._connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            self._connection.commit()
+            self._pid = os.getpid()
+            self._uncommitted = 0
+        return self._connection
+
+    def get(self, key: tuple):
+        # the cached result for key, or None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits[key[0]] += 1
+                return entry[0]
+            if self.path is not None:
+                row = self._database().execute("SELECT value FROM results WHERE key = ?", (json.dumps(key),)).fetchone()
+                if row is not None:
+                    value = _decode(json.loads(row[0]))
+                    self._insert(key, value)
+                    self.hits[key[0]] += 1
+                    self.disk_hits += 1
+                    return value
+            self.misses[key[0]] += 1
+            return None
+
+    def put(self, key: tuple, value) -> None:
+        with self._lock:
+            if key in self._entries:
+                return
+            self._insert(key, value)
+            if self.path is not None:
+                database = self._database()
+                database.execute("INSERT OR REPLACE INTO results VALUES (?, ?)", (json.dumps(key), json.dumps(_encode(value))))
+                self._uncommitted += 1
+                if self._uncommitted >= self.commit_every:
+                    database.commit()
+                    self._uncommitted = 0
+
+    def _insert(self, key: tuple, value) -> None:
+        size = _size(key) + _size(value) + ENTRY_OVERHEAD
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        self._entries[key] = (value, size)
+        self.bytes += size
+        while (self.maxsize is not None and len(self._entries) > self.maxsize) or \
+                (self.max_bytes is not None and self.bytes > self.max_bytes):
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.bytes -= evicted
+            self.evictions += 1
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(sum(self.hits.values()), sum(self.misses.values()), self.disk_hits, self.evictions,
+                         len(self._entries), self.bytes, self.maxsize, self.max_bytes)
+
+    def clear(self) -> None:
+        # empties the memory, the file is kept
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self._connection.commit()
+                self._uncommitted = 0
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self._connection.close()
+            self._connection = None
+
+
+def _division(name: str, function):
+    @wraps(function)
+    def wrapper(self, other):
+        if not isinstance(other, HurwitzQuaternion):
+            return function(self, other)
+        key = (name, self.doubled(), other.doubled())
+        result = _cache.get(key)
+        if result is None:
+            result = function(self, other)
+            _cache.put(key, result)
+        return result
+    return wrapper
+
+
+def _equivalence_class(function):
+    @wraps(function)
+    def wrapper(self):
+        key = ('equivalence_class', self.doubled())
+        result = _cache.get(key)
+        if result is None:
+            result = tuple(function(self))
+            _cache.put(key, result)
+        return list(result)
+    return wrapper
+
+
+def _power(function):
+    @wraps(function)
+    def wrapper(self, power, modulo=None):
+        # powers 0 and 1 are free, and anything that is not an int goes to the original for its error
+        if type(power) is not int or power in (0, 1) or not (modulo is None or type(modulo) is int):
+            return function(self, power, modulo)
+        key = ('__pow__', self.doubled(), power, modulo)
+        result = _cache.get(key)
+        if result is None:
+            result = function(self, power, modulo)
+            _cache.put(key, result)
+        return result
+    return wrapper
+
+
+def enable(cache=None, operations: tuple = CACHED):
+    # caches the given operations (all of CACHED by default) in cache, a new ResultCache when None, and
+    # returns it. enabling again swaps the cache
+    global _cache
+    for name in operations:
+        if name not in CACHED:
+            raise ValueError(f"Cannot cache {name!r}, expected some of {', '.join(CACHED)}")
+    disable()
+    _cache = cache if cache is not None else ResultCache()
+    wrappers = {}
+    for name in operations:
+        if name == 'equivalence_class':
+            wrappers[name] = _equivalence_class
+        elif name == '__pow__':
+            wrappers[name] = _power
+        else:
+            wrappers[name] = partial(_division, name)
+    set_layer('cache', wrappers)
+    return _cache
+
+
+def disable() -> None:
+    # puts the original methods back, the cache keeps its contents (and its file is flushed)
+    global _cache
+    set_layer('cache', None)
+    if _cache is not None and hasattr(_cache, 'flush'):
+        _cache.flush()
+    _cache = None
+
+
+def active_cache():
+    # the enabled cache, None when caching is off
+    return _cache
+
+
+@contextmanager
+def caching(cache=None, operations: tuple = CACHED):
+    # enables cache for the duration of the block
+    cache = enable(cache, operations)
+    try:
+        yield cache
+    finally:
+        disable()
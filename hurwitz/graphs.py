@@ -0,0 +1,225 @@
+"""
+Cayley graphs of norm-p Hurwitz elements acting on the Hurwitz order modulo q.
+
+For an odd prime q the Hurwitz order mod q is the ring of 2x2 matrices over F_q. Its invertible elements
+up to scalars (a group of q(q^2 - 1) elements, PGL2(F_q)) are the vertices, and every vertex v has an edge
+to v * g for each generator g. For an odd prime p there are p + 1 classes of associates of norm p, and
+their canonical associates are the generators, so the graph is (p + 1)-regular.
+
+Vertices are stored as sorted integer keys of their normalized coordinates (first non-zero coordinate 1)
+and the adjacency as CSR arrays, optionally memory-mapped .npy files:
+
+    graph = cayley_graph(5, 127, path="lps_5_127")
+    graph.neighbors(0)
+    graph = CayleyGraph.load("lps_5_127")
+"""
+import os
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError("hurwitz.graphs needs NumPy, install it with `pip install hurwitz[numpy]`") from e
+
+from .hurwitz import HurwitzQuaternion
+from .modular import HurwitzModRing
+from .primes import is_prime
+
+# vertices per batch when computing the adjacency
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+
+def element_table(n: int, half: bool = None, up_to_units: bool = False):
+    # the elements of reduced norm n as an (N, 4) int64 array of doubled coordinates, in the order of
+    # HurwitzQuaternion.elements_of_norm (half=False is the Lipschitz part)
+    rows = [q.doubled() for q in HurwitzQuaternion.elements_of_norm(n, half, up_to_units)]
+    return np.array(rows, dtype=np.int64).reshape(-1, 4)
+
+
+def _keys(x, q: int):
+    # integer keys of rows of projectively normalized coordinates mod q
+    return ((x[:, 0] * q + x[:, 1]) * q + x[:, 2]) * q + x[:, 3]
+
+
+def _normalize(x, q: int, inverses):
+    # scales every row so its first non-zero coordinate is 1
+    lead = x[:, 3].copy()
+    for i in (2, 1, 0):
+        lead = np.where(x[:, i] != 0, x[:, i], lead)
+    return x * inverses[lead][:, None] % q
+
+
+def _check_primes(p: int, q: int) -> None:
+    if not (isinstance(p, int) and isinstance(q, int)):
+        raise TypeError("p and q must be ints")
+    if p == 2 or not is_prime(p):
+        raise ValueError("p must be an odd prime")
+    if q == 2 or not is_prime(q) or q == p:
+        raise ValueError("q must be an odd prime other than p")
+    if q ** 4 >= 2 ** 62:
+        raise ValueError("q is too large for int64 vertex keys")
+
+
+def generators(p: int, q: int, symmetric: bool = False):
+    # the canonical associates of norm p reduced mod q, as a (p + 1, 4) array of normalized coordinates.
+    # with symmetric the conjugates are added (conj(g) = p g^-1, so the same vertex as g^-1), skipping
+    # those that already are generators, which makes every edge come with its reverse
+    _check_primes(p, q)
+    ring = HurwitzModRing(q)
+    elements = list(HurwitzQuaternion.elements_of_norm(p, up_to_units=True))
+    if symmetric:
+        elements += [g.conjugate() for g in elements]
+    inverses = _inverses(q)
+    rows = _normalize(np.array([ring(g).coordinates() for g in elements], dtype=np.int64), q, inverses)
+    if symmetric:
+        # keep the first occurrence of every key, so the p + 1 generators stay in front
+        _, first = np.unique(_keys(rows, q), return_index=True)
+        base = p + 1
+        keep = np.sort(first[first >= base])
+        rows = np.concatenate([rows[:base], rows[keep]])
+    return rows
+
+
+def _inverses(q: int):
+    # multiplicative inverses mod the prime q, with 0 mapped to 0
+    inverses = np.zeros(q, dtype=np.int64)
+    values = np.arange(1, q, dtype=np.int64)
+    inverses[1:] = [pow(int(val), -1, q) for val in values]
+    return inverses
+
+
+def vertices(q: int, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    # sorted keys of the invertible elements mod q up to scalars. normalized rows have their leading 1 at
+    # position k from the end, so their keys are exactly the ranges [q^k, 2 q^k), kept where the norm is non-zero
+    parts = []
+    for k in range(4):
+        start, stop = q ** k, 2 * q ** k
+        for first in range(start, stop, chunk_size):
+            keys = np.arange(first, min(first + chunk_size, stop), dtype=np.int64)
+            x = _coordinates(keys, q)
+            parts.append(keys[(x * x).sum(axis=1) % q != 0])
+    return np.concatenate(parts)
+
+
+def _coordinates(keys, q: int):
+    x = np.empty((len(keys), 4), dtype=np.int64)
+    rest = keys
+    for i in (3, 2, 1, 0):
+        rest, x[:, i] = np.divmod(rest, q)
+    return x
+
+
+def _right_multiply(x, g, q: int):
+    # x * g mod q for the rows of x and a single quaternion g
+    a1, b1, c1, d1 = x[:, 0], x[:, 1], x[:, 2], x[:, 3]
+    a2, b2, c2, d2 = (int(val) for val in g)
+    out = np.empty_like(x)
+    out[:, 0] = a1 * a2 - b1 * b2 - c1 * c2 - d1 * d2
+    out[:, 1] = a1 * b2 + b1 * a2 + c1 * d2 - d1 * c2
+    out[:, 2] = a1 * c2 - b1 * d2 + c1 * a2 + d1 * b2
+    out[:, 3] = a1 * d2 + b1 * c2 - c1 * b2 + d1 * a2
+    return out % q
+
+
+def _array(path: str, name: str, shape: tuple, dtype):
+    if path is None:
+        return np.empty(shape, dtype=dtype)
+    return np.lib.format.open_memmap(os.path.join(path, name + '.npy'), mode='w+', dtype=dtype, shape=shape)
+
+
+class CayleyGraph:
+    """
+    A Cayley graph in CSR form: the neighbors of vertex i are indices[indptr[i]:indptr[i + 1]], one per
+    generator in generator order. vertex_keys[i] encodes the normalized coordinates of vertex i.
+    """
+    __slots__ = ('p', 'q', 'generators', 'vertex_keys', 'indptr', 'indices', '_ring', '_inverses')
+
+    def __init__(self, p: int, q: int, generators, vertex_keys, indptr, indices) -> None:
+        self.p = p
+        self.q = q
+        self.generators = generators
+        self.vertex_keys = vertex_keys
+        self.indptr = indptr
+        self.indices = indices
+        # the ring mod q and the inverse table of index(), built on its first call
+        self._ring = None
+        self._inverses = None
+
+    def __repr__(self) -> str:
+        return f"CayleyGraph(p={self.p}, q={self.q}, {self.n_vertices} vertices, {self.n_edges} edges)"
+
+    @property
+    def n_vertices(self) -> int:
+        return len(self.vertex_keys)
+
+    @property
+    def n_edges(self) -> int:
+        return len(self.indices)
+
+    def neighbors(self, vertex: int):
+        return self.indices[self.indptr[vertex]:self.indptr[vertex + 1]]
+
+    def vertex(self, index: int) -> HurwitzQuaternion:
+        # the normalized whole quaternion of a vertex
+        return HurwitzQuaternion._make(*(int(val) for val in _coordinates(self.vertex_keys[index:index + 1], self.q)[0]), False)
+
+    def index(self, quaternion: HurwitzQuaternion) -> int:
+        # the vertex of an invertible quaternion mod q
+        if self._ring is None:
+            self._ring, self._inverses = HurwitzModRing(self.q), _inverses(self.q)
+        x = np.array([self._ring(quaternion).coordinates()], dtype=np.int64)
+        key = _keys(_normalize(x, self.q, self._inverses), self.q)[0]
+        index = int(np.searchsorted(self.vertex_keys, key))
+        if index == self.n_vertices or self.vertex_keys[index] != key:
+            raise ValueError(f"{quaternion!r} is not invertible mod {self.q}")
+        return index
+
+    def to_scipy(self):
+        # the adjacency as a scipy.sparse.csr_matrix, with multiple edges summed
+        from scipy.sparse import csr_matrix
+        data = np.ones(self.n_edges, dtype=np.int32)
+        return csr_matrix((data, self.indices, self.indptr), shape=(self.n_vertices, self.n_vertices))
+
+    def save(self, path: str) -> None:
+        # writes the arrays as .npy files into the directory path
+        os.makedirs(path, exist_ok=True)
+        for name in ('generators', 'vertex_keys', 'indptr', 'indices'):
+            array = getattr(self, name)
+            if isinstance(array, np.memmap) and os.path.abspath(array.filename) == os.path.abspath(os.path.join(path, name + '.npy')):
+                array.flush()
+            else:
+                np.save(os.path.join(path, name + '.npy'), array)
+        np.save(os.path.join(path, 'primes.npy'), np.array([self.p, self.q], dtype=np.int64))
+
+    @classmethod
+    def load(cls, path: str, mmap_mode: str = 'r') -> 'CayleyGraph':
+        # reads a saved graph, memory-mapping the arrays unless mmap_mode is None
+        arrays = {name: np.load(os.path.join(path, name + '.npy'), mmap_mode=mmap_mode)
+                  for name in ('generators', 'vertex_keys', 'indptr', 'indices')}
+        p, q = (int(val) for val in np.load(os.path.join(path, 'primes.npy')))
+        return cls(p, q, **arrays)
+
+
+def cayley_graph(p: int, q: int, symmetric: bool = False, path: str = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> CayleyGraph:
+    # the Cayley graph of the norm-p generators on the invertible elements mod q up to scalars, edges v -> v * g.
+    # with path the arrays are memory-mapped .npy files in that directory, so only one batch of vertices is
+    # in memory at a time
+    gens = generators(p, q, symmetric)
+    if path is not None:
+        os.makedirs(path, exist_ok=True)
+    keys = vertices(q, chunk_size)
+    n, degree = len(keys), len(gens)
+    index_dtype = np.int32 if n < 2 ** 31 else np.int64
+    indptr = _array(path, 'indptr', (n + 1,), np.int64)
+    indptr[:] = np.arange(0, (n + 1) * degree, degree, dtype=np.int64)
+    indices = _array(path, 'indices', (n * degree,), index_dtype)
+    adjacency = indices.reshape(n, degree)
+    inverses = _inverses(q)
+    for start in range(0, n, chunk_size):
+        x = _coordinates(keys[start:start + chunk_size], q)
+        for j, g in enumerate(gens):
+            adjacency[start:start + len(x), j] = np.searchsorted(keys, _keys(_normalize(_right_multiply(x, g, q), q, inverses), q))
+    graph = CayleyGraph(p, q, gens, keys, indptr, indices)
+    if path is not None:
+        graph.save(path)
+    return graph
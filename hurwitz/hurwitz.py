@@ -1,8 +1,35 @@
-from math import floor, ceil
-from functools import reduce
+from math import floor, ceil, isqrt
+from functools import lru_cache
+from numbers import Number
+import os
 import warnings
 
+from . import instrument
+from .primes import factor_integer, sqrt_mod
+
+# ±1, ±i, ±j, ±k
+UNITARY_WHOLE_QUATERNIONS = frozenset({
+    (1, 0, 0, 0), (-1, 0, 0, 0), (0, 1, 0, 0), (0, -1, 0, 0),
+    (0, 0, 1, 0), (0, 0, -1, 0), (0, 0, 0, 1), (0, 0, 0, -1)
+})
+# (±1 ± i ± j ± k)/2
+UNITARY_HALF_QUATERNIONS = frozenset({
+    (1, 1, 1, 1), (-1, -1, -1, -1), (1, -1, 1, -1), (-1, 1, -1, 1), (1, 1, -1, -1), (-1, -1, 1, 1),
+    (1, -1, -1, 1), (-1, 1, 1, -1), (1, 1, 1, -1), (-1, -1, -1, 1), (1, 1, -1, 1), (-1, -1, 1, -1),
+    (1, -1, 1, 1), (-1, 1, -1, -1), (1, -1, -1, -1), (-1, 1, 1, 1)
+})
+
+_new = object.__new__
+
 class HurwitzQuaternion:
+    # only the four coefficients and the half flag live on the instance, everything else is shared or derived.
+    # instances are immutable (units, interned and cached results are shared), the constructors write the
+    # slots through the _set_* descriptors defined after the class
+    __slots__ = ('a', 'b', 'c', 'd', 'half', '_reduced_norm')
+
+    unitary_whole_quaternions = UNITARY_WHOLE_QUATERNIONS
+    unitary_half_quaternions = UNITARY_HALF_QUATERNIONS
+
     def __init__(self, a: int, b: int, c: int, d: int, half: bool = False) -> None:
         if not all(isinstance(val, int) for val in [a, b, c, d]):
             raise TypeError("All values must be ints")
@@ -18,102 +45,168 @@ class HurwitzQuaternion:
                     d = d // 2
                 else:
                     raise ValueError("Half quaternions must not have individual values divisible by 2")
-        self.a = a
-        self.b = b
-        self.c = c
-        self.d = d
-        self.debug = False
-        # ±1, ±i, ±j, ±k, 
-        self.unitary_whole_quaternions = {
-            (1, 0, 0, 0), (-1, 0, 0, 0), (0, 1, 0, 0), (0, -1, 0, 0),
-            (0, 0, 1, 0), (0, 0, -1, 0), (0, 0, 0, 1), (0, 0, 0, -1)
-        }
-        # (±1 ± i ± j ± k)/2
-        self.unitary_half_quaternions = {
-            (1, 1, 1, 1), (-1, -1, -1, -1), (1, -1, 1, -1), (-1, 1, -1, 1), (1, 1, -1, -1), (-1, -1, 1, 1),
-            (1, -1, -1, 1), (-1, 1, 1, -1), (1, 1, 1, -1), (-1, -1, -1, 1), (1, 1, -1, 1), (-1, -1, 1, -1),
-            (1, -1, 1, 1), (-1, 1, -1, -1), (1, -1, -1, -1), (-1, 1, 1, 1)
-        }
-        self.half = half
-        self.trace = 2*a if self.half == False else a
-        self.general = (a, b, c, d) if self.half == False else (a/2, b/2, c/2, d/2)
+        _set_a(self, a)
+        _set_b(self, b)
+        _set_c(self, c)
+        _set_d(self, d)
+        _set_half(self, half)
+
+    @classmethod
+    def _make(cls, a: int, b: int, c: int, d: int, half: bool = False) -> 'HurwitzQuaternion':
+        # internal constructor, skips the type and parity checks of __init__.
+        # only for values the caller already knows are valid (ints, all odd when half)
+        q = _new(cls)
+        _set_a(q, a)
+        _set_b(q, b)
+        _set_c(q, c)
+        _set_d(q, d)
+        _set_half(q, half)
+        return q
+
+    @classmethod
+    def _from_doubled(cls, a: int, b: int, c: int, d: int) -> 'HurwitzQuaternion':
+        # internal constructor from doubled coordinates (2a, 2b, 2c, 2d) of a Hurwitz quaternion.
+        # in the Hurwitz order these are either all even or all odd, so checking one is enough
+        q = _new(cls)
+        if a & 1:
+            _set_a(q, a)
+            _set_b(q, b)
+            _set_c(q, c)
+            _set_d(q, d)
+            _set_half(q, True)
+        else:
+            _set_a(q, a >> 1)
+            _set_b(q, b >> 1)
+            _set_c(q, c >> 1)
+            _set_d(q, d >> 1)
+            _set_half(q, False)
+        return q
+
+    @classmethod
+    def _intern(cls, x: tuple) -> 'HurwitzQuaternion':
+        # the quaternion with doubled coordinates x, shared when it is a unit (UNIT_QUATERNIONS) or, with the
+        # intern cache on, when its reduced norm is at most the cache's max_norm
+        index = UNIT_INDEX.get(x)
+        if index is not None:
+            return UNIT_QUATERNIONS[index]
+        if _interned is not None and x[0] * x[0] + x[1] * x[1] + x[2] * x[2] + x[3] * x[3] <= 4 * _intern_max_norm:
+            return _interned(*x)
+        return cls._from_doubled(*x)
+
+    @staticmethod
+    def set_intern_cache(maxsize: int = 4096, max_norm: int = 64) -> None:
+        # share quaternions of reduced norm up to max_norm built by associates and canonical_associate through an
+        # LRU of maxsize entries keyed by doubled coordinates. maxsize=0 turns the cache off (the default);
+        # the 24 units are always shared
+        global _interned, _intern_max_norm
+        _interned = lru_cache(maxsize=maxsize)(_from_doubled) if maxsize else None
+        _intern_max_norm = max_norm
+
+    @staticmethod
+    def intern_cache_info():
+        # hits, misses, maxsize and currsize of the intern cache, None when it is off
+        return _interned.cache_info() if _interned is not None else None
+
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError(f"HurwitzQuaternion is immutable, cannot set {name!r}")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"HurwitzQuaternion is immutable, cannot delete {name!r}")
+
+    def __reduce__(self):
+        # pickle as the four doubled coordinates only
+        return (_from_doubled, self.doubled())
+
+    @property
+    def trace(self) -> int:
+        return 2*self.a if self.half == False else self.a
+
+    @property
+    def general(self) -> tuple:
+        return (self.a, self.b, self.c, self.d) if self.half == False else (self.a/2, self.b/2, self.c/2, self.d/2)
 
     def __add__(self, other: 'HurwitzQuaternion') -> 'HurwitzQuaternion':
         if not isinstance(other, HurwitzQuaternion):
-            raise TypeError("Can only add HurwitzQuaternion to HurwitzQuaternion")
+            return NotImplemented
         if self.half == other.half == False:
-            return HurwitzQuaternion(self.a + other.a, self.b + other.b, self.c + other.c, self.d + other.d, False)
+            return HurwitzQuaternion._make(self.a + other.a, self.b + other.b, self.c + other.c, self.d + other.d, False)
         elif self.half == other.half == True:
-            return HurwitzQuaternion((self.a + other.a) // 2, (self.b + other.b) // 2, (self.c + other.c) // 2, (self.d + other.d) // 2, False)
+            # odd + odd is always even, so the sum of two halves is always whole
+            return HurwitzQuaternion._make((self.a + other.a) // 2, (self.b + other.b) // 2, (self.c + other.c) // 2, (self.d + other.d) // 2, False)
         else:
             if self.half:
-                return HurwitzQuaternion(self.a + 2 * other.a, self.b + 2 * other.b, self.c + 2 * other.c, self.d + 2 * other.d, True)
+                return HurwitzQuaternion._make(self.a + 2 * other.a, self.b + 2 * other.b, self.c + 2 * other.c, self.d + 2 * other.d, True)
             else:
-                return HurwitzQuaternion(2 * self.a + other.a, 2 * self.b + other.b, 2 * self.c + other.c, 2 * self.d + other.d, True)
+                return HurwitzQuaternion._make(2 * self.a + other.a, 2 * self.b + other.b, 2 * self.c + other.c, 2 * self.d + other.d, True)
 
     def __sub__(self, other: 'HurwitzQuaternion') -> 'HurwitzQuaternion':
         if not isinstance(other, HurwitzQuaternion):
-            raise TypeError("Can only subtract HurwitzQuaternion from HurwitzQuaternion")
-        # Multiply the other quaternion by -1 and add
-        return self + HurwitzQuaternion(-other.a, -other.b, -other.c, -other.d, other.half)
+            return NotImplemented
+        # the same three cases as __add__, subtracting directly instead of adding a negated copy
+        if self.half == other.half == False:
+            return HurwitzQuaternion._make(self.a - other.a, self.b - other.b, self.c - other.c, self.d - other.d, False)
+        elif self.half == other.half == True:
+            return HurwitzQuaternion._make((self.a - other.a) // 2, (self.b - other.b) // 2, (self.c - other.c) // 2, (self.d - other.d) // 2, False)
+        elif self.half:
+            return HurwitzQuaternion._make(self.a - 2 * other.a, self.b - 2 * other.b, self.c - 2 * other.c, self.d - 2 * other.d, True)
+        else:
+            return HurwitzQuaternion._make(2 * self.a - other.a, 2 * self.b - other.b, 2 * self.c - other.c, 2 * self.d - other.d, True)
 
     def __mul__(self, other) -> 'HurwitzQuaternion':
         if isinstance(other, HurwitzQuaternion):
-            if self.half == other.half:
-                return HurwitzQuaternion(
-                    self.a * other.a - self.b * other.b - self.c * other.c - self.d * other.d,
-                    self.a * other.b + self.b * other.a + self.c * other.d - self.d * other.c,
-                    self.a * other.c - self.b * other.d + self.c * other.a + self.d * other.b,
-                    self.a * other.d + self.b * other.c - self.c * other.b + self.d * other.a,
-                    self.half
-                )
+            a1, b1, c1, d1 = self.a, self.b, self.c, self.d
+            a2, b2, c2, d2 = other.a, other.b, other.c, other.d
+            a = a1 * a2 - b1 * b2 - c1 * c2 - d1 * d2
+            b = a1 * b2 + b1 * a2 + c1 * d2 - d1 * c2
+            c = a1 * c2 - b1 * d2 + c1 * a2 + d1 * b2
+            d = a1 * d2 + b1 * c2 - c1 * b2 + d1 * a2
+            if self.half == other.half == False:
+                return HurwitzQuaternion._make(a, b, c, d, False)
+            elif self.half == other.half:
+                # both stored doubled, so the product is 4x the real value, i.e. twice its doubled coordinates
+                return HurwitzQuaternion._from_doubled(a >> 1, b >> 1, c >> 1, d >> 1)
             else:
-                # If one is half and the other is not, convert half to whole for the operation
-                if self.half:
-                    factor = 2
-                else:
-                    factor = 1
-                results = [
-                    factor * (self.a * other.a - self.b * other.b - self.c * other.c - self.d * other.d),
-                    factor * (self.a * other.b + self.b * other.a + self.c * other.d - self.d * other.c),
-                    factor * (self.a * other.c - self.b * other.d + self.c * other.a + self.d * other.b),
-                    factor * (self.a * other.d + self.b * other.c - self.c * other.b + self.d * other.a)]
-                if results[0] % 2 == 0 and results[1] % 2 == 0 and results[2] % 2 == 0 and results[3] % 2 == 0:
-                    return HurwitzQuaternion(results[0] // 2, results[1] // 2, results[2] // 2, results[3] // 2, False)
-                else:
-                    return HurwitzQuaternion(results[0], results[1], results[2], results[3], True)
+                # one side is stored doubled, so the product already is in doubled coordinates
+                return HurwitzQuaternion._from_doubled(a, b, c, d)
         elif isinstance(other, int):
             if (other % 2 == 0) and self.half == True:
-                return HurwitzQuaternion(
-                    int(self.a * other // 2),
-                    int(self.b * other // 2),
-                    int(self.c * other // 2),
-                    int(self.d * other // 2),
+                return HurwitzQuaternion._make(
+                    self.a * other // 2,
+                    self.b * other // 2,
+                    self.c * other // 2,
+                    self.d * other // 2,
                     False
                 )
             else:
-                return HurwitzQuaternion(
-                    int(self.a * other),
-                    int(self.b * other),
-                    int(self.c * other),
-                    int(self.d * other),
+                return HurwitzQuaternion._make(
+                    self.a * other,
+                    self.b * other,
+                    self.c * other,
+                    self.d * other,
                     self.half
                 )
-        else:
+        elif isinstance(other, Number):
             warnings.warn("Multiplying HurwitzQuaternion by a non-int will result in a tuple of quaternion vals, not a Hurwitz Quaternion")
             if self.half:
                 return (self.a * other, self.b * other, self.c * other, self.d * other)
             else:
                 return (self.a * other * 2, self.b * other * 2, self.c * other * 2, self.d * other * 2)
+        else:
+            # let containers such as HurwitzQuaternionArray handle the reflected product
+            return NotImplemented
 
     def __neg__(self) -> 'HurwitzQuaternion':
-        return HurwitzQuaternion(-self.a, -self.b, -self.c, -self.d, self.half)
+        return HurwitzQuaternion._make(-self.a, -self.b, -self.c, -self.d, self.half)
 
     def __repr__(self) -> str:
         return f"{self.a} + {self.b}i + {self.c}j + {self.d}ij" if self.half == False else f"{self.a}/2 + {self.b}/2i + {self.c}/2j + {self.d}/2ij"
 
-    def __len__(self) -> float:
-        return self.norm()
+    def __len__(self) -> int:
+        return self.reduced_norm()
+
+    def __bool__(self) -> bool:
+        # nonzero, without going through len(), which overflows for norms past sys.maxsize
+        return bool(self.a or self.b or self.c or self.d)
 
     def __getitem__(self, key: int) -> float:
         if self.half:
@@ -122,12 +215,14 @@ class HurwitzQuaternion:
             return [self.a, self.b, self.c, self.d][key]
 
     def __eq__(self, other: 'HurwitzQuaternion') -> bool:
+        # equal doubled coordinates. the stored form is canonical (half only when the doubled values are odd),
+        # so that is the half flag plus the stored values, and whole 1 + i + j + k differs from half (1 + i + j + k)/2
         if not isinstance(other, HurwitzQuaternion):
             return False
-        return self.a == other.a and self.b == other.b and self.c == other.c and self.d == other.d
+        return self.half == other.half and self.a == other.a and self.b == other.b and self.c == other.c and self.d == other.d
 
     def __hash__(self) -> int:
-        return hash((self.a, self.b, self.c, self.d))
+        return hash(self.doubled())
 
     def __floordiv__(self, other: 'HurwitzQuaternion') -> 'HurwitzQuaternion':
         return self.euclidean_division(other)[0]
@@ -141,13 +236,23 @@ class HurwitzQuaternion:
         return self.euclidean_division(other)[1]
     
     def norm(self) -> float:
-        if self.half == False:
-            return (self.a ** 2 + self.b ** 2 + self.c ** 2 + self.d ** 2)**0.5
-        else:
-            return ((self.a/2) ** 2 + (self.b/2) ** 2 + (self.c/2) ** 2 + (self.d/2) ** 2)**0.5
+        return self.reduced_norm() ** 0.5
+
+    def reduced_norm(self) -> int:
+        # N(q) = a² + b² + c² + d² as an exact int, computed once per instance.
+        # half quaternions store doubled values, and four odd squares always sum to a multiple of 4
+        try:
+            return self._reduced_norm
+        except AttributeError:
+            pass
+        n = self.a * self.a + self.b * self.b + self.c * self.c + self.d * self.d
+        if self.half:
+            n >>= 2
+        _set_reduced_norm(self, n)
+        return n
 
     def conjugate(self) -> 'HurwitzQuaternion':
-        return HurwitzQuaternion(self.a, -self.b, -self.c, -self.d, self.half)
+        return HurwitzQuaternion._make(self.a, -self.b, -self.c, -self.d, self.half)
 
     def unitary(self) -> bool:
         # Q is invertible if ∃q ∈ A such that qq' = q'q = 1.
@@ -164,218 +269,354 @@ class HurwitzQuaternion:
         return self.unitary()
         
     def inverse(self) -> 'HurwitzQuaternion':
-        # Define a dictionary mapping each unitary quaternion to its inverse
-        unitary_inverses = {
-            (1, 0, 0, 0): (1, 0, 0, 0), (-1, 0, 0, 0): (-1, 0, 0, 0), (0, 1, 0, 0): (0, -1, 0, 0),
-            (0, -1, 0, 0): (0, 1, 0, 0), (0, 0, 1, 0): (0, 0, -1, 0), (0, 0, -1, 0): (0, 0, 1, 0),
-            (0, 0, 0, 1): (0, 0, 0, -1), (0, 0, 0, -1): (0, 0, 0, 1), (1, 1, 1, 1): (1, -1, -1, -1),
-            (-1, -1, -1, -1): (-1, 1, 1, 1), (1, -1, 1, -1): (1, 1, -1, 1), (-1, 1, -1, 1): (-1, -1, 1, -1),
-            (1, 1, -1, -1): (1, -1, 1, 1), (-1, -1, 1, 1): (-1, 1, -1, -1), (1, -1, -1, 1): (1, 1, 1, -1),
-            (-1, 1, 1, -1): (-1, -1, -1, 1), (1, 1, 1, -1): (1, -1, -1, 1), (-1, -1, -1, 1): (-1, 1, 1, -1),
-            (1, 1, -1, 1): (1, -1, 1, -1), (-1, -1, 1, -1): (-1, 1, -1, 1), (1, -1, 1, 1): (1, 1, -1, -1),
-            (-1, 1, -1, -1): (-1, -1, 1, 1), (1, -1, -1, -1): (1, 1, 1, 1), (-1, 1, 1, 1): (-1, -1, -1, -1)
-        }
-
-        # Get the quaternion tuple
-        quaternion = (self.a, self.b, self.c, self.d)
-
-        # Return the inverse if the quaternion is unitary, otherwise raise an exception
-        if quaternion in unitary_inverses:
-            inv = unitary_inverses[quaternion]
-            return HurwitzQuaternion(inv[0], inv[1], inv[2], inv[3], self.half)
-        else:
+        # look the inverse up in the precomputed unit group, only the 24 units have one
+        index = UNIT_INDEX.get(self.doubled())
+        if index is None:
             raise ValueError("The quaternion is not unitary and therefore does not have an inverse in 𝐴.")
+        return UNIT_QUATERNIONS[UNIT_INVERSES[index]]
+
+    @staticmethod
+    def unit_multiplication(u: 'HurwitzQuaternion', v: 'HurwitzQuaternion') -> 'HurwitzQuaternion':
+        # product of two units through the Cayley table of the unit group
+        i = UNIT_INDEX.get(u.doubled())
+        j = UNIT_INDEX.get(v.doubled())
+        if i is None or j is None:
+            raise ValueError("Both quaternions must be unitary")
+        return UNIT_QUATERNIONS[UNIT_CAYLEY_TABLE[i][j]]
 
     def general_inverse(self) -> tuple:
         # Defined for non-unitary quaternions, returns the inverse as a tuple
         conjugate = self.conjugate()
         values = conjugate.general
-        norm = self.norm() ** 2
-        print("Conjugate:", repr(conjugate)) if self.debug else None
-        print("Conjugate Values:", values) if self.debug else None
-        print("Norm:", norm) if self.debug else None
+        norm = self.reduced_norm()
         ginv = tuple([val / norm for val in values])
-        print("General Inverse:",ginv ) if self.debug else None
+        if instrument.active:
+            instrument.emit("general_inverse", "inverse", quaternion=self, conjugate=conjugate, norm=norm, inverse=ginv)
         return ginv
 
     @staticmethod
     def factors(n):
-        # Credit to https://stackoverflow.com/questions/6800193/what-is-the-most-efficient-way-of-finding-all-the-factors-of-a-number-in-python
-        return set(reduce(list.__add__,
-                ([i, n//i] for i in range(1, int(n**0.5) + 1) if n % i == 0)))
+        # all divisors of n, built from its prime factorization
+        divisors = {1}
+        for p in factor_integer(n):
+            divisors |= {d * p for d in divisors}
+        return divisors
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def norm_prime(p: int) -> 'HurwitzQuaternion':
+        # some Hurwitz prime of norm p, for a rational prime p
+        if p == 2:
+            return HurwitzQuaternion._make(1, 1, 0, 0, False)
+        # find 1 + x² + y² ≡ 0 (mod p), then 1 + xi + yj has norm divisible by p without p dividing it,
+        # so its right gcd with p has norm exactly p
+        for x in range(p):
+            r = -(1 + x * x) % p
+            if r == 0 or pow(r, (p - 1) // 2, p) == 1:
+                y = sqrt_mod(r, p)
+                return HurwitzQuaternion._make(p, 0, 0, 0, False).right_gcd(HurwitzQuaternion._make(1, x, y, 0, False))
+        raise ValueError(f"{p} is not prime")
+
+    def factorize(self, order: list = None) -> list:
+        # factor into Hurwitz primes, self = π_1 * π_2 * ... * π_k with N(π_i) = order[i].
+        # order lists the prime factors of the norm with multiplicity, ascending when not given.
+        # primes are peeled off the right with the exact right gcd, the leftover unit goes into π_1
+        if self.a == self.b == self.c == self.d == 0:
+            raise ValueError("Cannot factor the zero quaternion")
+        norm_primes = factor_integer(self.reduced_norm())
+        if order is None:
+            order = norm_primes
+        elif sorted(order) != list(norm_primes):
+            raise ValueError(f"order must be a permutation of the prime factors of the norm, {norm_primes}")
+        if not order:
+            return [self]
+
+        rest = self
+        primes = []
+        for p in reversed(order):
+            prime = rest.right_gcd(HurwitzQuaternion._make(p, 0, 0, 0, False))
+            if prime.reduced_norm() != p:
+                # p itself right-divides rest, and p = conj(π)π for any π of norm p
+                prime = HurwitzQuaternion.norm_prime(p)
+            rest = _right_division(rest, prime)[0]
+            primes.append(prime)
+        primes.reverse()
+        # rest is now a unit
+        primes[0] = rest * primes[0]
+        return primes
+
+    @staticmethod
+    def four_square_points(m: int, odd: bool = False):
+        # every (x0, x1, x2, x3) with x0² + x1² + x2² + x3² = m, all odd when odd is set, each exactly once.
+        # three coordinates are looped over, the last one is looked up in a table of squares
+        step = 2 if odd else 1
+        roots = {k * k: k for k in range(1 if odd else 0, isqrt(m) + 1, step)}
+
+        def values(limit):
+            # the coordinates with |x| <= limit and the right parity
+            if odd and limit % 2 == 0:
+                limit -= 1
+            return range(-limit, limit + 1, step)
+
+        for x0 in values(isqrt(m)):
+            m0 = m - x0 * x0
+            for x1 in values(isqrt(m0)):
+                m1 = m0 - x1 * x1
+                for x2 in values(isqrt(m1)):
+                    x3 = roots.get(m1 - x2 * x2)
+                    if x3 is not None:
+                        yield (x0, x1, x2, x3)
+                        if x3:
+                            yield (x0, x1, x2, -x3)
+
+    @staticmethod
+    def elements_of_norm(n: int, half: bool = None, up_to_units: bool = False):
+        # lazily yields every Hurwitz quaternion of reduced norm n. half=False only yields whole ones,
+        # half=True only half ones, and None both. with up_to_units each class of associates is yielded
+        # once, as its canonical associate, and half filters on that representative instead
+        if not isinstance(n, int):
+            raise TypeError("The norm must be an int")
+        if n < 0:
+            return
+        if up_to_units:
+            # every class of associates has a whole member, so walking Z^4 is enough. a class is yielded
+            # from its largest whole member, which is exactly one point per class
+            for x in HurwitzQuaternion.four_square_points(n):
+                doubled = (2 * x[0], 2 * x[1], 2 * x[2], 2 * x[3])
+                orbit = HurwitzQuaternion.unit_orbit(doubled)
+                if doubled != max(y for y in orbit if not y[0] & 1):
+                    continue
+                canonical = max(orbit)
+                if half is None or half == bool(canonical[0] & 1):
+                    yield HurwitzQuaternion._from_doubled(*canonical)
+            return
+        if not half:
+            for x in HurwitzQuaternion.four_square_points(n):
+                yield HurwitzQuaternion._make(*x, False)
+        if half is None or half:
+            for x in HurwitzQuaternion.four_square_points(4 * n, odd=True):
+                yield HurwitzQuaternion._make(*x, True)
 
     @staticmethod
     def general_norm(a: tuple) -> float:
         return (a[0] ** 2 + a[1] ** 2 + a[2] ** 2 + a[3] ** 2)**0.5
 
+    @staticmethod
+    def nearest_hurwitz_doubled(t: tuple, m: int) -> tuple:
+        # doubled coordinates of the Hurwitz quaternion closest to the rational point t/m (m > 0), in exact integers.
+        # the Hurwitz order is Z^4 ∪ (Z^4 + ½), so round into both cosets and keep whichever lands closer
+        whole = tuple(2 * ((2 * val + m) // (2 * m)) for val in t)
+        half = tuple(2 * (val // m) + 1 for val in t)
+        # squared distances to t/m in doubled coordinates, scaled by m^2 so they stay integral
+        whole_dist = sum((m * w - 2 * val) ** 2 for w, val in zip(whole, t))
+        half_dist = sum((m * h - 2 * val) ** 2 for h, val in zip(half, t))
+        return half if half_dist < whole_dist else whole
+
     def euclidean_division(self, other: 'HurwitzQuaternion') -> ('HurwitzQuaternion', 'HurwitzQuaternion'):
         # source: https://m-hikari.com/imf/imf-2012/41-44-2012/perngIMF41-44-2012.pdf
+        # right division, self = q*other + r with N(r) < N(other). q is a*b^-1 = a*conj(b)/N(b) rounded to the
+        # nearest Hurwitz quaternion, all of it computed on doubled integer coordinates so it is exact for any size
         if not isinstance(other, HurwitzQuaternion):
             raise TypeError("Can only divide by another HurwitzQuaternion")
         if other.a == other.b == other.c == other.d == 0:
             raise ZeroDivisionError("Cannot divide by zero quaternion")
 
-        print("Attempting to divide a:", repr(self), "by b:", repr(other)) if self.debug else None
-        # Calculate general inverse of the divisor b^-1
-        binv = other.general_inverse()
-        print("Inverse of divisor: b^-1", binv) if self.debug else None
-        # Calculate general product of the dividend and the divisor inverse: a*b^-1
-        abinv = self.general_quaternion_multiplication(self.general, binv)
-        print("General product of dividend and inverse: ab^-1", abinv) if self.debug else None
-        # Round the coefficients of the general product to the nearest integer, givning a number q which has 
-        # coefficients which are 1/2 or less away from the coefficients of the general product
-        # q : abs(n_i) ≤ 1/2 ∀ n_i ∈ n_1 + n_2*i + n_3*j + n_3*k = a*(b^-1) - q
-        q_whole = [round(val) for val in abinv]
-        # try rounding every number to a half int, NOT a whole int
-        q_half = [self.round_to_only_half(val) for val in abinv]
-
-
-        print("Int Rounded general product: q=", q_whole) if self.debug else None
-        print("Half Rounded general product: q=", q_half) if self.debug else None
-        qb_whole = self.general_quaternion_multiplication(other.general, q_whole)
-        gb_whole_norm = self.general_norm([qb_whole[i] - self.general[i] for i in range(4)])
-        print(f"Product of divisor and whole rounded product: qb={qb_whole} with norm {gb_whole_norm}") if self.debug else None
-        qb_half = self.general_quaternion_multiplication(other.general, q_half)
-        gb_half_norm = self.general_norm([qb_half[i] - self.general[i] for i in range(4)])
-        print(f"Product of divisor and half rounded product: qb={qb_half} with norm {gb_half_norm}") if self.debug else None
-        delta_half = abs(self.norm() - gb_whole_norm)
-        delta_whole = abs(self.norm() - gb_half_norm)
-        print("Delta Whole:", delta_whole) if self.debug else None
-        print("Delta Half:", delta_half) if self.debug else None
-        if delta_half < delta_whole:
-            q = q_half
-        else:
-            q = q_whole
-
-        print(f"Resultant formula: a = qb + r -> {repr(self)} = ({repr(other)})({q[0]} + {q[1]}i + {q[2]}j + {q[3]}ij) + r") if self.debug else None
-        # calculate qb
-        qb = self.general_quaternion_multiplication(other.general, q)
-        print("Product of divisor and rounded product: qb=", qb) if self.debug else None
-
-        # Calculate the error between the rounded product and the general product
-        r = [self.general[i] - qb[i] for i in range(4)]
-        print("Difference between rounded product and general product: r = ", r) if self.debug else None
-        r_rounded_to_half = [self.round_to_nearest_half(val) for val in r]
-        r_preprocess = [int(r_rounded_to_half[i]*2) for i in range(4)]
-        q_rounded_to_half = [self.round_to_nearest_half(val) for val in q]   
-        q_preprocess = [int(q_rounded_to_half[i]*2) for i in range(4)]
-        print("Rounded/doubled preprocesed r:", r_preprocess) if self.debug else None
-        print("Rounded/doubled preprocesed q:", q_preprocess) if self.debug else None
-        return (HurwitzQuaternion(*q_preprocess, True), HurwitzQuaternion(*r_preprocess, True))
+        mul = self.general_quaternion_multiplication
+        a = self.doubled()
+        b = other.doubled()
+        # D(a)*D(conj(b)) = 4*a*conj(b), and 4*N(b) = D(b)·D(b)
+        t = mul(a, (b[0], -b[1], -b[2], -b[3]))
+        q = self.nearest_hurwitz_doubled(t, b[0] * b[0] + b[1] * b[1] + b[2] * b[2] + b[3] * b[3])
+        qb = mul(q, b)
+        r = (a[0] - (qb[0] >> 1), a[1] - (qb[1] >> 1), a[2] - (qb[2] >> 1), a[3] - (qb[3] >> 1))
+        if instrument.active:
+            instrument.emit("division", "doubled", dividend=self, divisor=other, product=t, quotient=q, remainder=r)
+        return (HurwitzQuaternion._from_doubled(*q), HurwitzQuaternion._from_doubled(*r))
+
+    def left_euclidean_division(self, other: 'HurwitzQuaternion') -> ('HurwitzQuaternion', 'HurwitzQuaternion'):
+        # left division, self = other*q + r with N(r) < N(other), rounding b^-1*a = conj(b)*a/N(b)
+        if not isinstance(other, HurwitzQuaternion):
+            raise TypeError("Can only divide by another HurwitzQuaternion")
+        if other.a == other.b == other.c == other.d == 0:
+            raise ZeroDivisionError("Cannot divide by zero quaternion")
+
+        mul = self.general_quaternion_multiplication
+        a = self.doubled()
+        b = other.doubled()
+        t = mul((b[0], -b[1], -b[2], -b[3]), a)
+        q = self.nearest_hurwitz_doubled(t, b[0] * b[0] + b[1] * b[1] + b[2] * b[2] + b[3] * b[3])
+        bq = mul(b, q)
+        r = (a[0] - (bq[0] >> 1), a[1] - (bq[1] >> 1), a[2] - (bq[2] >> 1), a[3] - (bq[3] >> 1))
+        return (HurwitzQuaternion._from_doubled(*q), HurwitzQuaternion._from_doubled(*r))
+
+    def right_gcd(self, other: 'HurwitzQuaternion') -> 'HurwitzQuaternion':
+        # greatest common right divisor d, self = x*d and other = y*d. unique up to a unit on the left
+        return self.right_extended_gcd(other)[0]
+
+    def left_gcd(self, other: 'HurwitzQuaternion') -> 'HurwitzQuaternion':
+        # greatest common left divisor d, self = d*x and other = d*y. unique up to a unit on the right
+        return self.left_extended_gcd(other)[0]
+
+    def right_extended_gcd(self, other: 'HurwitzQuaternion') -> ('HurwitzQuaternion', 'HurwitzQuaternion', 'HurwitzQuaternion'):
+        # returns (d, u, v) with u*self + v*other = d, d the right gcd
+        zero = HurwitzQuaternion._make(0, 0, 0, 0, False)
+        one = HurwitzQuaternion._make(1, 0, 0, 0, False)
+        r0, u0, v0 = self, one, zero
+        r1, u1, v1 = other, zero, one
+        while r1.a or r1.b or r1.c or r1.d:
+            q, r = _right_division(r0, r1)
+            r0, u0, v0, r1, u1, v1 = r1, u1, v1, r, u0 - q * u1, v0 - q * v1
+        return (r0, u0, v0)
+
+    def left_extended_gcd(self, other: 'HurwitzQuaternion') -> ('HurwitzQuaternion', 'HurwitzQuaternion', 'HurwitzQuaternion'):
+        # returns (d, u, v) with self*u + other*v = d, d the left gcd
+        zero = HurwitzQuaternion._make(0, 0, 0, 0, False)
+        one = HurwitzQuaternion._make(1, 0, 0, 0, False)
+        r0, u0, v0 = self, one, zero
+        r1, u1, v1 = other, zero, one
+        while r1.a or r1.b or r1.c or r1.d:
+            q, r = _left_division(r0, r1)
+            r0, u0, v0, r1, u1, v1 = r1, u1, v1, r, u0 - u1 * q, v0 - v1 * q
+        return (r0, u0, v0)
 
     def euclidean_division_pro_max(self, other: 'HurwitzQuaternion') -> ('HurwitzQuaternion', 'HurwitzQuaternion'):
         # like regular euclidean division, but also tries to divide the conjuigate of the dividend by the divisor
         # and returns the result with the smallest remainder
-        forward = self.euclidean_division(other)
-        backward = self.conjugate().euclidean_division(other)
-        if forward[1].norm() > backward[1].norm():
-            print("Conjugate division has smaller remainder by ", forward[1].norm() - backward[1].norm()) if self.debug else None
+        forward = _right_division(self, other)
+        backward = _right_division(self.conjugate(), other)
+        forward_norm = forward[1].reduced_norm()
+        backward_norm = backward[1].reduced_norm()
+        if instrument.active:
+            instrument.emit("division_pro_max", "remainders", forward=forward, backward=backward,
+                            forward_norm=forward_norm, backward_norm=backward_norm)
+        # on equal remainders the regular division wins
+        if forward_norm > backward_norm:
             return backward
-        elif forward[1].norm() < backward[1].norm():
-            print("Regular division has smaller remainder by ", backward[1].norm()- forward[1].norm()) if self.debug else None
-            return forward
-        else:
-            print("Remainders are equal, returning regular division") if self.debug else None
-            return forward
+        return forward
 
     def snap(self, general_quaternion: tuple) -> 'HurwitzQuaternion':
-        # Round the values of the general quaternion to the nearest integer or half
-        g_norm = self.general_norm(general_quaternion)
-
-        g_whole = [round(val) for val in general_quaternion]
-        g_half = [self.round_to_only_half(val) for val in general_quaternion]
+        # the Hurwitz quaternion nearest to a general quaternion. the order is Z^4 ∪ (Z^4 + ½), so round every
+        # coordinate into each coset and keep the candidate closer to the point (the whole one on a tie).
+        # the half candidate is kept as the exact int 2*floor + 1 and its distance taken from val - floor, which
+        # is exact for floats, floor + 0.5 would lose the half once |val| >= 2^52
+        whole = tuple(round(val) for val in general_quaternion)
+        floors = tuple(floor(val) for val in general_quaternion)
+        whole_dist = sum((val - w) ** 2 for val, w in zip(general_quaternion, whole))
+        half_dist = sum((val - f - 0.5) ** 2 for val, f in zip(general_quaternion, floors))
+        if half_dist < whole_dist:
+            return HurwitzQuaternion._make(*(2 * f + 1 for f in floors), True)
+        return HurwitzQuaternion._make(*(int(w) for w in whole), False)
+
+    def _binomial_parts(self) -> (tuple, tuple):
+        # the whole part as plain coordinates and the half unit as doubled ones (None for whole quaternions).
+        # a half coordinate x/2 splits into (x - sign(x))/2 plus sign(x)/2, so the whole part rounds towards zero
+        if not self.half:
+            return (self.a, self.b, self.c, self.d), None
+        signs = tuple(1 if val > 0 else -1 for val in (self.a, self.b, self.c, self.d))
+        whole = tuple((val - sign) // 2 for val, sign in zip((self.a, self.b, self.c, self.d), signs))
+        return whole, signs
+
+    def decompose(self, mode: str = "list"):
+        # decompose into unit quaternions: |coefficient| copies of ±1, ±i, ±j or ±k for every coefficient of
+        # the whole part, followed by the half unit for half quaternions.
+        # mode "list" returns them as a list, "iter" as a lazy iterator and "runs" as a list of (unit, count)
+        # pairs. the units are the shared UNIT_QUATERNIONS, so none of the modes allocates per unit
+        if mode not in ("list", "iter", "runs"):
+            raise ValueError('mode must be "list", "iter" or "runs"')
+        whole, half_unit = self._binomial_parts()
+        if instrument.active:
+            instrument.emit("decompose", "parts", quaternion=self, whole=whole, half_unit=half_unit)
+        runs = []
+        for index, val in enumerate(whole):
+            if val:
+                unit = [0, 0, 0, 0]
+                unit[index] = 2 if val > 0 else -2
+                runs.append((UNIT_QUATERNIONS[UNIT_INDEX[tuple(unit)]], abs(val)))
+        if half_unit is not None:
+            runs.append((UNIT_QUATERNIONS[UNIT_INDEX[half_unit]], 1))
+        if mode == "runs":
+            return runs
+        units = (unit for unit, count in runs for _ in range(count))
+        if mode == "iter":
+            return units
+        return list(units)
 
-        g_whole_norm = self.general_norm(g_whole)
-        g_half_norm = self.general_norm(g_half)
-
-        delta_half = abs(g_norm - g_whole_norm)
-        delta_whole = abs(g_norm - g_half_norm)
-        g = []
-        if delta_half < delta_whole:
-            g = g_half
-        else:
-            g = g_whole
-        
-        g_rounded_to_half = [self.round_to_nearest_half(val) for val in g]   
-        g_preprocess = [int(g_rounded_to_half[i]*2) for i in range(4)]
-
-        return HurwitzQuaternion(*g_preprocess, True)
+    def decompose_binomial(self) -> tuple:
+        # (whole part, half unit) straight from the coefficients, the half unit is None for whole quaternions
+        whole, half_unit = self._binomial_parts()
+        half = UNIT_QUATERNIONS[UNIT_INDEX[half_unit]] if half_unit is not None else None
+        return (HurwitzQuaternion._make(*whole, False), half)
 
-    def decompose(self) -> list:
-        q_b, r_b = self.euclidean_division(HurwitzQuaternion(1, 1, 1, 1, True))
-        print("Decomposition of", repr(self)) if self.debug else None
-        general = self.general
+    def doubled(self) -> tuple:
+        # all-doubled integer coordinates (2a, 2b, 2c, 2d), which put whole and half quaternions on the same footing
         if self.half:
-            r_h = (general[0]/abs(general[0]))*0.5
-            i_h = (general[1]/abs(general[1]))*0.5
-            j_h = (general[2]/abs(general[2]))*0.5
-            k_h = (general[3]/abs(general[3]))*0.5
-        else:
-            r_h = 0
-            i_h = 0
-            j_h = 0
-            k_h = 0
-
-        r = general[0] - r_h
-        i = general[1] - i_h
-        j = general[2] - j_h
-        k = general[3] - k_h
-        print("General whole quat:", r, i, j, k) if self.debug else None
-        # return n unitary quaternion for each value in self
-        real = [HurwitzQuaternion(int(r/abs(r)), 0, 0, 0) for _ in range(int(abs(r)))]
-        imag = [HurwitzQuaternion(0, int(i/abs(i)), 0, 0) for _ in range(int(abs(i)))]
-        jmag = [HurwitzQuaternion(0, 0, int(j/abs(j)), 0) for _ in range(int(abs(j)))]
-        kmag = [HurwitzQuaternion(0, 0, 0, int(k/abs(k))) for _ in range(int(abs(k)))]
-        whole_part = real + imag + jmag + kmag
-        
-        if self.half == False:
-            return whole_part
-        else:
-            half_unit = HurwitzQuaternion(int(r_h*2), int(i_h*2), int(j_h*2), int(k_h*2), True)
-            print("Half part unit quat:", repr(half_unit)) if self.debug else None
-            return whole_part + [half_unit]
+            return (self.a, self.b, self.c, self.d)
+        return (2 * self.a, 2 * self.b, 2 * self.c, 2 * self.d)
 
-    def decompose_binomial(self) -> tuple:
-        decomposition = self.decompose()
-        half = decomposition[-1] if decomposition[-1].half == True else False
-        whole = HurwitzQuaternion(0, 0, 0, 0)
-        if half != False:
-            decomposition = decomposition[:-1]
-            # sum all the whole quaternions
-            for quat in decomposition:
-                whole += quat
-            return (whole, half)
-        else:
-            # sum all the whole quaternions
-            for quat in decomposition:
-                whole += quat
-            return (whole, None)
-        
-    def __pow__(self, power: int) -> 'HurwitzQuaternion':
+    def __pow__(self, power: int, modulo: int = None) -> 'HurwitzQuaternion':
         if not isinstance(power, int):
             raise TypeError("Can only raise HurwitzQuaternion to an integer power, will implement fractional powers and quaternion powers later")
+        if modulo is not None:
+            return self._modular_pow(power, modulo)
         if power == 0:
-            return HurwitzQuaternion(1, 0, 0, 0, False)  # Always use whole quaternion for identity
+            return UNIT_QUATERNIONS[UNIT_INDEX[(2, 0, 0, 0)]]  # Always use whole quaternion for identity
         if power == 1:
             return self
         if power < 0:
             return (self.inverse() ** abs(power))  # Handle negative powers using the inverse
 
-        result = HurwitzQuaternion(1, 0, 0, 0, False)  # Start with the identity quaternion as a whole quaternion
+        if instrument.active:
+            instrument.emit("power", "steps", base=self, power=power,
+                            products=power.bit_length() + bin(power).count("1") - 2)
+        # square-and-multiply on doubled coordinates: D(xy) = D(x)D(y)/2, and the product is always even
+        mul = self.general_quaternion_multiplication
+        base = self.doubled()
+        result = None
+        while True:
+            if power & 1:
+                result = base if result is None else tuple(val >> 1 for val in mul(result, base))
+            power >>= 1
+            if not power:
+                break
+            base = tuple(val >> 1 for val in mul(base, base))
+        return HurwitzQuaternion._from_doubled(*result)
+
+    def _modular_pow(self, power: int, modulo: int) -> 'HurwitzQuaternion':
+        # pow(q, n, m): q**n with its coefficients reduced into [0, m), returned as a whole quaternion.
+        # half quaternions need 2 to be invertible mod m, i.e. an odd modulus
+        if not isinstance(modulo, int):
+            raise TypeError("Modulus must be an int")
+        if modulo <= 0:
+            raise ValueError("Modulus must be a positive int")
         base = self
-        print("Starting power calculation, base:", repr(base), "power:", power) if self.debug else None
-        # decompose into binomial form
-        whole, half = base.decompose_binomial()
-        print("Decomposed into whole:", repr(whole), "half:", repr(half)) if self.debug else None
-        # calculate whole * whole, whole * half, half * whole, half * half
-        
-        if power >= 2:
-            for _ in range(power):
-                print("result before:", repr(result)) if self.debug else None
-                result = result.binomial_multiplication(base)
-                print("result after:", repr(result)) if self.debug else None
-
-        return result
+        if power < 0:
+            base = self.inverse()  # Handle negative powers using the inverse
+            power = -power
+        mul = self.general_quaternion_multiplication
+        if not base.half:
+            # whole quaternions are closed under multiplication, reduce the plain coefficients
+            result = (1 % modulo, 0, 0, 0)
+            base = tuple(val % modulo for val in (base.a, base.b, base.c, base.d))
+            while power:
+                if power & 1:
+                    result = tuple(val % modulo for val in mul(result, base))
+                power >>= 1
+                if power:
+                    base = tuple(val % modulo for val in mul(base, base))
+            return HurwitzQuaternion._make(*result, False)
+        if modulo % 2 == 0:
+            raise ValueError("Half quaternions can only be reduced modulo an odd int")
+        # with 2 invertible, D(xy) = D(x)D(y)/2 becomes D(x)D(y) * 2^-1 mod m
+        inv2 = (modulo + 1) // 2
+        result = (2 % modulo, 0, 0, 0)
+        base = tuple(val % modulo for val in base.doubled())
+        while power:
+            if power & 1:
+                result = tuple(val * inv2 % modulo for val in mul(result, base))
+            power >>= 1
+            if power:
+                base = tuple(val * inv2 % modulo for val in mul(base, base))
+        return HurwitzQuaternion._make(*(val * inv2 % modulo for val in result), False)
 
     def binomial_multiplication(self, other: 'HurwitzQuaternion') -> 'HurwitzQuaternion':
         whole, half = self.decompose_binomial()
@@ -384,12 +625,10 @@ class HurwitzQuaternion:
         whole_half = whole * half_other if whole != None and half_other != None else HurwitzQuaternion(0, 0, 0, 0, False)
         half_whole = half * whole_other if half != None and whole_other != None else HurwitzQuaternion(0, 0, 0, 0, False)
         half_half = half * half_other if half != None and half_other != None else HurwitzQuaternion(0, 0, 0, 0, False)
-        print("Whole Whole:", repr(whole_whole)) if self.debug else None
-        print("Whole Half:", repr(whole_half)) if self.debug else None
-        print("Half Whole:", repr(half_whole)) if self.debug else None
-        print("Half Half:", repr(half_half)) if self.debug else None
         result = whole_whole + whole_half + half_whole + half_half
-        print("result:", result) if self.debug else None
+        if instrument.active:
+            instrument.emit("binomial_multiplication", "partial_products", whole_whole=whole_whole, whole_half=whole_half,
+                            half_whole=half_whole, half_half=half_half, result=result)
         return result
 
     def imaginary_string(self) -> str:
@@ -464,15 +703,32 @@ class HurwitzQuaternion:
     def verbose_string(self) -> str:
         return f"{self.a} + {self.b}i + {self.c}j + {self.d}ij"
 
+    @staticmethod
+    def unit_orbit(x: tuple) -> list:
+        # doubled coordinates of u*q for each of the 24 units u (in UNITS order), given q in doubled coordinates.
+        # left multiplication by a unit only permutes and negates x or the half sums (±x0 ± x1 ± x2 ± x3)/2,
+        # so the orbit is read out of those 24 values through UNIT_LEFT_ACTIONS without any multiplication
+        x0, x1, x2, x3 = x
+        p, m = x0 + x1, x0 - x1
+        q, n = x2 + x3, x2 - x3
+        values = (x0, x1, x2, x3, (p + q) >> 1, (p + n) >> 1, (p - n) >> 1, (p - q) >> 1,
+                  (m + q) >> 1, (m + n) >> 1, (m - n) >> 1, (m - q) >> 1)
+        values += tuple(-val for val in values)
+        return [(values[i], values[j], values[k], values[l]) for i, j, k, l in UNIT_LEFT_ACTIONS]
+
     def associates(self):
-        # get all associates of the quaternion
-        associates = [] 
-        # multiply by all unitary quaternions
-        for unitary in self.unitary_whole_quaternions:
-            associates.append(HurwitzQuaternion(*unitary)*self)
-        for unitary in self.unitary_half_quaternions:
-            associates.append(HurwitzQuaternion(*unitary, True)*self)
-        return associates
+        # get all associates of the quaternion, u*q for each of the 24 units u (whole units first)
+        orbit = self.unit_orbit(self.doubled())
+        if self.reduced_norm() == 1:
+            return [UNIT_QUATERNIONS[UNIT_INDEX[x]] for x in orbit]
+        if _interned is not None and self.reduced_norm() <= _intern_max_norm:
+            return [_interned(*x) for x in orbit]
+        return [HurwitzQuaternion._from_doubled(*x) for x in orbit]
+
+    def canonical_associate(self) -> 'HurwitzQuaternion':
+        # deterministic representative of {u*q : u a unit}, the associate with the largest doubled coordinates.
+        # two quaternions are associates exactly when their canonical associates are the same
+        return HurwitzQuaternion._intern(max(self.unit_orbit(self.doubled())))
 
     def equivalence_class(self):
         # get the equivalence class of the quaternion
@@ -482,12 +738,8 @@ class HurwitzQuaternion:
         """
         Check if two quaternions are associates.
         """
-        if q1.norm() == q2.norm():
-            q1_associates = q1.associates()
-            print(q1_associates) if self.debug else None
-            print(q2.general) if self.debug else None
-            if q2 in q1_associates:
-                return True
+        if q1.reduced_norm() == q2.reduced_norm():
+            return q1.canonical_associate().doubled() == q2.canonical_associate().doubled()
         return False
 
     @staticmethod
@@ -526,3 +778,215 @@ class HurwitzQuaternion:
         # Calculate the product of the dividend 'a' and the multiplicative inverse of the divisor 'b'
         abinv = HurwitzQuaternion.general_quaternion_multiplication(a, HurwitzQuaternion.general_inverse(b))
         return abinv
+
+
+# the slot descriptors, how the constructors write an instance past __setattr__
+_set_a = HurwitzQuaternion.a.__set__
+_set_b = HurwitzQuaternion.b.__set__
+_set_c = HurwitzQuaternion.c.__set__
+_set_d = HurwitzQuaternion.d.__set__
+_set_half = HurwitzQuaternion.half.__set__
+_set_reduced_norm = HurwitzQuaternion._reduced_norm.__set__
+
+
+def _from_doubled(a: int, b: int, c: int, d: int) -> HurwitzQuaternion:
+    # module-level so pickles reference it by name
+    return HurwitzQuaternion._from_doubled(a, b, c, d)
+
+
+class HurwitzAccumulator:
+    """
+    A running sum of Hurwitz quaternions that only builds a quaternion when its value is asked for.
+
+    The stored coefficients of whole and half terms are added up separately, the sum is 2 * whole + half
+    in doubled coordinates, so adding a term allocates no quaternion and needs no parity case analysis.
+
+        total = HurwitzAccumulator()
+        for q in quaternions:
+            total += q
+        total.value()
+    """
+    __slots__ = ('whole', 'half')
+
+    def __init__(self, quaternions=()) -> None:
+        self.whole = [0, 0, 0, 0]
+        self.half = [0, 0, 0, 0]
+        self.update(quaternions)
+
+    def update(self, quaternions, sign: int = 1) -> 'HurwitzAccumulator':
+        # adds every quaternion of an iterable (subtracts with sign=-1)
+        w0, w1, w2, w3 = self.whole
+        h0, h1, h2, h3 = self.half
+        for q in quaternions:
+            if not isinstance(q, HurwitzQuaternion):
+                self.whole, self.half = [w0, w1, w2, w3], [h0, h1, h2, h3]
+                raise TypeError("Can only accumulate HurwitzQuaternions")
+            if sign < 0:
+                if q.half:
+                    h0 -= q.a; h1 -= q.b; h2 -= q.c; h3 -= q.d
+                else:
+                    w0 -= q.a; w1 -= q.b; w2 -= q.c; w3 -= q.d
+            elif q.half:
+                h0 += q.a; h1 += q.b; h2 += q.c; h3 += q.d
+            else:
+                w0 += q.a; w1 += q.b; w2 += q.c; w3 += q.d
+        self.whole, self.half = [w0, w1, w2, w3], [h0, h1, h2, h3]
+        return self
+
+    def __iadd__(self, other) -> 'HurwitzAccumulator':
+        if isinstance(other, HurwitzAccumulator):
+            self.whole = [x + y for x, y in zip(self.whole, other.whole)]
+            self.half = [x + y for x, y in zip(self.half, other.half)]
+            return self
+        if not isinstance(other, HurwitzQuaternion):
+            return NotImplemented
+        values = self.half if other.half else self.whole
+        values[0] += other.a
+        values[1] += other.b
+        values[2] += other.c
+        values[3] += other.d
+        return self
+
+    def __isub__(self, other) -> 'HurwitzAccumulator':
+        if isinstance(other, HurwitzAccumulator):
+            self.whole = [x - y for x, y in zip(self.whole, other.whole)]
+            self.half = [x - y for x, y in zip(self.half, other.half)]
+            return self
+        if not isinstance(other, HurwitzQuaternion):
+            return NotImplemented
+        values = self.half if other.half else self.whole
+        values[0] -= other.a
+        values[1] -= other.b
+        values[2] -= other.c
+        values[3] -= other.d
+        return self
+
+    def doubled(self) -> tuple:
+        return tuple(2 * w + h for w, h in zip(self.whole, self.half))
+
+    def value(self) -> HurwitzQuaternion:
+        # the sum so far, normalized once into a whole or half quaternion
+        return HurwitzQuaternion._from_doubled(*self.doubled())
+
+    def __repr__(self) -> str:
+        return f"HurwitzAccumulator({self.value()!r})"
+
+
+def sum_quaternions(quaternions, start: HurwitzQuaternion = None) -> HurwitzQuaternion:
+    # the sum of an iterable of quaternions (plus start), building only the result
+    total = HurwitzAccumulator(quaternions)
+    if start is not None:
+        total += start
+    return total.value()
+
+
+# the unit group of the Hurwitz order in doubled coordinates, whole units first, and its Cayley table:
+# UNITS[UNIT_CAYLEY_TABLE[i][j]] == UNITS[i] * UNITS[j]
+UNITS = tuple(sorted((2 * a, 2 * b, 2 * c, 2 * d) for a, b, c, d in UNITARY_WHOLE_QUATERNIONS)) + tuple(sorted(UNITARY_HALF_QUATERNIONS))
+UNIT_INDEX = {unit: index for index, unit in enumerate(UNITS)}
+UNIT_CAYLEY_TABLE = tuple(
+    tuple(UNIT_INDEX[tuple(val >> 1 for val in HurwitzQuaternion.general_quaternion_multiplication(u, v))] for v in UNITS)
+    for u in UNITS
+)
+UNIT_INVERSES = tuple(row.index(UNIT_INDEX[(2, 0, 0, 0)]) for row in UNIT_CAYLEY_TABLE)
+# the units as shared HurwitzQuaternion objects, in UNITS order
+UNIT_QUATERNIONS = tuple(HurwitzQuaternion._from_doubled(*unit) for unit in UNITS)
+
+# the optional LRU of small-norm quaternions, see HurwitzQuaternion.set_intern_cache
+_interned = None
+_intern_max_norm = 0
+
+
+def _left_action(unit: tuple) -> tuple:
+    # for each coordinate of D(u*x) = H(D(u), D(x))/2, the position of its value in the table built by
+    # HurwitzQuaternion.unit_orbit: x0..x3, then the half sums (x0 ± x1 ± x2 ± x3)/2, then all of those negated
+    patterns = [(1, s1, s2, s3) for s1 in (1, -1) for s2 in (1, -1) for s3 in (1, -1)]
+    columns = [HurwitzQuaternion.general_quaternion_multiplication(unit, basis) for basis in
+               ((1, 0, 0, 0), (0, 1, 0, 0), (0, 0, 1, 0), (0, 0, 0, 1))]
+    action = []
+    for i in range(4):
+        coefficients = [column[i] for column in columns]
+        if coefficients.count(0) == 3:
+            j = next(j for j, val in enumerate(coefficients) if val)
+            index, sign = j, coefficients[j]
+        else:
+            sign = coefficients[0]
+            index = 4 + patterns.index(tuple(sign * val for val in coefficients))
+        action.append(index if sign > 0 else index + 12)
+    return tuple(action)
+
+
+UNIT_LEFT_ACTIONS = tuple(_left_action(unit) for unit in UNITS)
+
+
+# methods the optional compiled core (_speedups.c) replaces. the pure-Python versions stay here, the compiled
+# ones hand every call they cannot do in 128-bit integers (or with other types) back to them
+PURE_PYTHON = {name: HurwitzQuaternion.__dict__[name] for name in (
+    '__init__', '_make', '_from_doubled', '__add__', '__sub__', '__mul__', 'reduced_norm',
+    'euclidean_division', 'left_euclidean_division')}
+
+try:
+    from . import _speedups
+except ImportError:
+    _speedups = None
+
+
+# the class as defined, before the compiled core or any layer replaced a method
+_PLAIN = dict(vars(HurwitzQuaternion))
+# the compiled core methods while use_speedups is on
+_compiled = {}
+# layers of wrappers set by the cache and instrument modules, {layer: {name: wrap(method) -> method}}. every
+# method is rebuilt from the core in LAYERS order, so layers can be switched on and off in any order
+LAYERS = ('cache', 'instrument')
+_layers = {}
+_dispatched = set(PURE_PYTHON)
+# the divisions the gcds, factorizations and pro max division call internally: the dispatched ones without
+# the cache layer, which only sits on the public entry points
+_right_division = HurwitzQuaternion.euclidean_division
+_left_division = HurwitzQuaternion.left_euclidean_division
+
+
+def _dispatch() -> None:
+    # puts the core (pure-Python while tracing, the intermediate events come from there) plus every layer in place
+    global _right_division, _left_division
+    core = _compiled if _compiled and not instrument.active else PURE_PYTHON
+    _dispatched.update(*_layers.values())
+    for name in _dispatched:
+        method = internal = core.get(name, _PLAIN[name])
+        for layer in LAYERS:
+            wrap = _layers.get(layer, {}).get(name)
+            if wrap is not None:
+                method = wrap(method)
+                internal = internal if layer == 'cache' else wrap(internal)
+        setattr(HurwitzQuaternion, name, method)
+        if name == 'euclidean_division':
+            _right_division = internal
+        elif name == 'left_euclidean_division':
+            _left_division = internal
+
+
+def set_layer(layer: str, wrappers: dict = None) -> None:
+    # installs the wrappers of one of LAYERS, or removes the layer when None
+    if layer not in LAYERS:
+        raise ValueError(f"Unknown layer {layer!r}, expected one of {', '.join(LAYERS)}")
+    if wrappers:
+        _layers[layer] = dict(wrappers)
+    else:
+        _layers.pop(layer, None)
+    _dispatch()
+
+
+def use_speedups(enabled: bool = True) -> bool:
+    # switch between the compiled core and the pure-Python methods, returns whether the compiled core is in use.
+    # HURWITZ_PURE_PYTHON=1 in the environment keeps it off at import. cache and instrument layers stay in place
+    global _compiled
+    enabled = enabled and _speedups is not None
+    if enabled:
+        _compiled = _speedups.install(HurwitzQuaternion, {name: getattr(method, '__func__', method) for name, method in PURE_PYTHON.items()})
+    else:
+        _compiled = {}
+    _dispatch()
+    return enabled
+
+
+use_speedups(not os.environ.get('HURWITZ_PURE_PYTHON'))
@@ -0,0 +1,123 @@
+"""
+Opt-in instrumentation for HurwitzQuaternion.
+
+Tracers are callables that receive Event tuples. While at least one is registered, the arithmetic methods
+of HurwitzQuaternion are swapped for wrappers that emit a 'call' event (with the time spent) per call, and
+the heavier methods emit events carrying their intermediate values. With no tracer registered the original
+methods are back in place, so the hot path runs exactly as uninstrumented code.
+
+    with profile() as stats:
+        q ** 1000
+    print(stats.counts["multiplication"], stats.seconds["power"])
+"""
+from collections import Counter, defaultdict, namedtuple
+from contextlib import contextmanager
+from functools import wraps
+from time import perf_counter
+
+# operation is the counter name (see INSTRUMENTED), stage is 'call' for finished calls or the name of
+# an intermediate step, values holds the data of that step
+Event = namedtuple('Event', ['operation', 'stage', 'values'])
+
+# HurwitzQuaternion methods that get wrapped while tracing, and the operation they count as
+INSTRUMENTED = {
+    '__init__': 'allocation',
+    '_make': 'allocation',
+    '_from_doubled': 'allocation',
+    '__add__': 'addition',
+    '__sub__': 'subtraction',
+    '__mul__': 'multiplication',
+    '__pow__': 'power',
+    'euclidean_division': 'division',
+    'left_euclidean_division': 'division',
+    'euclidean_division_pro_max': 'division_pro_max',
+    'general_inverse': 'general_inverse',
+    'decompose': 'decompose',
+    'binomial_multiplication': 'binomial_multiplication',
+}
+
+# checked by HurwitzQuaternion before building intermediate-value events
+active = False
+_tracers = []
+
+
+def emit(operation: str, stage: str, **values) -> None:
+    event = Event(operation, stage, values)
+    for tracer in tuple(_tracers):
+        tracer(event)
+
+
+def _instrumented(name: str, operation: str, function):
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        start = perf_counter()
+        result = function(*args, **kwargs)
+        emit(operation, 'call', method=name, seconds=perf_counter() - start)
+        return result
+    return wrapper
+
+
+def _wrap(name: str, operation: str):
+    # the instrument layer wrapper of one method
+    def wrap(method):
+        if isinstance(method, classmethod):
+            return classmethod(_instrumented(name, operation, method.__func__))
+        return _instrumented(name, operation, method)
+    return wrap
+
+
+def add_tracer(tracer) -> None:
+    global active
+    _tracers.append(tracer)
+    if not active:
+        from .hurwitz import set_layer
+        # active first, the methods are traced on the pure-Python core, which emits the intermediate events
+        active = True
+        set_layer('instrument', {name: _wrap(name, operation) for name, operation in INSTRUMENTED.items()})
+
+
+def remove_tracer(tracer) -> None:
+    global active
+    _tracers.remove(tracer)
+    if not _tracers:
+        from .hurwitz import set_layer
+        active = False
+        set_layer('instrument', None)
+
+
+class Profile:
+    """
+    A tracer that counts calls and adds up time per operation, optionally keeping every event.
+
+    Times are inclusive, a division also counts the multiplications and allocations it does.
+    """
+
+    def __init__(self, keep_events: bool = False) -> None:
+        self.counts = Counter()
+        self.seconds = defaultdict(float)
+        self.events = [] if keep_events else None
+
+    def __call__(self, event: Event) -> None:
+        if event.stage == 'call':
+            self.counts[event.operation] += 1
+            self.seconds[event.operation] += event.values['seconds']
+        if self.events is not None:
+            self.events.append(event)
+
+    def __repr__(self) -> str:
+        return f"Profile({dict(self.counts)})"
+
+
+@contextmanager
+def tracing(tracer):
+    # registers tracer for the duration of the block
+    add_tracer(tracer)
+    try:
+        yield tracer
+    finally:
+        remove_tracer(tracer)
+
+
+def profile(keep_events: bool = False):
+    # context manager collecting a Profile for the block
+    return tracing(Profile(keep_events))
@@ -0,0 +1,230 @@
+from .hurwitz import HurwitzQuaternion
+
+_hamilton = HurwitzQuaternion.general_quaternion_multiplication
+ZERO = (0, 0, 0, 0)
+
+
+def _doubled(entry) -> tuple:
+    if isinstance(entry, HurwitzQuaternion):
+        return entry.doubled()
+    if isinstance(entry, int):
+        return (2 * entry, 0, 0, 0)
+    raise TypeError("Matrix entries must be HurwitzQuaternions or ints")
+
+
+def _multiply(x: tuple, y: tuple) -> tuple:
+    p = _hamilton(x, y)
+    return (p[0] >> 1, p[1] >> 1, p[2] >> 1, p[3] >> 1)
+
+
+def _divide(x: tuple, y: tuple) -> (tuple, tuple):
+    # right Euclidean division on doubled coordinates, x = q*y + r
+    t = _hamilton(x, (y[0], -y[1], -y[2], -y[3]))
+    q = HurwitzQuaternion.nearest_hurwitz_doubled(t, y[0] * y[0] + y[1] * y[1] + y[2] * y[2] + y[3] * y[3])
+    qy = _hamilton(q, y)
+    return q, (x[0] - (qy[0] >> 1), x[1] - (qy[1] >> 1), x[2] - (qy[2] >> 1), x[3] - (qy[3] >> 1))
+
+
+def _subtract_multiple(row: list, q: tuple, pivot_row: list) -> None:
+    # row -= q * pivot_row, in place
+    for index, (x, y) in enumerate(zip(row, pivot_row)):
+        if y != ZERO:
+            p = _hamilton(q, y)
+            row[index] = (x[0] - (p[0] >> 1), x[1] - (p[1] >> 1), x[2] - (p[2] >> 1), x[3] - (p[3] >> 1))
+
+
+class HurwitzMatrix:
+    """
+    A matrix over the Hurwitz order, stored as a row-major list of doubled coordinate tuples.
+
+    Products accumulate raw Hamilton products of the doubled coordinates and halve once per entry,
+    so no HurwitzQuaternion objects are built until entries are read back.
+    """
+    __slots__ = ('rows', 'cols', 'data')
+
+    def __init__(self, entries) -> None:
+        # entries is a list of rows of HurwitzQuaternions (ints are read as whole quaternions)
+        entries = [list(row) for row in entries]
+        if not entries or not entries[0]:
+            raise ValueError("A matrix needs at least one row and one column")
+        if any(len(row) != len(entries[0]) for row in entries):
+            raise ValueError("All rows must have the same length")
+        self.rows = len(entries)
+        self.cols = len(entries[0])
+        self.data = [_doubled(entry) for row in entries for entry in row]
+
+    @classmethod
+    def _wrap(cls, rows: int, cols: int, data: list) -> 'HurwitzMatrix':
+        matrix = object.__new__(cls)
+        matrix.rows = rows
+        matrix.cols = cols
+        matrix.data = data
+        return matrix
+
+    @classmethod
+    def identity(cls, n: int) -> 'HurwitzMatrix':
+        return cls._wrap(n, n, [(2, 0, 0, 0) if i == j else ZERO for i in range(n) for j in range(n)])
+
+    @classmethod
+    def zeros(cls, rows: int, cols: int) -> 'HurwitzMatrix':
+        return cls._wrap(rows, cols, [ZERO] * (rows * cols))
+
+    @property
+    def shape(self) -> tuple:
+        return (self.rows, self.cols)
+
+    def __getitem__(self, key: tuple) -> HurwitzQuaternion:
+        i, j = key
+        return HurwitzQuaternion._from_doubled(*self.data[i * self.cols + j])
+
+    def __setitem__(self, key: tuple, value) -> None:
+        i, j = key
+        self.data[i * self.cols + j] = _doubled(value)
+
+    def tolist(self) -> list:
+        return [[self[i, j] for j in range(self.cols)] for i in range(self.rows)]
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, HurwitzMatrix):
+            return False
+        return self.shape == other.shape and self.data == other.data
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        rows = ",\n ".join("[" + ", ".join(repr(entry) for entry in row) + "]" for row in self.tolist())
+        return f"HurwitzMatrix([{rows}])"
+
+    def _check_shape(self, other: 'HurwitzMatrix') -> None:
+        if self.shape != other.shape:
+            raise ValueError(f"Shapes {self.shape} and {other.shape} do not match")
+
+    def __add__(self, other: 'HurwitzMatrix') -> 'HurwitzMatrix':
+        if not isinstance(other, HurwitzMatrix):
+            return NotImplemented
+        self._check_shape(other)
+        return HurwitzMatrix._wrap(self.rows, self.cols, [
+            (x[0] + y[0], x[1] + y[1], x[2] + y[2], x[3] + y[3]) for x, y in zip(self.data, other.data)])
+
+    def __sub__(self, other: 'HurwitzMatrix') -> 'HurwitzMatrix':
+        if not isinstance(other, HurwitzMatrix):
+            return NotImplemented
+        self._check_shape(other)
+        return HurwitzMatrix._wrap(self.rows, self.cols, [
+            (x[0] - y[0], x[1] - y[1], x[2] - y[2], x[3] - y[3]) for x, y in zip(self.data, other.data)])
+
+    def __neg__(self) -> 'HurwitzMatrix':
+        return HurwitzMatrix._wrap(self.rows, self.cols, [(-x[0], -x[1], -x[2], -x[3]) for x in self.data])
+
+    def __mul__(self, other) -> 'HurwitzMatrix':
+        if isinstance(other, (HurwitzQuaternion, int)):
+            # scalar on the right of every entry
+            y = _doubled(other)
+            return HurwitzMatrix._wrap(self.rows, self.cols, [_multiply(x, y) for x in self.data])
+        if not isinstance(other, HurwitzMatrix):
+            return NotImplemented
+        if self.cols != other.rows:
+            raise ValueError(f"Cannot multiply {self.shape} by {other.shape}")
+        n, m, p = self.rows, self.cols, other.cols
+        rows = [self.data[i * m:(i + 1) * m] for i in range(n)]
+        columns = [other.data[j::p] for j in range(p)]
+        data = []
+        for row in rows:
+            for column in columns:
+                s0 = s1 = s2 = s3 = 0
+                for (a0, a1, a2, a3), (b0, b1, b2, b3) in zip(row, column):
+                    s0 += a0 * b0 - a1 * b1 - a2 * b2 - a3 * b3
+                    s1 += a0 * b1 + a1 * b0 + a2 * b3 - a3 * b2
+                    s2 += a0 * b2 - a1 * b3 + a2 * b0 + a3 * b1
+                    s3 += a0 * b3 + a1 * b2 - a2 * b1 + a3 * b0
+                # every raw product is twice the doubled product, so the sum halves exactly
+                data.append((s0 >> 1, s1 >> 1, s2 >> 1, s3 >> 1))
+        return HurwitzMatrix._wrap(n, p, data)
+
+    def __rmul__(self, other) -> 'HurwitzMatrix':
+        if isinstance(other, (HurwitzQuaternion, int)):
+            # scalar on the left of every entry
+            x = _doubled(other)
+            return HurwitzMatrix._wrap(self.rows, self.cols, [_multiply(x, y) for y in self.data])
+        return NotImplemented
+
+    def __pow__(self, power: int) -> 'HurwitzMatrix':
+        if not isinstance(power, int) or power < 0:
+            raise ValueError("Matrices can only be raised to non-negative int powers")
+        if self.rows != self.cols:
+            raise ValueError("Only square matrices have powers")
+        result = HurwitzMatrix.identity(self.rows)
+        base = self
+        while power:
+            if power & 1:
+                result = result * base
+            power >>= 1
+            if power:
+                base = base * base
+        return result
+
+    def transpose(self) -> 'HurwitzMatrix':
+        return HurwitzMatrix._wrap(self.cols, self.rows, [self.data[i * self.cols + j] for j in range(self.cols) for i in range(self.rows)])
+
+    def conjugate_transpose(self) -> 'HurwitzMatrix':
+        return HurwitzMatrix._wrap(self.cols, self.rows, [
+            (x[0], -x[1], -x[2], -x[3]) for x in (self.data[i * self.cols + j] for j in range(self.cols) for i in range(self.rows))])
+
+    def echelon_form(self, transform: bool = False):
+        # Hermite-style row echelon form E = U*A under left row operations, U invertible over the Hurwitz order.
+        # each pivot column is cleared with the exact right Euclidean division, always pivoting on the entry of
+        # smallest norm, and the entries above a pivot are reduced modulo it. with transform, returns (E, U)
+        rows = [self.data[i * self.cols:(i + 1) * self.cols] for i in range(self.rows)]
+        ops = [HurwitzMatrix.identity(self.rows).data[i * self.rows:(i + 1) * self.rows] for i in range(self.rows)] if transform else None
+
+        def norm(x):
+            return x[0] * x[0] + x[1] * x[1] + x[2] * x[2] + x[3] * x[3]
+
+        def swap(i, j):
+            rows[i], rows[j] = rows[j], rows[i]
+            if ops is not None:
+                ops[i], ops[j] = ops[j], ops[i]
+
+        def subtract(target, q, source):
+            _subtract_multiple(rows[target], q, rows[source])
+            if ops is not None:
+                _subtract_multiple(ops[target], q, ops[source])
+
+        pivot_row = 0
+        for col in range(self.cols):
+            if pivot_row == self.rows:
+                break
+            found = False
+            while True:
+                candidates = [r for r in range(pivot_row, self.rows) if rows[r][col] != ZERO]
+                if not candidates:
+                    break
+                found = True
+                swap(pivot_row, min(candidates, key=lambda r: norm(rows[r][col])))
+                pivot = rows[pivot_row][col]
+                cleared = True
+                for r in range(pivot_row + 1, self.rows):
+                    if rows[r][col] != ZERO:
+                        q, remainder = _divide(rows[r][col], pivot)
+                        subtract(r, q, pivot_row)
+                        cleared = cleared and remainder == ZERO
+                if cleared:
+                    break
+            if not found:
+                continue
+            pivot = rows[pivot_row][col]
+            for r in range(pivot_row):
+                q = _divide(rows[r][col], pivot)[0]
+                if q != ZERO:
+                    subtract(r, q, pivot_row)
+            pivot_row += 1
+
+        echelon = HurwitzMatrix._wrap(self.rows, self.cols, [x for row in rows for x in row])
+        if transform:
+            return echelon, HurwitzMatrix._wrap(self.rows, self.rows, [x for row in ops for x in row])
+        return echelon
+
+    def rank(self) -> int:
+        # number of non-zero rows of the echelon form
+        echelon = self.echelon_form()
+        return sum(1 for i in range(self.rows) if any(x != ZERO for x in echelon.data[i * self.cols:(i + 1) * self.cols]))
@@ -0,0 +1,233 @@
+"""
+The Hurwitz order modulo an odd integer n.
+
+With n odd, 2 is invertible mod n, so every half quaternion (a + bi + cj + dk)/2 is congruent to the whole
+quaternion a/2 + (b/2)i + ... with 1/2 read mod n, and the quotient ring is just four coordinates mod n.
+Elements keep their coordinates in [0, n), so the cost of an operation does not grow with the depth of the
+computation.
+
+    ring = HurwitzModRing(101)
+    x = ring(q)
+    y = x ** 10 ** 6 * ring(p).inverse()
+    y.lift()
+"""
+from math import gcd
+
+from .hurwitz import HurwitzQuaternion, UNITS, UNIT_CAYLEY_TABLE, UNIT_INVERSES
+
+
+class HurwitzModRing:
+    """
+    The quotient ring of the Hurwitz order by n for an odd n > 1.
+
+    Calling the ring reduces a HurwitzQuaternion, an int or a tuple of four ints into it. The images of the
+    24 Hurwitz units are precomputed in UNITS order, so HurwitzQuaternion's unit tables apply unchanged.
+    """
+    __slots__ = ('n', 'inv2', 'units', 'unit_index')
+
+    unit_cayley_table = UNIT_CAYLEY_TABLE
+    unit_inverses = UNIT_INVERSES
+
+    def __init__(self, n: int) -> None:
+        if not isinstance(n, int):
+            raise TypeError("Modulus must be an int")
+        if n < 3 or n % 2 == 0:
+            raise ValueError("Modulus must be an odd int greater than 1")
+        self.n = n
+        self.inv2 = (n + 1) // 2
+        # distinct units stay distinct mod n, the norm of their difference is at most 4 < n^2
+        self.units = tuple(self._reduce_doubled(unit) for unit in UNITS)
+        self.unit_index = {unit.coordinates(): index for index, unit in enumerate(self.units)}
+
+    def __repr__(self) -> str:
+        return f"HurwitzModRing({self.n})"
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, HurwitzModRing) and self.n == other.n
+
+    def __hash__(self) -> int:
+        return hash(('HurwitzModRing', self.n))
+
+    def __reduce__(self):
+        return (HurwitzModRing, (self.n,))
+
+    def _element(self, a: int, b: int, c: int, d: int) -> 'HurwitzModElement':
+        # coordinates must already be in [0, n)
+        element = object.__new__(HurwitzModElement)
+        element.ring = self
+        element.a = a
+        element.b = b
+        element.c = c
+        element.d = d
+        return element
+
+    def _reduce_doubled(self, x: tuple) -> 'HurwitzModElement':
+        n, inv2 = self.n, self.inv2
+        return self._element(x[0] * inv2 % n, x[1] * inv2 % n, x[2] * inv2 % n, x[3] * inv2 % n)
+
+    def __call__(self, value) -> 'HurwitzModElement':
+        n = self.n
+        if isinstance(value, HurwitzModElement):
+            if value.ring.n % n:
+                raise ValueError(f"Cannot reduce an element mod {value.ring.n} into {self}")
+            return self._element(value.a % n, value.b % n, value.c % n, value.d % n)
+        if isinstance(value, HurwitzQuaternion):
+            if value.half:
+                return self._reduce_doubled((value.a, value.b, value.c, value.d))
+            return self._element(value.a % n, value.b % n, value.c % n, value.d % n)
+        if isinstance(value, int):
+            return self._element(value % n, 0, 0, 0)
+        if isinstance(value, tuple) and len(value) == 4 and all(isinstance(val, int) for val in value):
+            return self._element(value[0] % n, value[1] % n, value[2] % n, value[3] % n)
+        raise TypeError("Can only reduce HurwitzQuaternions, ints or tuples of four ints")
+
+    def zero(self) -> 'HurwitzModElement':
+        return self._element(0, 0, 0, 0)
+
+    def one(self) -> 'HurwitzModElement':
+        return self._element(1, 0, 0, 0)
+
+    def unit_multiplication(self, i: int, j: int) -> 'HurwitzModElement':
+        # image of UNITS[i] * UNITS[j], through the Cayley table
+        return self.units[UNIT_CAYLEY_TABLE[i][j]]
+
+
+class HurwitzModElement:
+    """
+    An element of a HurwitzModRing, coordinates a + bi + cj + dk with each value in [0, n).
+
+    Arithmetic with HurwitzQuaternions or ints reduces them into the ring first.
+    """
+    __slots__ = ('ring', 'a', 'b', 'c', 'd')
+
+    def __init__(self, ring: HurwitzModRing, value) -> None:
+        element = ring(value)
+        self.ring = ring
+        self.a, self.b, self.c, self.d = element.a, element.b, element.c, element.d
+
+    def __reduce__(self):
+        return (HurwitzModElement, (self.ring, self.coordinates()))
+
+    def coordinates(self) -> tuple:
+        return (self.a, self.b, self.c, self.d)
+
+    def lift(self) -> HurwitzQuaternion:
+        # the whole quaternion with coordinates in [0, n) that reduces to this element
+        return HurwitzQuaternion._make(self.a, self.b, self.c, self.d, False)
+
+    def __repr__(self) -> str:
+        return f"{self.a} + {self.b}i + {self.c}j + {self.d}ij (mod {self.ring.n})"
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, HurwitzModElement):
+            return False
+        return self.ring.n == other.ring.n and self.a == other.a and self.b == other.b and self.c == other.c and self.d == other.d
+
+    def __hash__(self) -> int:
+        return hash((self.ring.n, self.a, self.b, self.c, self.d))
+
+    def __bool__(self) -> bool:
+        return bool(self.a or self.b or self.c or self.d)
+
+    def _coerce(self, other) -> 'HurwitzModElement':
+        if isinstance(other, HurwitzModElement):
+            if other.ring.n != self.ring.n:
+                raise ValueError(f"Elements mod {self.ring.n} and mod {other.ring.n} cannot be combined")
+            return other
+        if isinstance(other, (HurwitzQuaternion, int)):
+            return self.ring(other)
+        return None
+
+    def __add__(self, other) -> 'HurwitzModElement':
+        other = self._coerce(other)
+        if other is None:
+            return NotImplemented
+        n = self.ring.n
+        return self.ring._element((self.a + other.a) % n, (self.b + other.b) % n, (self.c + other.c) % n, (self.d + other.d) % n)
+
+    __radd__ = __add__
+
+    def __sub__(self, other) -> 'HurwitzModElement':
+        other = self._coerce(other)
+        if other is None:
+            return NotImplemented
+        n = self.ring.n
+        return self.ring._element((self.a - other.a) % n, (self.b - other.b) % n, (self.c - other.c) % n, (self.d - other.d) % n)
+
+    def __rsub__(self, other) -> 'HurwitzModElement':
+        other = self._coerce(other)
+        if other is None:
+            return NotImplemented
+        return other - self
+
+    def __neg__(self) -> 'HurwitzModElement':
+        n = self.ring.n
+        return self.ring._element(-self.a % n, -self.b % n, -self.c % n, -self.d % n)
+
+    def __mul__(self, other) -> 'HurwitzModElement':
+        other = self._coerce(other)
+        if other is None:
+            return NotImplemented
+        n = self.ring.n
+        a0, a1, a2, a3 = self.a, self.b, self.c, self.d
+        b0, b1, b2, b3 = other.a, other.b, other.c, other.d
+        return self.ring._element(
+            (a0 * b0 - a1 * b1 - a2 * b2 - a3 * b3) % n,
+            (a0 * b1 + a1 * b0 + a2 * b3 - a3 * b2) % n,
+            (a0 * b2 - a1 * b3 + a2 * b0 + a3 * b1) % n,
+            (a0 * b3 + a1 * b2 - a2 * b1 + a3 * b0) % n
+        )
+
+    def __rmul__(self, other) -> 'HurwitzModElement':
+        other = self._coerce(other)
+        if other is None:
+            return NotImplemented
+        return other * self
+
+    def __pow__(self, power: int) -> 'HurwitzModElement':
+        if not isinstance(power, int):
+            raise TypeError("Can only raise to an integer power")
+        base = self
+        if power < 0:
+            base = self.inverse()
+            power = -power
+        result = self.ring.one()
+        while power:
+            if power & 1:
+                result = result * base
+            power >>= 1
+            if power:
+                base = base * base
+        return result
+
+    def conjugate(self) -> 'HurwitzModElement':
+        n = self.ring.n
+        return self.ring._element(self.a, -self.b % n, -self.c % n, -self.d % n)
+
+    def reduced_norm(self) -> int:
+        # N(q) mod n, which is the reduced norm of any lift
+        return (self.a * self.a + self.b * self.b + self.c * self.c + self.d * self.d) % self.ring.n
+
+    def invertible(self) -> bool:
+        # q * conj(q) = N(q), so q is invertible exactly when N(q) is coprime to n
+        return gcd(self.reduced_norm(), self.ring.n) == 1
+
+    def inverse(self) -> 'HurwitzModElement':
+        norm = self.reduced_norm()
+        if gcd(norm, self.ring.n) != 1:
+            raise ValueError(f"The element has norm {norm}, which is not coprime to {self.ring.n}, so it has no inverse.")
+        n = self.ring.n
+        scale = pow(norm, -1, n)
+        return self.ring._element(self.a * scale % n, -self.b * scale % n, -self.c * scale % n, -self.d * scale % n)
+
+    def unitary(self) -> bool:
+        # whether this is the image of one of the 24 Hurwitz units
+        return self.coordinates() in self.ring.unit_index
+
+    def associates(self) -> list:
+        # u * q for the images of the 24 units, in UNITS order
+        return [unit * self for unit in self.ring.units]
+
+    def canonical_associate(self) -> 'HurwitzModElement':
+        # the associate with the largest coordinates
+        return max(self.associates(), key=HurwitzModElement.coordinates)
@@ -0,0 +1,110 @@
+"""
+Process-pool batch versions of the expensive HurwitzQuaternion operations.
+
+Inputs are cut into chunks and only doubled coordinate tuples cross the process boundary. Results stream
+back through a generator in input order, with a bounded number of chunks in flight, so the input can be
+a lazy iterator of any length.
+
+    for q, r in batch_divide(pairs, workers=8, chunk_size=4096):
+        ...
+"""
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+
+from .hurwitz import HurwitzQuaternion
+
+DEFAULT_CHUNK_SIZE = 4096
+
+_from_doubled = HurwitzQuaternion._from_doubled
+
+
+def _chunks(iterable, size: int):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _pair_chunks(pairs, size: int):
+    for chunk in _chunks(pairs, size):
+        yield [(a.doubled(), b.doubled()) for a, b in chunk]
+
+
+def _divide_chunk(chunk: list, left: bool, pro_max: bool) -> list:
+    results = []
+    for a, b in chunk:
+        a, b = _from_doubled(*a), _from_doubled(*b)
+        if pro_max:
+            q, r = a.euclidean_division_pro_max(b)
+        elif left:
+            q, r = a.left_euclidean_division(b)
+        else:
+            q, r = a.euclidean_division(b)
+        results.append((q.doubled(), r.doubled()))
+    return results
+
+
+def _gcd_chunk(chunk: list, left: bool, extended: bool) -> list:
+    results = []
+    for a, b in chunk:
+        a, b = _from_doubled(*a), _from_doubled(*b)
+        d, u, v = a.left_extended_gcd(b) if left else a.right_extended_gcd(b)
+        results.append((d.doubled(), u.doubled(), v.doubled()) if extended else d.doubled())
+    return results
+
+
+def _factorize_chunk(chunk: list) -> list:
+    return [[prime.doubled() for prime in _from_doubled(*q).factorize()] for q in chunk]
+
+
+def _stream(function, chunks, workers: int, executor):
+    # runs function over the chunks in a process pool, yielding the individual results in input order
+    own = executor is None
+    if own:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    # enough chunks in flight to keep every worker busy without reading the whole input ahead
+    limit = 2 * (workers or os.cpu_count() or 1)
+    pending = deque()
+    try:
+        for chunk in chunks:
+            pending.append(executor.submit(function, chunk))
+            if len(pending) >= limit:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+        if own:
+            executor.shutdown()
+
+
+def batch_divide(pairs, workers: int = None, chunk_size: int = DEFAULT_CHUNK_SIZE, left: bool = False,
+                 pro_max: bool = False, executor=None):
+    # yields euclidean_division(a, b) for every (a, b), or the left or pro max division
+    chunks = _pair_chunks(pairs, chunk_size)
+    for q, r in _stream(partial(_divide_chunk, left=left, pro_max=pro_max), chunks, workers, executor):
+        yield (_from_doubled(*q), _from_doubled(*r))
+
+
+def batch_gcd(pairs, workers: int = None, chunk_size: int = DEFAULT_CHUNK_SIZE, left: bool = False,
+              extended: bool = False, executor=None):
+    # yields the right gcd of every (a, b) (left gcd with left), or (d, u, v) with extended
+    chunks = _pair_chunks(pairs, chunk_size)
+    for result in _stream(partial(_gcd_chunk, left=left, extended=extended), chunks, workers, executor):
+        if extended:
+            yield tuple(_from_doubled(*x) for x in result)
+        else:
+            yield _from_doubled(*result)
+
+
+def batch_factorize(quaternions, workers: int = None, chunk_size: int = 256, executor=None):
+    # yields the factorize() list of every quaternion
+    chunks = ([q.doubled() for q in chunk] for chunk in _chunks(quaternions, chunk_size))
+    for primes in _stream(_factorize_chunk, chunks, workers, executor):
+        yield [_from_doubled(*prime) for prime in primes]
@@ -0,0 +1,183 @@
+from .hurwitz import HurwitzQuaternion
+from .matrix import ZERO, _doubled, _multiply
+
+# below this many coefficients in the shorter factor, schoolbook multiplication is faster than Karatsuba
+KARATSUBA_THRESHOLD = 32
+
+
+def _add(x: list, y: list) -> list:
+    if len(x) < len(y):
+        x, y = y, x
+    out = list(x)
+    for i, b in enumerate(y):
+        a = out[i]
+        out[i] = (a[0] + b[0], a[1] + b[1], a[2] + b[2], a[3] + b[3])
+    return out
+
+
+def _subtract_into(out: list, y: list, offset: int = 0) -> None:
+    for i, b in enumerate(y, offset):
+        a = out[i]
+        out[i] = (a[0] - b[0], a[1] - b[1], a[2] - b[2], a[3] - b[3])
+
+
+def _add_into(out: list, y: list, offset: int = 0) -> None:
+    for i, b in enumerate(y, offset):
+        a = out[i]
+        out[i] = (a[0] + b[0], a[1] + b[1], a[2] + b[2], a[3] + b[3])
+
+
+def _schoolbook(x: list, y: list) -> list:
+    # raw Hamilton products of the coordinates, not halved
+    out = [[0, 0, 0, 0] for _ in range(len(x) + len(y) - 1)]
+    for i, (a0, a1, a2, a3) in enumerate(x):
+        if not (a0 or a1 or a2 or a3):
+            continue
+        for o, (b0, b1, b2, b3) in zip(out[i:], y):
+            o[0] += a0 * b0 - a1 * b1 - a2 * b2 - a3 * b3
+            o[1] += a0 * b1 + a1 * b0 + a2 * b3 - a3 * b2
+            o[2] += a0 * b2 - a1 * b3 + a2 * b0 + a3 * b1
+            o[3] += a0 * b3 + a1 * b2 - a2 * b1 + a3 * b0
+    return [tuple(o) for o in out]
+
+
+def _karatsuba(x: list, y: list) -> list:
+    # raw product of the coefficient lists. x commutes with the coefficients, so splitting at x^m keeps every
+    # coefficient product in its left-to-right order and the usual three-product identity holds
+    if min(len(x), len(y)) <= KARATSUBA_THRESHOLD:
+        return _schoolbook(x, y)
+    m = max(len(x), len(y)) // 2
+    x0, x1 = x[:m], x[m:]
+    y0, y1 = y[:m], y[m:]
+    if not x1 or not y1:
+        # lopsided factors, split only the long one
+        if not x1:
+            return _add_shifted(_karatsuba(x, y0), _karatsuba(x, y1), m)
+        return _add_shifted(_karatsuba(x0, y), _karatsuba(x1, y), m)
+    low = _karatsuba(x0, y0)
+    high = _karatsuba(x1, y1)
+    middle = _karatsuba(_add(x0, x1), _add(y0, y1))
+    _subtract_into(middle, low)
+    _subtract_into(middle, high)
+    out = [ZERO] * (len(x) + len(y) - 1)
+    _add_into(out, low)
+    _add_into(out, middle, m)
+    _add_into(out, high, 2 * m)
+    return out
+
+
+def _add_shifted(low: list, high: list, m: int) -> list:
+    out = list(low) + [ZERO] * max(0, m + len(high) - len(low))
+    _add_into(out, high, m)
+    return out
+
+
+def _trim(coefficients: list) -> list:
+    while len(coefficients) > 1 and coefficients[-1] == ZERO:
+        coefficients.pop()
+    return coefficients
+
+
+class HurwitzPolynomial:
+    """
+    A polynomial with Hurwitz quaternion coefficients in a central variable x, stored as the list of
+    doubled coordinate tuples of its coefficients, constant term first.
+
+    Products accumulate raw Hamilton products and halve once per coefficient, switching to Karatsuba
+    when both factors have more than KARATSUBA_THRESHOLD coefficients.
+    """
+    __slots__ = ('coefficients',)
+
+    def __init__(self, coefficients) -> None:
+        # coefficients are HurwitzQuaternions or ints, constant term first
+        self.coefficients = _trim([_doubled(c) for c in coefficients] or [ZERO])
+
+    @classmethod
+    def _wrap(cls, coefficients: list) -> 'HurwitzPolynomial':
+        polynomial = object.__new__(cls)
+        polynomial.coefficients = _trim(coefficients or [ZERO])
+        return polynomial
+
+    @property
+    def degree(self) -> int:
+        # -1 for the zero polynomial
+        if self.coefficients == [ZERO]:
+            return -1
+        return len(self.coefficients) - 1
+
+    def __len__(self) -> int:
+        return len(self.coefficients)
+
+    def __getitem__(self, i: int) -> HurwitzQuaternion:
+        # the coefficient of x^i
+        if i >= len(self.coefficients):
+            return HurwitzQuaternion._make(0, 0, 0, 0, False)
+        return HurwitzQuaternion._from_doubled(*self.coefficients[i])
+
+    def tolist(self) -> list:
+        return [HurwitzQuaternion._from_doubled(*c) for c in self.coefficients]
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, HurwitzPolynomial):
+            return False
+        return self.coefficients == other.coefficients
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"HurwitzPolynomial({self.tolist()!r})"
+
+    def __add__(self, other: 'HurwitzPolynomial') -> 'HurwitzPolynomial':
+        if not isinstance(other, HurwitzPolynomial):
+            return NotImplemented
+        return HurwitzPolynomial._wrap(_add(self.coefficients, other.coefficients))
+
+    def __sub__(self, other: 'HurwitzPolynomial') -> 'HurwitzPolynomial':
+        if not isinstance(other, HurwitzPolynomial):
+            return NotImplemented
+        out = self.coefficients + [ZERO] * max(0, len(other.coefficients) - len(self.coefficients))
+        _subtract_into(out, other.coefficients)
+        return HurwitzPolynomial._wrap(out)
+
+    def __neg__(self) -> 'HurwitzPolynomial':
+        return HurwitzPolynomial._wrap([(-c[0], -c[1], -c[2], -c[3]) for c in self.coefficients])
+
+    def __mul__(self, other) -> 'HurwitzPolynomial':
+        if isinstance(other, (HurwitzQuaternion, int)):
+            # scalar on the right of every coefficient
+            y = _doubled(other)
+            return HurwitzPolynomial._wrap([_multiply(c, y) for c in self.coefficients])
+        if not isinstance(other, HurwitzPolynomial):
+            return NotImplemented
+        raw = _karatsuba(self.coefficients, other.coefficients)
+        # every raw product is twice the doubled product, so each coefficient halves exactly
+        return HurwitzPolynomial._wrap([(c[0] >> 1, c[1] >> 1, c[2] >> 1, c[3] >> 1) for c in raw])
+
+    def __rmul__(self, other) -> 'HurwitzPolynomial':
+        if isinstance(other, (HurwitzQuaternion, int)):
+            # scalar on the left of every coefficient
+            x = _doubled(other)
+            return HurwitzPolynomial._wrap([_multiply(x, c) for c in self.coefficients])
+        return NotImplemented
+
+    def __pow__(self, power: int) -> 'HurwitzPolynomial':
+        if not isinstance(power, int) or power < 0:
+            raise ValueError("Polynomials can only be raised to non-negative int powers")
+        result = HurwitzPolynomial._wrap([(2, 0, 0, 0)])
+        base = self
+        while power:
+            if power & 1:
+                result = result * base
+            power >>= 1
+            if power:
+                base = base * base
+        return result
+
+    def evaluate(self, q: HurwitzQuaternion) -> HurwitzQuaternion:
+        # right evaluation, the sum of c_i * q^i with the coefficients on the left (Horner)
+        y = q.doubled()
+        total = ZERO
+        for c in reversed(self.coefficients):
+            p = _multiply(total, y)
+            total = (p[0] + c[0], p[1] + c[1], p[2] + c[2], p[3] + c[3])
+        return HurwitzQuaternion._from_doubled(*total)
@@ -0,0 +1,125 @@
+from functools import lru_cache
+from math import gcd, isqrt
+import random
+
+
+def _sieve(limit: int) -> tuple:
+    is_prime = bytearray([1]) * (limit + 1)
+    is_prime[0] = is_prime[1] = 0
+    for i in range(2, isqrt(limit) + 1):
+        if is_prime[i]:
+            is_prime[i * i::i] = bytearray(len(is_prime[i * i::i]))
+    return tuple(i for i in range(limit + 1) if is_prime[i])
+
+
+# primes used for trial division before falling back to Pollard rho
+SMALL_PRIMES = _sieve(2 ** 12)
+# Miller-Rabin with these bases is deterministic below 3.3 * 10^24, and a strong probable prime test above
+MILLER_RABIN_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+
+def is_prime(n: int) -> bool:
+    if n < 2:
+        return False
+    for p in MILLER_RABIN_BASES:
+        if n % p == 0:
+            return n == p
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for base in MILLER_RABIN_BASES:
+        x = pow(base, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def pollard_rho(n: int) -> int:
+    # a non-trivial factor of the odd composite n, Brent's variant with batched gcds
+    if n % 2 == 0:
+        return 2
+    rng = random.Random(n)
+    while True:
+        y, c, m = rng.randrange(1, n), rng.randrange(1, n), 128
+        g = r = q = 1
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(m, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = gcd(q, n)
+                k += m
+            r *= 2
+        if g == n:
+            # the batch overshot, redo it one step at a time
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = gcd(abs(x - ys), n)
+        if g != n:
+            return g
+
+
+def _factor(n: int, primes: list) -> None:
+    if n == 1:
+        return
+    if is_prime(n):
+        primes.append(n)
+        return
+    d = pollard_rho(n)
+    _factor(d, primes)
+    _factor(n // d, primes)
+
+
+@lru_cache(maxsize=4096)
+def factor_integer(n: int) -> tuple:
+    # prime factors of n > 0 with multiplicity, in ascending order
+    if not isinstance(n, int) or n < 1:
+        raise ValueError("Can only factor positive ints")
+    primes = []
+    for p in SMALL_PRIMES:
+        if p * p > n:
+            break
+        while n % p == 0:
+            primes.append(p)
+            n //= p
+    if n > 1:
+        _factor(n, primes)
+    return tuple(sorted(primes))
+
+
+def sqrt_mod(a: int, p: int) -> int:
+    # a square root of a modulo the odd prime p (Tonelli-Shanks), assuming one exists
+    a %= p
+    if a == 0:
+        return 0
+    if p % 4 == 3:
+        return pow(a, (p + 1) // 4, p)
+    q, s = p - 1, 0
+    while q % 2 == 0:
+        q //= 2
+        s += 1
+    z = 2
+    while pow(z, (p - 1) // 2, p) != p - 1:
+        z += 1
+    m, c, t, r = s, pow(z, q, p), pow(a, q, p), pow(a, (q + 1) // 2, p)
+    while t != 1:
+        i, t2 = 0, t
+        while t2 != 1:
+            t2 = t2 * t2 % p
+            i += 1
+        b = pow(c, 1 << (m - i - 1), p)
+        m, c, t, r = i, b * b % p, t * b * b % p, r * b % p
+    return r
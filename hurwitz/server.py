@@ -0,0 +1,479 @@
+"""
+An asyncio service for Hurwitz quaternion division, gcd, factorization and powers over localhost TCP.
+
+Requests and responses are JSON lines, quaternions travel as lists of their four doubled coordinates:
+
+    {"id": 1, "op": "divide", "a": [2, 4, 6, 8], "b": [1, 1, 1, 1], "left": false}
+    {"id": 1, "result": [[...], [...]]}
+
+Concurrent requests for the same operation are collected for batch_window seconds (or until max_batch of
+them are waiting) and run as one chunk in a process pool with the chunk functions of hurwitz.parallel.
+Responses go out as soon as their batch is done, so they can arrive out of order and are matched by id.
+At most max_pending requests are in flight, beyond that the server stops reading from its connections.
+Requests whose cost the request count does not bound are refused up front: quaternions with doubled
+coordinates of more than max_bits bits, factorizations of norms above max_norm_bits bits (Pollard rho gets
+slow past 64), powers without a modulus above max_exponent or whose result would be larger than max_bits
+(it grows linearly with the exponent), and divisions by zero or factorizations of zero (so they cannot fail
+a whole batch). A batch still running after batch_timeout seconds is answered with TimeoutError, its worker
+finishes in the background and keeps its slot until then. A result that cannot be encoded is answered with
+an error for its id.
+
+    async with HurwitzServer(port=8765, workers=4) as server:
+        await server.serve_forever()
+
+    async with await HurwitzClient.connect(port=8765) as client:
+        q, r = await client.divide(a, b)
+
+`python -m hurwitz.server --port 8765` runs a server from the command line.
+"""
+import argparse
+import asyncio
+import json
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from .hurwitz import HurwitzQuaternion
+from .parallel import _divide_chunk, _factorize_chunk, _gcd_chunk
+
+_from_doubled = HurwitzQuaternion._from_doubled
+
+OPERATIONS = ('divide', 'gcd', 'factorize', 'power')
+# largest exponent accepted for a power without a modulus
+MAX_EXPONENT = 4096
+# largest doubled coordinates, in bits, of a request or of a power without a modulus. JSON ints stay well
+# below the 4300 digits int() and str() accept by default
+MAX_BITS = 4096
+# largest norm, in bits, of a quaternion to factor
+MAX_NORM_BITS = 64
+# seconds a batch may run before its requests are answered with TimeoutError
+BATCH_TIMEOUT = 30.0
+# latencies kept per operation for the percentiles in metrics()
+LATENCY_WINDOW = 4096
+
+
+def _power_chunk(chunk: list) -> list:
+    return [pow(_from_doubled(*q), power, modulo).doubled() for q, power, modulo in chunk]
+
+
+def _run_chunk(function, chunk: list) -> list:
+    # function over the whole chunk, or item by item when that fails, so one bad request only fails itself.
+    # every result is ('ok', value) or ('error', exception name, message). a failure costs the work done on the
+    # chunk before it, up to a second pass over the whole batch, which is why _parse rejects the predictable
+    # errors before they reach a batch
+    try:
+        return [('ok', result) for result in function(chunk)]
+    except Exception:
+        pass
+    results = []
+    for item in chunk:
+        try:
+            results.append(('ok', function([item])[0]))
+        except Exception as e:
+            results.append(('error', type(e).__name__, str(e)))
+    return results
+
+
+def _quaternion(value, max_bits: int = MAX_BITS) -> tuple:
+    # validated doubled coordinates from a request
+    if not (isinstance(value, list) and len(value) == 4 and all(type(val) is int for val in value)):
+        raise ValueError("Quaternions are lists of four int doubled coordinates")
+    if len({val & 1 for val in value}) != 1:
+        raise ValueError("Doubled coordinates must be all even (whole) or all odd (half)")
+    if max(val.bit_length() for val in value) > max_bits:
+        raise ValueError(f"Doubled coordinates must fit in {max_bits} bits")
+    return tuple(value)
+
+
+def _parse(request: dict, max_exponent: int = MAX_EXPONENT, max_bits: int = MAX_BITS,
+           max_norm_bits: int = MAX_NORM_BITS) -> (tuple, object):
+    # the batch key (operation and options) and the chunk item of a request
+    op = request.get('op')
+    if op == 'divide':
+        left, pro_max = bool(request.get('left', False)), bool(request.get('pro_max', False))
+        a, b = _quaternion(request.get('a'), max_bits), _quaternion(request.get('b'), max_bits)
+        if not any(b):
+            raise ZeroDivisionError("Cannot divide by zero quaternion")
+        return ('divide', left, pro_max), (a, b)
+    if op == 'gcd':
+        left, extended = bool(request.get('left', False)), bool(request.get('extended', False))
+        return ('gcd', left, extended), (_quaternion(request.get('a'), max_bits), _quaternion(request.get('b'), max_bits))
+    if op == 'factorize':
+        q = _quaternion(request.get('q'), max_bits)
+        if not any(q):
+            raise ValueError("Cannot factor the zero quaternion")
+        # 4N(q) = D(q)·D(q)
+        if (sum(val * val for val in q) >> 2).bit_length() > max_norm_bits:
+            raise ValueError(f"Can only factor quaternions with norms of at most {max_norm_bits} bits")
+        return ('factorize',), q
+    if op == 'power':
+        q, power, modulo = _quaternion(request.get('q'), max_bits), request.get('power'), request.get('modulo')
+        if type(power) is not int or not (modulo is None or type(modulo) is int):
+            raise ValueError("power and modulo must be ints")
+        if modulo is None and abs(power) > max_exponent:
+            raise ValueError(f"Exponents above {max_exponent} need a modulus")
+        # the doubled coordinates of q**power have about power * log2(sqrt(N(q))) bits, 4N(q) = D(q)·D(q)
+        if modulo is None and abs(power) * (sum(val * val for val in q).bit_length() - 3) // 2 > max_bits:
+            raise ValueError(f"Powers with coordinates above {max_bits} bits need a modulus")
+        if modulo is not None and modulo <= 0:
+            raise ValueError("Modulus must be a positive int")
+        if modulo is not None and q[0] & 1 and modulo % 2 == 0:
+            raise ValueError("Half quaternions can only be reduced modulo an odd int")
+        if power < 0 and sum(val * val for val in q) != 4:
+            raise ValueError("The quaternion is not unitary and therefore does not have an inverse in 𝐴.")
+        return ('power',), (q, power, modulo)
+    raise ValueError(f"Unknown operation {op!r}, expected one of {', '.join(OPERATIONS)} or metrics")
+
+
+def _chunk_function(key: tuple):
+    if key[0] == 'divide':
+        return partial(_divide_chunk, left=key[1], pro_max=key[2])
+    if key[0] == 'gcd':
+        return partial(_gcd_chunk, left=key[1], extended=key[2])
+    if key[0] == 'factorize':
+        return _factorize_chunk
+    return _power_chunk
+
+
+class _Batcher:
+    # collects the items of one batch key and runs them as a chunk in the server's executor
+    __slots__ = ('server', 'function', 'items', 'futures', 'timer')
+
+    def __init__(self, server: 'HurwitzServer', function) -> None:
+        self.server = server
+        self.function = function
+        self.items = []
+        self.futures = []
+        self.timer = None
+
+    def submit(self, item) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.items.append(item)
+        self.futures.append(future)
+        if len(self.items) >= self.server.max_batch:
+            self.flush()
+        elif self.timer is None:
+            self.timer = loop.call_later(self.server.batch_window, self.flush)
+        return future
+
+    def flush(self) -> None:
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        if not self.items:
+            return
+        items, futures = self.items, self.futures
+        self.items, self.futures = [], []
+        task = asyncio.get_running_loop().create_task(self._run(items, futures))
+        self.server._tasks.add(task)
+        task.add_done_callback(self.server._tasks.discard)
+
+    async def _run(self, items: list, futures: list) -> None:
+        server = self.server
+        async with server._pool_slots:
+            work = asyncio.get_running_loop().run_in_executor(server._executor, _run_chunk, self.function, items)
+            try:
+                results = await asyncio.wait_for(asyncio.shield(work), server.batch_timeout)
+            except asyncio.TimeoutError:
+                results = [('error', 'TimeoutError', f"The batch did not finish in {server.batch_timeout} seconds")] * len(items)
+            except Exception as e:
+                results = [('error', type(e).__name__, str(e))] * len(items)
+            server._batches += 1
+            server._batched_items += len(items)
+            for future, result in zip(futures, results):
+                if not future.done():
+                    future.set_result(result)
+            # a timed out batch keeps its worker busy, hold the slot until it is free
+            await asyncio.gather(work, return_exceptions=True)
+
+
+class _Latency:
+    __slots__ = ('count', 'errors', 'seconds', 'max', 'recent')
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.max = 0.0
+        self.recent = deque(maxlen=LATENCY_WINDOW)
+
+    def add(self, seconds: float, error: bool) -> None:
+        self.count += 1
+        self.errors += error
+        self.seconds += seconds
+        self.max = max(self.max, seconds)
+        self.recent.append(seconds)
+
+    def summary(self) -> dict:
+        recent = sorted(self.recent)
+
+        def percentile(fraction):
+            return recent[min(len(recent) - 1, int(fraction * len(recent)))] if recent else 0.0
+        return {'count': self.count, 'errors': self.errors, 'mean': self.seconds / self.count if self.count else 0.0,
+                'p50': percentile(0.5), 'p99': percentile(0.99), 'max': self.max}
+
+
+class HurwitzServer:
+    """
+    Serves division, gcd, factorization and powers on a localhost TCP port, micro-batching concurrent requests
+    into a process pool. Pass executor= to share a pool (or use a thread pool in tests), port=0 picks a free port.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, workers: int = None, executor=None,
+                 batch_window: float = 0.002, max_batch: int = 1024, max_pending: int = 10000,
+                 max_batches_in_flight: int = None, max_exponent: int = MAX_EXPONENT, max_bits: int = MAX_BITS,
+                 max_norm_bits: int = MAX_NORM_BITS, batch_timeout: float = BATCH_TIMEOUT) -> None:
+        self.host = host
+        self.port = port
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.max_pending = max_pending
+        self.max_exponent = max_exponent
+        self.max_bits = max_bits
+        self.max_norm_bits = max_norm_bits
+        self.batch_timeout = batch_timeout
+        self._own_executor = executor is None
+        self._executor = executor if executor is not None else ProcessPoolExecutor(max_workers=workers)
+        # enough batches queued to keep every worker busy, the rest wait in the batchers
+        self._pool_slots = asyncio.Semaphore(max_batches_in_flight or 2 * (workers or getattr(self._executor, '_max_workers', 4)))
+        self._pending = asyncio.Semaphore(max_pending)
+        self._batchers = {}
+        self._latency = {}
+        self._tasks = set()
+        self._connections = set()
+        self._batches = 0
+        self._batched_items = 0
+        self._in_flight = 0
+        self._server = None
+
+    async def start(self) -> (str, int):
+        # starts listening, returns the bound (host, port)
+        self._server = await asyncio.start_server(self._handle, self.host, self.port, limit=2 ** 24)
+        self.host, self.port = self._server.sockets[0].getsockname()[:2]
+        return self.host, self.port
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        # stops reading from the open connections, they close once their requests are answered
+        for connection in self._connections:
+            connection.cancel()
+        if self._connections:
+            await asyncio.gather(*self._connections, return_exceptions=True)
+        for batcher in self._batchers.values():
+            batcher.flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._own_executor:
+            self._executor.shutdown()
+
+    async def __aenter__(self) -> 'HurwitzServer':
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    def metrics(self) -> dict:
+        # per-operation request counts and latencies in seconds, plus batching and backpressure state
+        return {
+            'operations': {op: latency.summary() for op, latency in self._latency.items()},
+            'batches': self._batches,
+            'mean_batch_size': self._batched_items / self._batches if self._batches else 0.0,
+            'in_flight': self._in_flight,
+            'max_pending': self.max_pending,
+        }
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        lock = asyncio.Lock()
+        tasks = set()
+        self._connections.add(asyncio.current_task())
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                # backpressure: once max_pending requests are in flight, stop reading until one finishes
+                await self._pending.acquire()
+                self._in_flight += 1
+                task = asyncio.get_running_loop().create_task(self._respond(line, writer, lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError, asyncio.CancelledError):
+            # cancelled by close(), which waits for the connection to finish its requests
+            pass
+        finally:
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+            self._connections.discard(asyncio.current_task())
+            writer.close()
+
+    async def _respond(self, line: bytes, writer: asyncio.StreamWriter, lock: asyncio.Lock) -> None:
+        start = time.perf_counter()
+        op, response = None, {}
+        try:
+            request = json.loads(line)
+            response['id'] = request.get('id')
+            op = request.get('op')
+            if op == 'metrics':
+                response['result'] = self.metrics()
+            else:
+                key, item = _parse(request, self.max_exponent, self.max_bits, self.max_norm_bits)
+                batcher = self._batchers.get(key)
+                if batcher is None:
+                    batcher = self._batchers[key] = _Batcher(self, _chunk_function(key))
+                result = await batcher.submit(item)
+                if result[0] == 'ok':
+                    response['result'] = result[1]
+                else:
+                    response['error'] = {'type': result[1], 'message': result[2]}
+        except Exception as e:
+            response['error'] = {'type': type(e).__name__, 'message': str(e)}
+        finally:
+            self._in_flight -= 1
+            self._pending.release()
+        try:
+            encoded = json.dumps(response).encode() + b'\n'
+        except Exception as e:
+            # e.g. ints past the digit limit of int to str conversion, the caller gets an error instead of no answer
+            response = {'id': response.get('id'), 'error': {'type': type(e).__name__, 'message': str(e)}}
+            encoded = json.dumps(response).encode() + b'\n'
+        if op in OPERATIONS:
+            self._latency.setdefault(op, _Latency()).add(time.perf_counter() - start, 'error' in response)
+        async with lock:
+            try:
+                writer.write(encoded)
+                await writer.drain()
+            except ConnectionError:
+                pass
+
+
+class RemoteError(Exception):
+    """
+    An error the server reported for a request, with the name of the exception it raised.
+    """
+
+    def __init__(self, type_name: str, message: str) -> None:
+        super().__init__(f"{type_name}: {message}")
+        self.type_name = type_name
+
+
+class HurwitzClient:
+    """
+    Pipelined client for HurwitzServer, any number of calls can be awaited concurrently over one connection.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._reader = reader
+        self._writer = writer
+        self._futures = {}
+        self._next_id = 0
+        self._receiver = asyncio.get_running_loop().create_task(self._receive())
+
+    @classmethod
+    async def connect(cls, host: str = '127.0.0.1', port: int = 8765) -> 'HurwitzClient':
+        reader, writer = await asyncio.open_connection(host, port, limit=2 ** 24)
+        return cls(reader, writer)
+
+    async def __aenter__(self) -> 'HurwitzClient':
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+        await asyncio.gather(self._receiver, return_exceptions=True)
+
+    async def _receive(self) -> None:
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                response = json.loads(line)
+                future = self._futures.pop(response.get('id'), None)
+                if future is None or future.done():
+                    continue
+                if 'error' in response:
+                    future.set_exception(RemoteError(response['error']['type'], response['error']['message']))
+                else:
+                    future.set_result(response['result'])
+        finally:
+            for future in self._futures.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("Connection to the server was closed"))
+            self._futures.clear()
+
+    async def request(self, op: str, **fields):
+        # sends a raw request and waits for its result
+        self._next_id += 1
+        request_id = self._next_id
+        future = asyncio.get_running_loop().create_future()
+        self._futures[request_id] = future
+        self._writer.write(json.dumps({'id': request_id, 'op': op, **fields}).encode() + b'\n')
+        await self._writer.drain()
+        return await future
+
+    async def divide(self, a: HurwitzQuaternion, b: HurwitzQuaternion, left: bool = False,
+                     pro_max: bool = False) -> (HurwitzQuaternion, HurwitzQuaternion):
+        q, r = await self.request('divide', a=a.doubled(), b=b.doubled(), left=left, pro_max=pro_max)
+        return _from_doubled(*q), _from_doubled(*r)
+
+    async def gcd(self, a: HurwitzQuaternion, b: HurwitzQuaternion, left: bool = False, extended: bool = False):
+        result = await self.request('gcd', a=a.doubled(), b=b.doubled(), left=left, extended=extended)
+        if extended:
+            return tuple(_from_doubled(*x) for x in result)
+        return _from_doubled(*result)
+
+    async def factorize(self, q: HurwitzQuaternion) -> list:
+        return [_from_doubled(*prime) for prime in await self.request('factorize', q=q.doubled())]
+
+    async def power(self, q: HurwitzQuaternion, power: int, modulo: int = None) -> HurwitzQuaternion:
+        return _from_doubled(*await self.request('power', q=q.doubled(), power=power, modulo=modulo))
+
+    async def metrics(self) -> dict:
+        return await self.request('metrics')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve Hurwitz quaternion operations on localhost.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument("--batch-window", type=float, default=0.002, help="seconds to collect a batch")
+    parser.add_argument("--max-batch", type=int, default=1024)
+    parser.add_argument("--max-pending", type=int, default=10000)
+    parser.add_argument("--max-exponent", type=int, default=MAX_EXPONENT, help="largest power without a modulus")
+    parser.add_argument("--max-bits", type=int, default=MAX_BITS, help="largest doubled coordinates, in bits")
+    parser.add_argument("--max-norm-bits", type=int, default=MAX_NORM_BITS, help="largest norm to factor, in bits")
+    parser.add_argument("--batch-timeout", type=float, default=BATCH_TIMEOUT, help="seconds before a batch times out")
+    args = parser.parse_args()
+
+    async def run():
+        async with HurwitzServer(args.host, args.port, args.workers, batch_window=args.batch_window,
+                                 max_batch=args.max_batch, max_pending=args.max_pending,
+                                 max_exponent=args.max_exponent, max_bits=args.max_bits,
+                                 max_norm_bits=args.max_norm_bits, batch_timeout=args.batch_timeout) as server:
+            print(f"serving on {server.host}:{server.port}", flush=True)
+            await server.serve_forever()
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
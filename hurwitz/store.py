@@ -0,0 +1,229 @@
+import mmap
+import os
+import struct
+
+from .hurwitz import HurwitzQuaternion
+
+# file layout: a 16 byte header followed by the records.
+#   magic b'HURW', format version, record width (4 or 8 bytes per coordinate, 0 for varints),
+#   half flag (1: coordinates are doubled and may be half, 0: plain whole coordinates), padding, element count
+HEADER = struct.Struct('<4sBBBxQ')
+MAGIC = b'HURW'
+VERSION = 1
+RECORDS = {4: struct.Struct('<4i'), 8: struct.Struct('<4q')}
+
+
+def _zigzag(value: int) -> int:
+    return value << 1 if value >= 0 else ((-value) << 1) - 1
+
+
+def _unzigzag(value: int) -> int:
+    return value >> 1 if not value & 1 else -((value + 1) >> 1)
+
+
+def encode_varint_record(coordinates: tuple) -> bytes:
+    # four zigzag LEB128 varints, any size of int
+    out = bytearray()
+    for value in coordinates:
+        value = _zigzag(value)
+        while value > 0x7f:
+            out.append((value & 0x7f) | 0x80)
+            value >>= 7
+        out.append(value)
+    return bytes(out)
+
+
+def decode_varint_record(buffer, offset: int) -> (tuple, int):
+    # returns the four coordinates and the offset just past the record
+    coordinates = []
+    for _ in range(4):
+        value = shift = 0
+        while True:
+            byte = buffer[offset]
+            offset += 1
+            value |= (byte & 0x7f) << shift
+            if not byte & 0x80:
+                break
+            shift += 7
+        coordinates.append(_unzigzag(value))
+    return tuple(coordinates), offset
+
+
+class HurwitzStore:
+    """
+    A file of Hurwitz quaternions in fixed-width (int32/int64) or varint records.
+
+    Writes are buffered and appendable (mode 'w' creates or truncates, 'a' appends), reads go through
+    a read-only mmap, so array() is a zero-copy view and indexing only builds the quaternions asked for.
+
+    The record format is chosen for the whole file: a fixed-width store raises OverflowError for a quaternion
+    that does not fit rather than falling back to a varint record, since indexing and array() rely on every
+    record having the same size. Use width=0 for coefficients of unbounded size.
+    """
+
+    def __init__(self, path: str, mode: str = 'r', width: int = 8, half: bool = True) -> None:
+        if mode not in ('r', 'w', 'a'):
+            raise ValueError("mode must be 'r', 'w' or 'a'")
+        self.path = path
+        self.mode = mode
+        if mode == 'w':
+            if width not in (0, 4, 8):
+                raise ValueError("width must be 4 or 8 bytes, or 0 for varint records")
+            self.width, self.half, self.count = width, bool(half), 0
+            self._file = open(path, 'w+b')
+            self._file.write(HEADER.pack(MAGIC, VERSION, self.width, self.half, 0))
+        else:
+            self._file = open(path, 'rb' if mode == 'r' else 'r+b')
+            magic, version, self.width, half, self.count = HEADER.unpack(self._file.read(HEADER.size))
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{path} is not a version {VERSION} Hurwitz store")
+            self.half = bool(half)
+            self._file.seek(0, os.SEEK_END)
+        self._map = None
+        self._mapped_count = 0
+        # byte offsets of the varint records, built on the first random access
+        self._offsets = None
+        self._end = self._file.tell()
+
+    @classmethod
+    def write(cls, path: str, quaternions, width: int = 8, half: bool = True) -> 'HurwitzStore':
+        # streams an iterable of quaternions into a new store and returns it opened for reading
+        with cls(path, 'w', width, half) as store:
+            store.extend(quaternions)
+        return cls(path)
+
+    def __enter__(self) -> 'HurwitzStore':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __repr__(self) -> str:
+        return f"HurwitzStore({self.path!r}, {self.count} quaternions, width={self.width}, half={self.half})"
+
+    def _coordinates(self, q: HurwitzQuaternion) -> tuple:
+        if self.half:
+            return q.doubled()
+        if q.half:
+            raise ValueError("This store only holds whole quaternions, create it with half=True")
+        return (q.a, q.b, q.c, q.d)
+
+    def append(self, q: HurwitzQuaternion) -> None:
+        if self.mode == 'r':
+            raise ValueError("Store is opened read-only")
+        coordinates = self._coordinates(q)
+        if self.width:
+            try:
+                record = RECORDS[self.width].pack(*coordinates)
+            except struct.error:
+                raise OverflowError(f"{q!r} does not fit in {self.width} byte records, use width=0 (varint)") from None
+        else:
+            record = encode_varint_record(coordinates)
+            if self._offsets is not None:
+                self._offsets.append(self._end)
+        self._file.write(record)
+        self._end += len(record)
+        self.count += 1
+
+    def extend(self, quaternions) -> None:
+        for q in quaternions:
+            self.append(q)
+
+    def flush(self) -> None:
+        # write the element count into the header so the file is complete on disk
+        if self.mode == 'r':
+            return
+        self._file.seek(0)
+        self._file.write(HEADER.pack(MAGIC, VERSION, self.width, self.half, self.count))
+        self._file.seek(0, os.SEEK_END)
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        self.flush()
+        self._release_map()
+        self._file.close()
+
+    def _release_map(self) -> None:
+        # a mapping still exported to an array() view is left for the garbage collector to close
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                pass
+            self._map = None
+
+    def _buffer(self) -> mmap.mmap:
+        # the read-only mapping, remapped when records were appended since the last read
+        if self._map is None or self._mapped_count != self.count:
+            self.flush()
+            self._release_map()
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._mapped_count = self.count
+        return self._map
+
+    def _quaternion(self, coordinates: tuple) -> HurwitzQuaternion:
+        if self.half:
+            return HurwitzQuaternion._from_doubled(*coordinates)
+        return HurwitzQuaternion._make(*coordinates, False)
+
+    def _varint_offsets(self) -> list:
+        if self._offsets is None:
+            buffer = self._buffer()
+            offsets, offset = [], HEADER.size
+            for _ in range(self.count):
+                offsets.append(offset)
+                offset = decode_varint_record(buffer, offset)[1]
+            self._offsets = offsets
+        return self._offsets
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [self[i] for i in range(*key.indices(self.count))]
+        if key < 0:
+            key += self.count
+        if not 0 <= key < self.count:
+            raise IndexError("HurwitzStore index out of range")
+        buffer = self._buffer()
+        if self.width:
+            record = RECORDS[self.width]
+            return self._quaternion(record.unpack_from(buffer, HEADER.size + key * record.size))
+        return self._quaternion(decode_varint_record(buffer, self._varint_offsets()[key])[0])
+
+    def __iter__(self):
+        buffer = self._buffer()
+        count = self.count
+        if self.width:
+            record = RECORDS[self.width]
+            for offset in range(HEADER.size, HEADER.size + count * record.size, record.size):
+                yield self._quaternion(record.unpack_from(buffer, offset))
+        else:
+            offset = HEADER.size
+            for _ in range(count):
+                coordinates, offset = decode_varint_record(buffer, offset)
+                yield self._quaternion(coordinates)
+
+    def array(self):
+        # zero-copy (N, 4) NumPy view of the records, doubled coordinates when the store is half
+        if not self.width:
+            raise ValueError("Varint stores have no fixed-width view, iterate or index them instead")
+        import numpy as np
+        dtype = np.dtype('<i4' if self.width == 4 else '<i8')
+        return np.frombuffer(self._buffer(), dtype=dtype, count=4 * self.count, offset=HEADER.size).reshape(self.count, 4)
+
+    def to_array(self):
+        # the records as a HurwitzQuaternionArray
+        from .array import INT64_LIMIT, HurwitzQuaternionArray, _max_abs
+        if not self.width:
+            return HurwitzQuaternionArray.from_quaternions(self)
+        data = self.array().astype('i8')
+        if not self.half:
+            # widen before doubling whole coordinates, int64 ones may need Python ints
+            if 2 * _max_abs(data) >= INT64_LIMIT:
+                data = data.astype(object)
+            data = 2 * data
+        return HurwitzQuaternionArray(data)
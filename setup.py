@@ -1,10 +1,15 @@
-from setuptools import setup, find_packages
+from setuptools import setup, find_packages, Extension
 
 setup(
     name='hurwitz',
     version='1.0.0',
     packages=find_packages(),
+    # optional compiled core, the package falls back to pure Python when it cannot be built
+    ext_modules=[Extension('hurwitz._speedups', ['hurwitz/_speedups.c'], optional=True)],
     install_requires=[],
+    extras_require={
+        'numpy': ['numpy'],
+    },
     author='Harper Chisari',
     author_email='harper.chisari@harpresearch.ai',
     description='A module for working with Hurwitz quaternions',
@@ -16,5 +21,5 @@ setup(
         'License :: OSI Approved :: MIT License',
         'Operating System :: OS Independent',
     ],
-    python_requires='>=3.6',
+    python_requires='>=3.8',
 )
@@ -0,0 +1,17 @@
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hurwitz.hurwitz import HurwitzQuaternion
+
+
+def random_quaternion(rng: random.Random, bits: int, half: bool = None) -> HurwitzQuaternion:
+    # a random whole or half quaternion with coefficients of about the given bit-size
+    if half is None:
+        half = rng.random() < 0.5
+    values = [rng.getrandbits(bits) * rng.choice((1, -1)) for _ in range(4)]
+    if half:
+        return HurwitzQuaternion(*(2 * val + 1 for val in values), True)
+    return HurwitzQuaternion(*values)
@@ -0,0 +1,82 @@
+import random
+from functools import reduce
+
+import pytest
+
+from conftest import random_quaternion
+from hurwitz.hurwitz import HurwitzAccumulator, HurwitzQuaternion, sum_quaternions
+
+ZERO = HurwitzQuaternion(0, 0, 0, 0)
+
+
+def quaternions(seed: int, count: int = 100, half: bool = None) -> list:
+    rng = random.Random(seed)
+    return [random_quaternion(rng, rng.choice((3, 40, 100)), half) for _ in range(count)]
+
+
+def total(terms: list) -> HurwitzQuaternion:
+    return reduce(lambda x, y: x + y, terms, ZERO)
+
+
+@pytest.mark.parametrize("half", [None, True, False])
+def test_sum_matches_addition(half):
+    terms = quaternions(1, half=half)
+    accumulator = HurwitzAccumulator()
+    for q in terms:
+        accumulator += q
+    assert accumulator.value() == total(terms) == sum_quaternions(terms)
+    assert HurwitzAccumulator(terms).value() == total(terms)
+    assert accumulator.doubled() == total(terms).doubled()
+
+
+def test_half_terms_pair_up():
+    # two half quaternions sum to a whole one, three to a half one
+    q = HurwitzQuaternion(1, 1, 1, 1, True)
+    assert not sum_quaternions([q, q]).half and sum_quaternions([q, q]) == HurwitzQuaternion(1, 1, 1, 1)
+    assert sum_quaternions([q, q, q]).half
+    assert sum_quaternions([]) == ZERO
+
+
+def test_subtraction():
+    terms, others = quaternions(2), quaternions(3)
+    accumulator = HurwitzAccumulator(terms)
+    for q in others:
+        accumulator -= q
+    assert accumulator.value() == total(terms) - total(others)
+    accumulator = HurwitzAccumulator(terms).update(others, sign=-1)
+    assert accumulator.value() == total(terms) - total(others)
+    accumulator.update(others)
+    assert accumulator.value() == total(terms)
+
+
+def test_accumulators_combine():
+    terms, others = quaternions(4), quaternions(5)
+    accumulator = HurwitzAccumulator(terms)
+    accumulator += HurwitzAccumulator(others)
+    assert accumulator.value() == total(terms) + total(others)
+    accumulator -= HurwitzAccumulator(others)
+    assert accumulator.value() == total(terms)
+    accumulator += accumulator
+    assert accumulator.value() == total(terms) + total(terms)
+
+
+def test_start():
+    terms = quaternions(6)
+    start = HurwitzQuaternion(1, 3, 5, 7, True)
+    assert sum_quaternions(terms, start=start) == start + total(terms)
+    assert sum_quaternions([], start=start) == start
+
+
+def test_type_errors():
+    terms = quaternions(7, 10)
+    accumulator = HurwitzAccumulator()
+    with pytest.raises(TypeError):
+        accumulator += 1
+    with pytest.raises(TypeError):
+        accumulator -= (1, 2, 3, 4)
+    with pytest.raises(TypeError):
+        accumulator.update(terms[:5] + [1] + terms[5:])
+    # the terms before the bad one are kept
+    assert accumulator.value() == total(terms[:5])
+    with pytest.raises(TypeError):
+        sum_quaternions([HurwitzQuaternion(1, 0, 0, 0), 2.5])
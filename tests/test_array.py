@@ -0,0 +1,79 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from conftest import random_quaternion
+from hurwitz.array import HurwitzQuaternionArray, snap_many
+from hurwitz.hurwitz import HurwitzQuaternion
+
+# 20 bits stays on int64, 40 bits promotes products to object arrays, 100 bits starts out as objects
+BITS = (4, 20, 40, 100)
+
+
+def operands(bits: int, count: int = 200):
+    rng = random.Random(bits)
+    xs = [random_quaternion(rng, bits) for _ in range(count)]
+    ys = [random_quaternion(rng, rng.choice((1, bits))) for _ in range(count)]
+    ys = [y if y.reduced_norm() else HurwitzQuaternion(1, 0, 0, 0) for y in ys]
+    return xs, ys, HurwitzQuaternionArray.from_quaternions(xs), HurwitzQuaternionArray.from_quaternions(ys)
+
+
+@pytest.mark.parametrize("bits", BITS)
+def test_arithmetic_matches_scalar(bits):
+    xs, ys, x, y = operands(bits)
+    assert list(x + y) == [a + b for a, b in zip(xs, ys)]
+    assert list(x - y) == [a - b for a, b in zip(xs, ys)]
+    assert list(x * y) == [a * b for a, b in zip(xs, ys)]
+    assert list(-x) == [-a for a in xs]
+    assert list(x.conjugate()) == [a.conjugate() for a in xs]
+    assert [int(n) for n in x.reduced_norm()] == [a.reduced_norm() for a in xs]
+
+
+@pytest.mark.parametrize("bits", BITS)
+def test_broadcast_scalar(bits):
+    xs, ys, x, _ = operands(bits)
+    assert list(x * ys[0]) == [a * ys[0] for a in xs]
+    assert list(ys[0] * x) == [ys[0] * a for a in xs]
+
+
+@pytest.mark.parametrize("bits", BITS)
+def test_division_matches_scalar(bits):
+    xs, ys, x, y = operands(bits)
+    q, r = x.euclidean_division(y)
+    assert list(zip(q, r)) == [a.euclidean_division(b) for a, b in zip(xs, ys)]
+    q, r = x.left_euclidean_division(y)
+    assert list(zip(q, r)) == [a.left_euclidean_division(b) for a, b in zip(xs, ys)]
+
+
+def test_division_by_zero():
+    x = HurwitzQuaternionArray.from_quaternions([HurwitzQuaternion(1, 2, 3, 4)])
+    with pytest.raises(ZeroDivisionError):
+        x.euclidean_division(HurwitzQuaternion(0, 0, 0, 0))
+
+
+def test_parity_check():
+    with pytest.raises(ValueError):
+        HurwitzQuaternionArray([[1, 2, 3, 4]])
+
+
+def test_snap_many_matches_snap():
+    rng = np.random.default_rng(0)
+    points = rng.uniform(-1000, 1000, (2000, 4))
+    # points on the midpoints between candidates exercise the tie rule
+    points[:100] = np.round(points[:100] * 4) / 4
+    snapped = snap_many(points, quaternions=True)
+    assert snapped == [HurwitzQuaternion(0, 0, 0, 0).snap(tuple(row)) for row in points.tolist()]
+
+
+@pytest.mark.parametrize("scale", [2.0 ** 52, 2.0 ** 55, 2.0 ** 60])
+def test_snap_many_large_magnitude(scale):
+    # floor(x) + 0.5 loses the half past 2^52, the half candidate must still have all odd doubled coordinates
+    points = [[scale, .3, .3, .3], [-scale, .5, -.5, .5], [scale + 2 ** 10, .4, .6, .5]]
+    snapped = snap_many(points, quaternions=True)
+    assert snapped == [HurwitzQuaternion(0, 0, 0, 0).snap(tuple(row)) for row in points]
+    assert [q.doubled() for q in snapped] == [
+        (int(2 * scale), 0, 0, 0), (-int(2 * scale) + 1, 1, -1, 1), (int(2 * scale) + 2 ** 11 + 1, 1, 1, 1)]
+    for q in snapped:
+        assert q == HurwitzQuaternion._from_doubled(*q.doubled())
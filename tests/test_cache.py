@@ -0,0 +1,156 @@
+import random
+
+import pytest
+
+from conftest import random_quaternion
+from hurwitz import cache, instrument
+from hurwitz.hurwitz import PURE_PYTHON, HurwitzQuaternion
+
+NAMES = sorted(set(cache.CACHED) | set(instrument.INSTRUMENTED) | set(PURE_PYTHON))
+
+
+def methods() -> dict:
+    return {name: HurwitzQuaternion.__dict__[name] for name in NAMES}
+
+
+def kinds() -> dict:
+    # which core each method comes from and whether a layer wraps it, use_speedups installs new compiled methods
+    return {name: (type(method), method is PURE_PYTHON.get(name), hasattr(method, '__wrapped__'))
+            for name, method in methods().items()}
+
+
+def operands(count: int = 20, bits: int = 60) -> list:
+    rng = random.Random(bits)
+    return [(random_quaternion(rng, bits), random_quaternion(rng, bits // 2)) for _ in range(count)]
+
+
+@pytest.fixture(autouse=True)
+def plain():
+    # every test starts and must end with the methods in place before it
+    before = kinds()
+    yield
+    cache.disable()
+    assert kinds() == before
+
+
+def test_layers_nest():
+    before = methods()
+    pairs = operands()
+    expected = [a.euclidean_division(b) for a, b in pairs]
+    tracer = instrument.Profile()
+    instrument.add_tracer(tracer)
+    results = cache.enable()
+    assert [a.euclidean_division(b) for a, b in pairs] == expected
+    assert tracer.counts['division'] == len(pairs) and results.info().misses == len(pairs)
+    instrument.remove_tracer(tracer)
+    # the cache stays in place over the core the tracer replaced
+    assert [a.euclidean_division(b) for a, b in pairs] == expected
+    assert tracer.counts['division'] == len(pairs) and results.info().hits == len(pairs)
+    for name in PURE_PYTHON:
+        if name not in cache.CACHED:
+            assert HurwitzQuaternion.__dict__[name] is before[name]
+    cache.disable()
+    assert methods() == before
+
+
+@pytest.mark.parametrize("order", [
+    ('enable', 'add', 'disable', 'remove'),
+    ('enable', 'add', 'remove', 'disable'),
+    ('add', 'enable', 'disable', 'remove'),
+    ('add', 'enable', 'remove', 'disable'),
+])
+def test_layers_in_any_order(order):
+    before = methods()
+    tracer = instrument.Profile()
+    a, b = operands(1)[0]
+    for step in order:
+        if step == 'enable':
+            cache.enable()
+        elif step == 'disable':
+            cache.disable()
+        elif step == 'add':
+            instrument.add_tracer(tracer)
+        else:
+            instrument.remove_tracer(tracer)
+        assert a.euclidean_division(b) == (a // b, a % b)
+    assert methods() == before
+
+
+def test_use_speedups_under_layers():
+    from hurwitz.hurwitz import _speedups, use_speedups
+    compiled = _speedups is not None and HurwitzQuaternion.__dict__['__add__'] is not PURE_PYTHON['__add__']
+    a, b = operands(1)[0]
+    with cache.caching() as results:
+        use_speedups(not compiled)
+        assert a.euclidean_division(b) == a.euclidean_division(b)
+        assert results.info().hits == 1
+        use_speedups(compiled)
+    assert (HurwitzQuaternion.__dict__['__add__'] is PURE_PYTHON['__add__']) is not compiled
+
+
+def test_internal_divisions_not_cached():
+    pairs = operands(10, 100)
+    with cache.caching() as results:
+        for a, b in pairs:
+            a.right_gcd(b)
+            a.left_extended_gcd(b)
+        HurwitzQuaternion(1234567, 89, -1011, 1213).factorize()
+        assert len(results) == 0
+        a, b = pairs[0]
+        a.euclidean_division_pro_max(b)
+        a.euclidean_division(b)
+        assert len(results) == 2
+
+
+def test_tracer_counts_internal_divisions():
+    a, b = operands(1, 100)[0]
+    with cache.caching(), instrument.profile() as stats:
+        a.right_gcd(b)
+    assert stats.counts['division'] > 1
+
+
+def test_results():
+    pairs = operands()
+    q = pairs[0][0]
+    expected = [(a.euclidean_division(b), a.euclidean_division_pro_max(b)) for a, b in pairs]
+    with cache.caching() as results:
+        for _ in range(2):
+            assert [(a.euclidean_division(b), a.euclidean_division_pro_max(b)) for a, b in pairs] == expected
+            assert q ** 7 == q * q * q * q * q * q * q and pow(q, 7, 11) == pow(q, 7, 11)
+            assert q.equivalence_class() == q.equivalence_class()
+        info = results.info()
+    assert info.misses == 2 * len(pairs) + 3 and info.hits == info.misses + 4
+    assert cache.active_cache() is None
+
+
+def test_bounds():
+    pairs = operands(50)
+    with cache.caching(cache.ResultCache(maxsize=10, max_bytes=None)) as results:
+        for a, b in pairs:
+            a.euclidean_division(b)
+        assert len(results) == 10 and results.info().evictions == 40
+    with cache.caching(cache.ResultCache(maxsize=None, max_bytes=4000)) as results:
+        for a, b in pairs:
+            a.euclidean_division(b)
+        assert 0 < results.bytes <= 4000 and len(results) < 50
+
+
+def test_unknown_operation():
+    with pytest.raises(ValueError):
+        cache.enable(operations=('right_gcd',))
+    assert cache.active_cache() is None
+
+
+def test_disk_warm_start(tmp_path):
+    path = str(tmp_path / "results.sqlite")
+    pairs = operands()
+    with cache.caching(cache.ResultCache(path=path)) as results:
+        expected = [a.euclidean_division(b) for a, b in pairs]
+        q = pairs[0][0]
+        power = q ** 5
+    results.close()
+    with cache.caching(cache.ResultCache(path=path)) as results:
+        assert [a.euclidean_division(b) for a, b in pairs] == expected
+        assert q ** 5 == power
+        assert results.info().disk_hits == len(pairs) + 1
+    results.close()
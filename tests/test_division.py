@@ -0,0 +1,80 @@
+import random
+
+import pytest
+
+from conftest import random_quaternion
+from hurwitz.hurwitz import HurwitzQuaternion
+
+BITS = (2, 16, 64, 256, 1024)
+
+
+def pairs(bits: int, count: int = 200):
+    rng = random.Random(bits)
+    for _ in range(count):
+        a = random_quaternion(rng, bits)
+        b = random_quaternion(rng, rng.choice((1, bits // 2 + 1, bits)))
+        if b.reduced_norm():
+            yield a, b
+
+
+@pytest.mark.parametrize("bits", BITS)
+def test_right_division(bits):
+    for a, b in pairs(bits):
+        q, r = a.euclidean_division(b)
+        assert q * b + r == a
+        assert r.reduced_norm() < b.reduced_norm()
+
+
+@pytest.mark.parametrize("bits", BITS)
+def test_left_division(bits):
+    for a, b in pairs(bits):
+        q, r = a.left_euclidean_division(b)
+        assert b * q + r == a
+        assert r.reduced_norm() < b.reduced_norm()
+
+
+@pytest.mark.parametrize("bits", BITS)
+def test_division_pro_max(bits):
+    for a, b in pairs(bits, 50):
+        q, r = a.euclidean_division_pro_max(b)
+        assert r.reduced_norm() <= a.euclidean_division(b)[1].reduced_norm()
+        # the quotient belongs to the dividend or its conjugate
+        assert q * b + r in (a, a.conjugate())
+
+
+def test_division_by_zero():
+    with pytest.raises(ZeroDivisionError):
+        HurwitzQuaternion(1, 2, 3, 4).euclidean_division(HurwitzQuaternion(0, 0, 0, 0))
+    with pytest.raises(ZeroDivisionError):
+        HurwitzQuaternion(1, 2, 3, 4).left_euclidean_division(HurwitzQuaternion(0, 0, 0, 0))
+    with pytest.raises(TypeError):
+        HurwitzQuaternion(1, 2, 3, 4).euclidean_division(5)
+
+
+@pytest.mark.parametrize("bits", (4, 64, 512))
+def test_right_extended_gcd(bits):
+    for a, b in pairs(bits, 50):
+        d, u, v = a.right_extended_gcd(b)
+        assert u * a + v * b == d
+        # d right-divides both
+        for x in (a, b):
+            assert x.euclidean_division(d)[1] == HurwitzQuaternion(0, 0, 0, 0)
+
+
+@pytest.mark.parametrize("bits", (4, 64, 512))
+def test_left_extended_gcd(bits):
+    for a, b in pairs(bits, 50):
+        d, u, v = a.left_extended_gcd(b)
+        assert a * u + b * v == d
+        for x in (a, b):
+            assert x.left_euclidean_division(d)[1] == HurwitzQuaternion(0, 0, 0, 0)
+
+
+def test_gcd_of_multiples():
+    rng = random.Random(0)
+    for _ in range(50):
+        d, x, y = (random_quaternion(rng, 20) for _ in range(3))
+        g = (x * d).right_gcd(y * d)
+        # g is a right multiple of d, so N(d) divides N(g)
+        assert (x * d).euclidean_division(g)[1] == HurwitzQuaternion(0, 0, 0, 0)
+        assert g.reduced_norm() % d.reduced_norm() == 0
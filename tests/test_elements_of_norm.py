@@ -0,0 +1,51 @@
+from itertools import product
+
+import pytest
+
+from hurwitz.hurwitz import HurwitzQuaternion
+
+NORMS = (0, 1, 2, 3, 4, 5, 6, 9, 12, 25, 30)
+
+
+def brute_force(n: int) -> set:
+    # doubled coordinates of every Hurwitz quaternion of norm n: |2x| <= 2 sqrt(n), and 4N = sum of squares
+    limit = 2 * int(n ** 0.5) + 2
+    return {x for x in product(range(-limit, limit + 1), repeat=4)
+            if len({val & 1 for val in x}) == 1 and sum(val * val for val in x) == 4 * n}
+
+
+def r4(n: int) -> int:
+    # Jacobi: the number of ways to write n as a sum of four squares
+    return 8 * sum(d for d in range(1, n + 1) if n % d == 0 and d % 4) if n else 1
+
+
+@pytest.mark.parametrize("n", NORMS)
+def test_elements_of_norm(n):
+    elements = [q.doubled() for q in HurwitzQuaternion.elements_of_norm(n)]
+    assert len(elements) == len(set(elements))
+    assert set(elements) == brute_force(n)
+
+
+@pytest.mark.parametrize("n", NORMS)
+def test_whole_and_half(n):
+    whole = list(HurwitzQuaternion.elements_of_norm(n, half=False))
+    half = list(HurwitzQuaternion.elements_of_norm(n, half=True))
+    assert not any(q.half for q in whole) and all(q.half for q in half)
+    assert len(whole) == r4(n)
+    assert {q.doubled() for q in whole + half} == brute_force(n)
+
+
+@pytest.mark.parametrize("n", NORMS[1:])
+def test_up_to_units(n):
+    representatives = list(HurwitzQuaternion.elements_of_norm(n, up_to_units=True))
+    assert all(q == q.canonical_associate() for q in representatives)
+    # the classes of the representatives cover every element exactly once
+    covered = [x.doubled() for q in representatives for x in q.associates()]
+    assert len(covered) == len(set(covered))
+    assert set(covered) == brute_force(n)
+
+
+def test_invalid_norms():
+    assert list(HurwitzQuaternion.elements_of_norm(-1)) == []
+    with pytest.raises(TypeError):
+        list(HurwitzQuaternion.elements_of_norm(2.0))
@@ -0,0 +1,65 @@
+import random
+from functools import reduce
+
+import pytest
+
+from conftest import random_quaternion
+from hurwitz.hurwitz import HurwitzQuaternion
+from hurwitz.primes import factor_integer, is_prime
+
+
+def product(factors):
+    return reduce(lambda x, y: x * y, factors)
+
+
+@pytest.mark.parametrize("bits", (3, 12, 24))
+def test_factorize(bits):
+    rng = random.Random(bits)
+    for _ in range(100):
+        q = random_quaternion(rng, bits)
+        if not q.reduced_norm():
+            continue
+        primes = q.factorize()
+        assert product(primes) == q
+        assert [p.reduced_norm() for p in primes] == list(factor_integer(q.reduced_norm()))
+
+
+def test_factorize_order():
+    rng = random.Random(0)
+    for _ in range(50):
+        q = random_quaternion(rng, 10)
+        if not q.reduced_norm():
+            continue
+        order = list(factor_integer(q.reduced_norm()))
+        rng.shuffle(order)
+        primes = q.factorize(order)
+        assert product(primes) == q
+        assert [p.reduced_norm() for p in primes] == order
+
+
+def test_factorize_special_cases():
+    # rational primes and their powers, units, and the zero quaternion
+    for q in (HurwitzQuaternion(7, 0, 0, 0), HurwitzQuaternion(12, 0, 0, 0), HurwitzQuaternion(2, 2, 0, 0)):
+        primes = q.factorize()
+        assert product(primes) == q
+        assert all(is_prime(p.reduced_norm()) for p in primes)
+    unit = HurwitzQuaternion(1, 1, 1, 1, True)
+    assert unit.factorize() == [unit]
+    with pytest.raises(ValueError):
+        HurwitzQuaternion(0, 0, 0, 0).factorize()
+    with pytest.raises(ValueError):
+        HurwitzQuaternion(2, 1, 0, 0).factorize([2, 3])
+
+
+@pytest.mark.parametrize("p", (2, 3, 5, 101, 10007))
+def test_norm_prime(p):
+    assert HurwitzQuaternion.norm_prime(p).reduced_norm() == p
+
+
+def test_factor_integer():
+    rng = random.Random(0)
+    for _ in range(200):
+        n = rng.randrange(1, 10 ** 12)
+        factors = factor_integer(n)
+        assert product((1,) + factors) == n
+        assert all(is_prime(p) for p in factors)
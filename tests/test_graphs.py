@@ -0,0 +1,82 @@
+import random
+from collections import Counter
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from hurwitz.graphs import CayleyGraph, cayley_graph, generators
+from hurwitz.hurwitz import HurwitzQuaternion
+
+PRIMES = [(3, 5), (5, 7), (5, 13), (3, 11)]
+
+
+@pytest.fixture(scope='module', params=PRIMES, ids=lambda pq: f"p{pq[0]}_q{pq[1]}")
+def graph(request):
+    return cayley_graph(*request.param)
+
+
+def edges(graph: CayleyGraph) -> Counter:
+    sources = np.repeat(np.arange(graph.n_vertices), np.diff(graph.indptr))
+    return Counter(zip(sources.tolist(), np.asarray(graph.indices).tolist()))
+
+
+def test_vertex_count(graph):
+    q = graph.q
+    assert graph.n_vertices == q * (q * q - 1)
+    assert np.all(np.diff(graph.vertex_keys) > 0)
+
+
+def test_out_degree(graph):
+    assert len(graph.generators) == graph.p + 1
+    assert np.all(np.diff(graph.indptr) == graph.p + 1)
+    assert graph.n_edges == graph.n_vertices * (graph.p + 1)
+
+
+def test_index_inverts_vertex(graph):
+    assert [graph.index(graph.vertex(i)) for i in range(graph.n_vertices)] == list(range(graph.n_vertices))
+    # scalar multiples are the same vertex
+    assert graph.index(graph.vertex(5) * HurwitzQuaternion(2, 0, 0, 0)) == 5
+    with pytest.raises(ValueError):
+        graph.index(HurwitzQuaternion(graph.q, 0, 0, 0))
+
+
+def test_edges_are_right_products(graph):
+    rng = random.Random(graph.q)
+    gens = [HurwitzQuaternion(*(int(val) for val in g)) for g in graph.generators]
+    for i in rng.sample(range(graph.n_vertices), 50):
+        v = graph.vertex(i)
+        assert list(graph.neighbors(i)) == [graph.index(v * g) for g in gens]
+
+
+@pytest.mark.parametrize("p, q", PRIMES)
+def test_symmetric(p, q):
+    graph = cayley_graph(p, q, symmetric=True)
+    assert len(graph.generators) >= p + 1
+    assert np.array_equal(graph.generators[:p + 1], generators(p, q))
+    counts = edges(graph)
+    assert all(counts[(v, u)] == count for (u, v), count in counts.items())
+
+
+def test_save_load(tmp_path, graph):
+    path = str(tmp_path / "graph")
+    graph.save(path)
+    for mmap_mode in ('r', None):
+        loaded = CayleyGraph.load(path, mmap_mode)
+        assert (loaded.p, loaded.q) == (graph.p, graph.q)
+        for name in ('generators', 'vertex_keys', 'indptr', 'indices'):
+            assert np.array_equal(getattr(loaded, name), getattr(graph, name))
+        assert loaded.index(graph.vertex(3)) == 3
+
+
+def test_memory_mapped_build(tmp_path):
+    path = str(tmp_path / "graph")
+    graph = cayley_graph(5, 13, path=path, chunk_size=100)
+    assert np.array_equal(CayleyGraph.load(path).indices, cayley_graph(5, 13).indices)
+    assert np.array_equal(graph.indices, cayley_graph(5, 13).indices)
+
+
+@pytest.mark.parametrize("p, q, error", [(2, 7, ValueError), (5, 5, ValueError), (9, 7, ValueError), (5, 2, ValueError), (5.0, 7, TypeError)])
+def test_prime_checks(p, q, error):
+    with pytest.raises(error):
+        generators(p, q)
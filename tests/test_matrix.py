@@ -0,0 +1,97 @@
+import random
+
+import pytest
+
+from conftest import random_quaternion
+from hurwitz.hurwitz import HurwitzQuaternion
+from hurwitz.matrix import HurwitzMatrix
+
+ZERO = HurwitzQuaternion(0, 0, 0, 0)
+
+
+def random_entries(rng: random.Random, rows: int, cols: int, bits: int) -> list:
+    return [[random_quaternion(rng, bits) for _ in range(cols)] for _ in range(rows)]
+
+
+def product(x: list, y: list) -> list:
+    # entrywise reference, sum over k of x[i][k] * y[k][j] in that order
+    result = []
+    for row in x:
+        out = []
+        for j in range(len(y[0])):
+            total = ZERO
+            for k, entry in enumerate(row):
+                total = total + entry * y[k][j]
+            out.append(total)
+        result.append(out)
+    return result
+
+
+def pivots(matrix: HurwitzMatrix) -> list:
+    # the column of the first non-zero entry of every row, None for zero rows
+    return [next((j for j in range(matrix.cols) if matrix[i, j] != ZERO), None) for i in range(matrix.rows)]
+
+
+@pytest.mark.parametrize("shape, bits", [((1, 1, 1), 8), ((3, 4, 2), 8), ((5, 5, 5), 30), ((4, 2, 6), 100)])
+def test_product_matches_entries(shape, bits):
+    rng = random.Random(bits)
+    n, m, p = shape
+    x, y = random_entries(rng, n, m, bits), random_entries(rng, m, p, bits)
+    assert (HurwitzMatrix(x) * HurwitzMatrix(y)).tolist() == product(x, y)
+
+
+def test_product_shape_error():
+    with pytest.raises(ValueError):
+        HurwitzMatrix([[1, 2]]) * HurwitzMatrix([[1, 2]])
+
+
+def test_scalars():
+    rng = random.Random(1)
+    x = random_entries(rng, 3, 2, 20)
+    q = random_quaternion(rng, 20, True)
+    assert (HurwitzMatrix(x) * q).tolist() == [[entry * q for entry in row] for row in x]
+    assert (q * HurwitzMatrix(x)).tolist() == [[q * entry for entry in row] for row in x]
+    assert (3 * HurwitzMatrix(x)).tolist() == [[entry * HurwitzQuaternion(3, 0, 0, 0) for entry in row] for row in x]
+
+
+@pytest.mark.parametrize("power", [0, 1, 2, 5, 8])
+def test_power_matches_repeated_product(power):
+    rng = random.Random(power)
+    x = random_entries(rng, 3, 3, 6)
+    expected = HurwitzMatrix.identity(3).tolist()
+    for _ in range(power):
+        expected = product(expected, x)
+    assert (HurwitzMatrix(x) ** power).tolist() == expected
+
+
+def test_power_errors():
+    with pytest.raises(ValueError):
+        HurwitzMatrix([[1, 2]]) ** 2
+    with pytest.raises(ValueError):
+        HurwitzMatrix([[1]]) ** -1
+
+
+@pytest.mark.parametrize("shape, bits", [((3, 3), 6), ((4, 6), 10), ((6, 3), 20), ((5, 5), 40)])
+def test_echelon_transform(shape, bits):
+    rng = random.Random(bits)
+    a = HurwitzMatrix(random_entries(rng, *shape, bits))
+    echelon, transform = a.echelon_form(transform=True)
+    assert transform * a == echelon
+    assert echelon == a.echelon_form()
+    columns = pivots(echelon)
+    found = [col for col in columns if col is not None]
+    # pivots move strictly right and the zero rows come last
+    assert found == sorted(set(found)) and columns[len(found):] == [None] * (len(columns) - len(found))
+    assert a.rank() == len(found)
+
+
+def test_echelon_dependent_rows():
+    rng = random.Random(2)
+    rows = random_entries(rng, 2, 4, 10)
+    q = random_quaternion(rng, 5)
+    # a left multiple of the first row plus the second, over the Hurwitz order the rank stays 2
+    rows.append([q * x + y for x, y in zip(rows[0], rows[1])])
+    a = HurwitzMatrix(rows)
+    echelon, transform = a.echelon_form(transform=True)
+    assert transform * a == echelon
+    assert pivots(echelon)[2] is None and a.rank() == 2
@@ -0,0 +1,95 @@
+import random
+
+import pytest
+
+from conftest import random_quaternion
+from hurwitz.hurwitz import UNIT_QUATERNIONS, HurwitzQuaternion
+from hurwitz.modular import HurwitzModElement, HurwitzModRing
+
+# primes, composites, a prime power and a modulus past 64 bits
+MODULI = (3, 101, 105, 9, 2 ** 61 - 1, 3 ** 50)
+
+
+def operands(n: int, count: int = 100) -> list:
+    rng = random.Random(n)
+    return [(random_quaternion(rng, rng.choice((4, 40, 100))), random_quaternion(rng, rng.choice((4, 40, 100))))
+            for _ in range(count)]
+
+
+@pytest.mark.parametrize("n", MODULI)
+def test_reduction_is_a_homomorphism(n):
+    ring = HurwitzModRing(n)
+    for x, y in operands(n):
+        assert ring(x + y) == ring(x) + ring(y)
+        assert ring(x - y) == ring(x) - ring(y)
+        assert ring(x * y) == ring(x) * ring(y)
+        assert ring(-x) == -ring(x)
+        assert ring(x.conjugate()) == ring(x).conjugate()
+        assert ring(x).reduced_norm() == x.reduced_norm() % n
+        # mixed operands are reduced first, on either side
+        assert ring(x) * y == ring(x * y) == x * ring(y)
+
+
+@pytest.mark.parametrize("n", MODULI)
+def test_powers(n):
+    ring = HurwitzModRing(n)
+    for x, _ in operands(n, 20):
+        for power in (0, 1, 2, 7, 30):
+            assert ring(x ** power) == ring(x) ** power
+        assert ring(pow(x, 10 ** 6, n)) == ring(x) ** 10 ** 6
+
+
+@pytest.mark.parametrize("n", MODULI)
+def test_inverse(n):
+    ring = HurwitzModRing(n)
+    invertible = 0
+    for x, _ in operands(n):
+        element = ring(x)
+        if element.invertible():
+            invertible += 1
+            assert element * element.inverse() == ring.one() == element.inverse() * element
+            assert element ** -3 * element ** 3 == ring.one()
+        else:
+            with pytest.raises(ValueError):
+                element.inverse()
+            with pytest.raises(ValueError):
+                element ** -1
+    assert invertible
+
+
+@pytest.mark.parametrize("n, value", [(101, (10, 1, 0, 0)), (105, (1, 1, 1, 0)), (9, (3, 0, 0, 0)), (101, (0, 0, 0, 0))])
+def test_non_invertible(n, value):
+    element = HurwitzModRing(n)(value)
+    assert not element.invertible()
+    with pytest.raises(ValueError):
+        element.inverse()
+
+
+def test_units():
+    ring = HurwitzModRing(3)
+    assert len(set(ring.units)) == 24
+    assert all(ring(unit).unitary() for unit in UNIT_QUATERNIONS)
+    for i, j in ((0, 5), (7, 11), (23, 23)):
+        assert ring.unit_multiplication(i, j) == ring(UNIT_QUATERNIONS[i] * UNIT_QUATERNIONS[j])
+
+
+def test_lift_and_half_quaternions():
+    ring = HurwitzModRing(101)
+    q = HurwitzQuaternion(1, 3, -5, 7, True)
+    assert ring(q) * 2 == ring(HurwitzQuaternion(1, 3, -5, 7))
+    assert ring(ring(q).lift()) == ring(q)
+    assert HurwitzModElement(ring, q) == ring(q)
+    assert HurwitzModRing(7)(HurwitzModRing(21)(q)) == HurwitzModRing(7)(q)
+
+
+def test_errors():
+    with pytest.raises(ValueError):
+        HurwitzModRing(10)
+    with pytest.raises(TypeError):
+        HurwitzModRing(7.0)
+    with pytest.raises(ValueError):
+        HurwitzModRing(7)(1) + HurwitzModRing(11)(1)
+    with pytest.raises(ValueError):
+        HurwitzModRing(7)(HurwitzModRing(11)(1))
+    with pytest.raises(TypeError):
+        HurwitzModRing(7)(1.5)
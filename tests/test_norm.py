@@ -0,0 +1,47 @@
+import random
+
+import pytest
+
+from conftest import random_quaternion
+from hurwitz.hurwitz import HurwitzQuaternion
+
+
+@pytest.mark.parametrize("bits", (1, 16, 200))
+def test_reduced_norm(bits):
+    rng = random.Random(bits)
+    for _ in range(200):
+        q = random_quaternion(rng, bits)
+        a, b, c, d = q.general
+        if q.half:
+            assert q.reduced_norm() == (q.a ** 2 + q.b ** 2 + q.c ** 2 + q.d ** 2) // 4
+        else:
+            assert q.reduced_norm() == a * a + b * b + c * c + d * d
+        assert q.reduced_norm() == (q * q.conjugate()).a
+        if bits <= 16:
+            # len() only takes values up to sys.maxsize
+            assert len(q) == q.reduced_norm()
+
+
+def test_norm_is_multiplicative():
+    rng = random.Random(0)
+    for _ in range(200):
+        x, y = random_quaternion(rng, 30), random_quaternion(rng, 30)
+        assert (x * y).reduced_norm() == x.reduced_norm() * y.reduced_norm()
+
+
+def test_cached_norm_cannot_go_stale():
+    q = HurwitzQuaternion(1, 0, 0, 0)
+    assert q.reduced_norm() == 1
+    with pytest.raises(AttributeError):
+        q.a = 3
+    with pytest.raises(AttributeError):
+        q._reduced_norm = 5
+    assert q.reduced_norm() == 1 and q.norm() == 1.0
+
+
+def test_truthiness():
+    for q in (HurwitzQuaternion(2 ** 40, 0, 0, 0), HurwitzQuaternion(0, 0, 0, -2 ** 200), HurwitzQuaternion(1, 1, 1, 1, True)):
+        assert q and bool(q)
+    assert not HurwitzQuaternion(0, 0, 0, 0)
+    with pytest.raises(OverflowError):
+        len(HurwitzQuaternion(2 ** 40, 0, 0, 0))
@@ -0,0 +1,107 @@
+import itertools
+import random
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from conftest import random_quaternion
+from hurwitz import parallel
+from hurwitz.hurwitz import HurwitzQuaternion
+from hurwitz.parallel import batch_divide, batch_factorize, batch_gcd
+
+# a chunk size that does not divide the input, so the last chunk is short
+CHUNK = 7
+COUNT = 60
+
+
+def pairs(bits: int = 60) -> list:
+    rng = random.Random(bits)
+    result = [(random_quaternion(rng, bits), random_quaternion(rng, bits // 2)) for _ in range(COUNT)]
+    return [(a, b if b else HurwitzQuaternion(1, 0, 0, 0)) for a, b in result]
+
+
+@pytest.fixture(scope='module')
+def pool():
+    with ProcessPoolExecutor(2) as executor:
+        yield executor
+
+
+@pytest.mark.parametrize("left, pro_max", [(False, False), (True, False), (False, True)])
+def test_batch_divide(pool, left, pro_max):
+    operands = pairs()
+    if pro_max:
+        expected = [a.euclidean_division_pro_max(b) for a, b in operands]
+    elif left:
+        expected = [a.left_euclidean_division(b) for a, b in operands]
+    else:
+        expected = [a.euclidean_division(b) for a, b in operands]
+    assert list(batch_divide(operands, chunk_size=CHUNK, left=left, pro_max=pro_max, executor=pool)) == expected
+
+
+@pytest.mark.parametrize("left", [False, True])
+def test_batch_gcd(pool, left):
+    operands = pairs(100)
+    if left:
+        expected = [a.left_extended_gcd(b) for a, b in operands]
+    else:
+        expected = [a.right_extended_gcd(b) for a, b in operands]
+    assert list(batch_gcd(operands, chunk_size=CHUNK, left=left, extended=True, executor=pool)) == expected
+    assert list(batch_gcd(operands, chunk_size=CHUNK, left=left, executor=pool)) == [d for d, _, _ in expected]
+
+
+def test_batch_factorize(pool):
+    rng = random.Random(0)
+    quaternions = [q for q in (random_quaternion(rng, 12) for _ in range(COUNT)) if q]
+    expected = [q.factorize() for q in quaternions]
+    assert list(batch_factorize(iter(quaternions), chunk_size=CHUNK, executor=pool)) == expected
+
+
+def test_own_pool():
+    operands = pairs()
+    assert list(batch_divide(operands, workers=2, chunk_size=CHUNK)) == [a.euclidean_division(b) for a, b in operands]
+
+
+def test_errors_propagate(pool):
+    operands = pairs()
+    operands[20] = (operands[20][0], HurwitzQuaternion(0, 0, 0, 0))
+    results = batch_divide(operands, chunk_size=CHUNK, executor=pool)
+    with pytest.raises(ZeroDivisionError):
+        list(results)
+
+
+class RecordingPool(ThreadPoolExecutor):
+    # stands in for the process pool a batch function creates, remembering whether it was shut down
+    instances = []
+
+    def __init__(self, max_workers=None) -> None:
+        super().__init__(max_workers)
+        self.closed = False
+        RecordingPool.instances.append(self)
+
+    def shutdown(self, *args, **kwargs) -> None:
+        self.closed = True
+        super().shutdown(*args, **kwargs)
+
+
+def test_close_shuts_down_own_pool(monkeypatch):
+    monkeypatch.setattr(parallel, 'ProcessPoolExecutor', RecordingPool)
+    RecordingPool.instances.clear()
+    a, b = pairs()[0]
+    consumed = itertools.count()
+    endless = ((a, b) for _ in consumed)
+    results = batch_divide(endless, workers=2, chunk_size=CHUNK)
+    assert next(results) == a.euclidean_division(b)
+    results.close()
+    [pool] = RecordingPool.instances
+    assert pool.closed
+    # only the chunks in flight were read ahead, 2 * workers of them plus the one being cut
+    assert next(consumed) <= (2 * 2 + 1) * CHUNK + 1
+
+
+def test_close_keeps_shared_pool():
+    with ThreadPoolExecutor(2) as executor:
+        operands = pairs()
+        results = batch_divide(operands, chunk_size=CHUNK, executor=executor)
+        next(results)
+        results.close()
+        assert list(batch_divide(operands, chunk_size=CHUNK, executor=executor)) == [a.euclidean_division(b) for a, b in operands]
@@ -0,0 +1,76 @@
+import random
+
+import pytest
+
+from conftest import random_quaternion
+from hurwitz.hurwitz import HurwitzQuaternion
+from hurwitz.polynomial import KARATSUBA_THRESHOLD, HurwitzPolynomial
+
+ZERO = HurwitzQuaternion(0, 0, 0, 0)
+
+
+def random_coefficients(rng: random.Random, count: int, bits: int) -> list:
+    coefficients = [random_quaternion(rng, bits) for _ in range(count)]
+    # a non-zero leading coefficient keeps the degree at count - 1
+    if coefficients[-1] == ZERO:
+        coefficients[-1] = HurwitzQuaternion(1, 0, 0, 0)
+    return coefficients
+
+
+def schoolbook(x: list, y: list) -> list:
+    out = [ZERO] * (len(x) + len(y) - 1)
+    for i, a in enumerate(x):
+        for j, b in enumerate(y):
+            out[i + j] = out[i + j] + a * b
+    return out
+
+
+@pytest.mark.parametrize("lengths", [
+    (1, 1), (3, 5), (KARATSUBA_THRESHOLD, KARATSUBA_THRESHOLD), (KARATSUBA_THRESHOLD + 1, KARATSUBA_THRESHOLD + 1),
+    (100, 100), (77, 130),
+    # lopsided factors, one side below the threshold or far shorter than the other
+    (5, 200), (200, 5), (40, 300), (300, 40),
+])
+def test_product_matches_schoolbook(lengths):
+    rng = random.Random(sum(lengths))
+    x, y = (random_coefficients(rng, count, 20) for count in lengths)
+    product = HurwitzPolynomial(x) * HurwitzPolynomial(y)
+    assert product.tolist() == schoolbook(x, y)
+    assert product.degree == sum(lengths) - 2
+
+
+def test_large_coefficients():
+    rng = random.Random(3)
+    x, y = random_coefficients(rng, 70, 200), random_coefficients(rng, 45, 200)
+    assert (HurwitzPolynomial(x) * HurwitzPolynomial(y)).tolist() == schoolbook(x, y)
+
+
+def test_scalars_and_zero():
+    rng = random.Random(4)
+    x = random_coefficients(rng, 10, 20)
+    q = random_quaternion(rng, 20, True)
+    assert (HurwitzPolynomial(x) * q).tolist() == [c * q for c in x]
+    assert (q * HurwitzPolynomial(x)).tolist() == [q * c for c in x]
+    zero = HurwitzPolynomial([])
+    assert zero.degree == -1 and (zero * HurwitzPolynomial(x)).degree == -1
+
+
+@pytest.mark.parametrize("power", [0, 1, 3, 6])
+def test_power(power):
+    rng = random.Random(power)
+    x = random_coefficients(rng, 8, 6)
+    expected = [HurwitzQuaternion(1, 0, 0, 0)]
+    for _ in range(power):
+        expected = schoolbook(expected, x)
+    assert (HurwitzPolynomial(x) ** power).tolist() == expected
+
+
+def test_evaluate():
+    rng = random.Random(5)
+    x = random_coefficients(rng, 12, 10)
+    q = random_quaternion(rng, 10)
+    expected, power = ZERO, HurwitzQuaternion(1, 0, 0, 0)
+    for c in x:
+        expected = expected + c * power
+        power = power * q
+    assert HurwitzPolynomial(x).evaluate(q) == expected
@@ -0,0 +1,90 @@
+import random
+from functools import reduce
+
+import pytest
+
+from conftest import random_quaternion
+from hurwitz.hurwitz import UNIT_QUATERNIONS, HurwitzQuaternion
+from hurwitz.modular import HurwitzModRing
+
+ONE = HurwitzQuaternion(1, 0, 0, 0)
+POWERS = (0, 1, 2, 3, 7, 16, 33)
+
+
+def repeated(q: HurwitzQuaternion, power: int) -> HurwitzQuaternion:
+    return reduce(lambda x, y: x * y, [q] * power, ONE)
+
+
+@pytest.mark.parametrize("half", [False, True])
+@pytest.mark.parametrize("bits", [2, 30, 100])
+def test_matches_repeated_multiplication(half, bits):
+    rng = random.Random(bits)
+    for _ in range(10):
+        q = random_quaternion(rng, bits, half)
+        for power in POWERS:
+            assert q ** power == repeated(q, power)
+    assert (q ** 0).doubled() == (2, 0, 0, 0) and not (q ** 0).half
+
+
+def test_negative_powers_of_units():
+    for unit in UNIT_QUATERNIONS:
+        for power in (1, 2, 5, 12):
+            assert unit ** -power == repeated(unit.inverse(), power)
+            assert unit ** -power * unit ** power == ONE
+            assert pow(unit, -power, 7) == pow(unit.inverse(), power, 7)
+
+
+@pytest.mark.parametrize("q", [HurwitzQuaternion(1, 1, 0, 0), HurwitzQuaternion(2, 0, 0, 0), HurwitzQuaternion(1, 1, 1, 3, True)])
+def test_negative_powers_of_non_units(q):
+    with pytest.raises(ValueError):
+        q ** -1
+    with pytest.raises(ValueError):
+        pow(q, -3, 7)
+
+
+@pytest.mark.parametrize("modulo", [2, 10, 2 ** 64, 7, 101, 2 ** 61 - 1])
+def test_modular_whole_bases(modulo):
+    rng = random.Random(modulo)
+    for _ in range(10):
+        q = random_quaternion(rng, 40, False)
+        for power in POWERS:
+            result, expected = pow(q, power, modulo), q ** power
+            assert not result.half
+            assert (result.a, result.b, result.c, result.d) == tuple(
+                val % modulo for val in (expected.a, expected.b, expected.c, expected.d))
+
+
+@pytest.mark.parametrize("modulo", [3, 7, 101, 2 ** 61 - 1, 3 ** 40])
+def test_modular_half_bases(modulo):
+    rng = random.Random(modulo)
+    ring = HurwitzModRing(modulo)
+    for _ in range(10):
+        q = random_quaternion(rng, 40, True)
+        for power in POWERS:
+            result = pow(q, power, modulo)
+            # a whole quaternion congruent to q^power mod m, coefficients in [0, m)
+            assert not result.half and all(0 <= val < modulo for val in (result.a, result.b, result.c, result.d))
+            assert ring(result) == ring(q ** power)
+
+
+def test_large_exponent_modulo():
+    q = HurwitzQuaternion(3, 5, 7, 9, True)
+    ring = HurwitzModRing(101)
+    assert ring(pow(q, 10 ** 30, 101)) == ring(q) ** 10 ** 30
+
+
+@pytest.mark.parametrize("modulo", [2, 4, 10, 2 ** 64])
+def test_half_base_even_modulus(modulo):
+    with pytest.raises(ValueError):
+        pow(HurwitzQuaternion(1, 3, 5, 7, True), 3, modulo)
+
+
+def test_errors():
+    q = HurwitzQuaternion(1, 2, 3, 4)
+    with pytest.raises(TypeError):
+        q ** 1.5
+    with pytest.raises(TypeError):
+        pow(q, 2, 2.0)
+    for modulo in (0, -5):
+        with pytest.raises(ValueError):
+            pow(q, 2, modulo)
@@ -0,0 +1,75 @@
+import pickle
+
+import pytest
+
+from hurwitz.hurwitz import UNIT_QUATERNIONS, HurwitzQuaternion
+
+
+@pytest.fixture
+def intern_cache():
+    HurwitzQuaternion.set_intern_cache(maxsize=64, max_norm=16)
+    yield
+    HurwitzQuaternion.set_intern_cache(maxsize=0)
+
+
+@pytest.mark.parametrize("name", ("a", "b", "c", "d", "half", "_reduced_norm"))
+def test_immutable(name):
+    q = HurwitzQuaternion(1, 2, 3, 4)
+    with pytest.raises(AttributeError):
+        setattr(q, name, 7)
+    with pytest.raises(AttributeError):
+        delattr(q, name)
+    assert q.doubled() == (2, 4, 6, 8)
+
+
+def test_shared_units_stay_intact():
+    # power 0, inverse, unit_multiplication and decompose hand out the shared unit objects
+    one = HurwitzQuaternion(5, 0, 0, 0) ** 0
+    with pytest.raises(AttributeError):
+        one.a = 7
+    i = HurwitzQuaternion(0, 1, 0, 0)
+    with pytest.raises(AttributeError):
+        i.inverse().b = 9
+    assert HurwitzQuaternion(2, 3, 4, 5) ** 0 == HurwitzQuaternion(1, 0, 0, 0)
+    assert i.inverse() == HurwitzQuaternion(0, -1, 0, 0)
+    assert HurwitzQuaternion(0, 2, 0, 0).decompose() == [i, i]
+    assert UNIT_QUATERNIONS[0].reduced_norm() == 1
+
+
+def test_interned_associates_stay_intact(intern_cache):
+    q = HurwitzQuaternion(1, 2, 0, 0)
+    for associate in q.associates():
+        with pytest.raises(AttributeError):
+            associate.a = 0
+    assert q.canonical_associate() is q.canonical_associate()
+    assert HurwitzQuaternion.intern_cache_info().hits > 0
+
+
+def test_equality_and_hash():
+    whole, half = HurwitzQuaternion(1, 1, 1, 1), HurwitzQuaternion(1, 1, 1, 1, True)
+    assert whole != half
+    assert HurwitzQuaternion(2, 2, 2, 2, True) == whole
+    assert hash(HurwitzQuaternion(2, 2, 2, 2, True)) == hash(whole)
+    assert len({whole, half, HurwitzQuaternion._from_doubled(2, 2, 2, 2)}) == 2
+
+
+def test_pickle():
+    for q in (HurwitzQuaternion(1, -2, 3, 4), HurwitzQuaternion(1, 3, -5, 7, True)):
+        assert pickle.loads(pickle.dumps(q)) == q
+
+
+def test_constructor_errors():
+    with pytest.raises(TypeError):
+        HurwitzQuaternion(1.0, 2, 3, 4)
+    with pytest.raises(ValueError):
+        HurwitzQuaternion(1, 2, 3, 5, True)
+
+
+@pytest.mark.parametrize("scale", [2.0 ** 52, 2.0 ** 60, 2.0 ** 80])
+def test_snap_large_magnitude(scale):
+    q = HurwitzQuaternion(1, 0, 0, 0).snap((scale, .3, .3, .3))
+    assert not q.half and q.doubled() == (int(2 * scale), 0, 0, 0)
+    q = HurwitzQuaternion(1, 0, 0, 0).snap((scale, .5, .5, .5))
+    assert q.half and q.doubled() == (int(2 * scale) + 1, 1, 1, 1)
+    assert q == HurwitzQuaternion._from_doubled(*q.doubled())
+    assert 4 * q.reduced_norm() == (int(2 * scale) + 1) ** 2 + 3
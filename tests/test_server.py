@@ -0,0 +1,121 @@
+import asyncio
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from conftest import random_quaternion
+from hurwitz.hurwitz import HurwitzQuaternion
+from hurwitz import server
+from hurwitz.server import MAX_BITS, MAX_EXPONENT, HurwitzClient, HurwitzServer, RemoteError, _parse
+
+
+def serve(test, **options):
+    # runs test(client) against a server on a free port, with a thread pool instead of processes
+    async def run():
+        with ThreadPoolExecutor(2) as executor:
+            async with HurwitzServer(executor=executor, **options) as server:
+                async with await HurwitzClient.connect(server.host, server.port) as client:
+                    return await test(client)
+    return asyncio.run(run())
+
+
+def test_operations():
+    rng = random.Random(20)
+    pairs = [(random_quaternion(rng, 40), random_quaternion(rng, 20)) for _ in range(30)]
+
+    async def test(client):
+        divisions = await asyncio.gather(*(client.divide(a, b) for a, b in pairs))
+        assert divisions == [a.euclidean_division(b) for a, b in pairs]
+        gcds = await asyncio.gather(*(client.gcd(a, b, extended=True) for a, b in pairs))
+        assert gcds == [a.right_extended_gcd(b) for a, b in pairs]
+        a = pairs[0][0]
+        assert await client.power(a, 5) == a ** 5
+        assert await client.power(a, 10 ** 6, 101) == pow(a, 10 ** 6, 101)
+        metrics = await client.metrics()
+        assert metrics['operations']['divide']['count'] == len(pairs)
+    serve(test)
+
+
+@pytest.mark.parametrize("request_, error", [
+    ({'op': 'power', 'q': [2, 0, 0, 0], 'power': MAX_EXPONENT + 1}, ValueError),
+    ({'op': 'power', 'q': [2, 0, 0, 0], 'power': -MAX_EXPONENT - 1}, ValueError),
+    ({'op': 'power', 'q': [4, 0, 0, 0], 'power': -1}, ValueError),
+    ({'op': 'power', 'q': [20, 20, 20, 20], 'power': MAX_EXPONENT}, ValueError),
+    ({'op': 'power', 'q': [1, 1, 1, 1], 'power': 3, 'modulo': 10}, ValueError),
+    ({'op': 'power', 'q': [2, 0, 0, 0], 'power': 3, 'modulo': 0}, ValueError),
+    ({'op': 'divide', 'a': [2, 0, 0, 0], 'b': [0, 0, 0, 0]}, ZeroDivisionError),
+    ({'op': 'factorize', 'q': [0, 0, 0, 0]}, ValueError),
+    ({'op': 'factorize', 'q': [1, 2, 3, 4]}, ValueError),
+    ({'op': 'factorize', 'q': [2 * (2 ** 89 - 1), 0, 0, 0]}, ValueError),
+    ({'op': 'divide', 'a': [2 ** (MAX_BITS + 1), 0, 0, 0], 'b': [2, 0, 0, 0]}, ValueError),
+    ({'op': 'gcd', 'a': [2, 0, 0, 0], 'b': [-2 ** (MAX_BITS + 1), 0, 0, 0]}, ValueError),
+    ({'op': 'power', 'q': [2 ** (MAX_BITS + 1), 0, 0, 0], 'power': 1, 'modulo': 3}, ValueError),
+])
+def test_parse_rejects(request_, error):
+    with pytest.raises(error):
+        _parse(request_)
+
+
+def test_parse_accepts():
+    assert _parse({'op': 'power', 'q': [1, 1, 1, 1], 'power': -MAX_EXPONENT})[1] == ((1, 1, 1, 1), -MAX_EXPONENT, None)
+    assert _parse({'op': 'power', 'q': [4, 2, 0, 0], 'power': 10 ** 9, 'modulo': 7})[1] == ((4, 2, 0, 0), 10 ** 9, 7)
+    assert _parse({'op': 'power', 'q': [4, 2, 0, 0], 'power': 100}, max_exponent=100)[0] == ('power',)
+
+
+def test_errors_answered():
+    q = HurwitzQuaternion(1, 2, 3, 4)
+
+    async def test(client):
+        results = await asyncio.gather(client.power(q, 10 ** 12), client.divide(q, HurwitzQuaternion(0, 0, 0, 0)),
+                                       client.power(q, 10), return_exceptions=True)
+        assert isinstance(results[0], RemoteError) and results[0].type_name == 'ValueError'
+        assert isinstance(results[1], RemoteError) and results[1].type_name == 'ZeroDivisionError'
+        assert results[2] == q ** 10
+        with pytest.raises(RemoteError):
+            await client.power(q, 11)
+    serve(test, max_exponent=10)
+
+
+def test_power_bits():
+    assert _parse({'op': 'power', 'q': [20, 20, 20, 20], 'power': 1024})[0] == ('power',)
+    assert _parse({'op': 'power', 'q': [20, 20, 20, 20], 'power': MAX_EXPONENT, 'modulo': 10 ** 9})[0] == ('power',)
+    with pytest.raises(ValueError):
+        _parse({'op': 'power', 'q': [20, 20, 20, 20], 'power': 1024}, max_bits=1000)
+
+
+def test_unencodable_result_answered():
+    # past the int to str digit limit the response cannot be written, the caller still gets an answer
+    q = HurwitzQuaternion(10, 10, 10, 10)
+
+    async def test(client):
+        if hasattr(sys, 'get_int_max_str_digits'):
+            with pytest.raises(RemoteError) as error:
+                await client.power(q, 4096)
+            assert error.value.type_name == 'ValueError'
+        assert await client.power(q, 3) == q ** 3
+    serve(test, max_bits=10 ** 6)
+
+
+def test_norm_bits():
+    # N = (2^31 - 1)^2 has 62 bits
+    assert _parse({'op': 'factorize', 'q': [2 * (2 ** 31 - 1), 0, 0, 0]})[0] == ('factorize',)
+    with pytest.raises(ValueError):
+        _parse({'op': 'factorize', 'q': [2 * (2 ** 31 - 1), 0, 0, 0]}, max_norm_bits=32)
+
+
+def test_batch_timeout(monkeypatch):
+    def slow(chunk):
+        time.sleep(0.3)
+        return chunk
+    monkeypatch.setattr(server, '_chunk_function', lambda key: slow)
+    q = HurwitzQuaternion(1, 2, 3, 4)
+
+    async def test(client):
+        start = time.perf_counter()
+        with pytest.raises(RemoteError) as error:
+            await client.factorize(q)
+        assert error.value.type_name == 'TimeoutError' and time.perf_counter() - start < 0.25
+    serve(test, batch_timeout=0.05)
@@ -0,0 +1,119 @@
+import os
+import random
+
+import pytest
+
+from conftest import random_quaternion
+from hurwitz import hurwitz
+from hurwitz.hurwitz import HurwitzQuaternion, use_speedups
+
+# around the limits of the compiled core: 2^61 doubled coordinates for arithmetic, 2^30 for division
+BITS = (4, 28, 29, 30, 31, 59, 60, 61, 62, 63, 100)
+
+
+@pytest.fixture(params=[False, True], ids=["python", "compiled"])
+def core(request):
+    if request.param and hurwitz._speedups is None:
+        pytest.skip("the compiled core is not built")
+    use_speedups(request.param)
+    yield request.param
+    use_speedups(not os.environ.get('HURWITZ_PURE_PYTHON'))
+
+
+def outcome(fn):
+    # comparable result of fn(): quaternions by their stored values and half flag, exceptions by type and message
+    try:
+        result = fn()
+    except Exception as e:
+        return ("raised", type(e).__name__, str(e))
+
+    def flat(value):
+        if isinstance(value, HurwitzQuaternion):
+            return (type(value).__name__, value.a, value.b, value.c, value.d, value.half)
+        if isinstance(value, tuple):
+            return tuple(flat(val) for val in value)
+        return value
+    return flat(result)
+
+
+def operations(seed: int, count: int = 300) -> list:
+    rng = random.Random(seed)
+    ops = []
+    for _ in range(count):
+        x = random_quaternion(rng, rng.choice(BITS))
+        y = random_quaternion(rng, rng.choice(BITS))
+        values = [rng.getrandbits(rng.choice(BITS)) * rng.choice((1, -1)) for _ in range(4)]
+        ops += [
+            lambda x=x, y=y: x + y,
+            lambda x=x, y=y: x - y,
+            lambda x=x, y=y: x * y,
+            lambda x=x: x * 3,
+            lambda x=x: x * 2,
+            lambda x=x: x.reduced_norm(),
+            lambda x=x, y=y: x.euclidean_division(y),
+            lambda x=x, y=y: x.left_euclidean_division(y),
+            lambda v=values: HurwitzQuaternion(*v),
+            lambda v=values: HurwitzQuaternion(*v, half=True),
+            lambda v=values: HurwitzQuaternion(*(2 * val for val in v), True),
+            lambda v=values: HurwitzQuaternion(*(2 * val + 1 for val in v), half=1),
+            lambda v=values: HurwitzQuaternion._make(*v),
+            lambda v=values: HurwitzQuaternion._from_doubled(*(2 * val for val in v)),
+            lambda x=x: HurwitzQuaternion._from_doubled(*x.doubled()),
+        ]
+    return ops
+
+
+ERRORS = [
+    lambda: HurwitzQuaternion(1, 2, 3, 4).euclidean_division(HurwitzQuaternion(0, 0, 0, 0)),
+    lambda: HurwitzQuaternion(1, 2, 3, 4).left_euclidean_division(HurwitzQuaternion(0, 0, 0, 0)),
+    lambda: HurwitzQuaternion(1, 2, 3, 4).euclidean_division(5),
+    lambda: HurwitzQuaternion(1.0, 2, 3, 4),
+    lambda: HurwitzQuaternion(1, 2, 3, 4.0, True),
+    lambda: HurwitzQuaternion(1, 2, 3, 5, True),
+    lambda: HurwitzQuaternion(1, 2, 3),
+    lambda: HurwitzQuaternion(1, 2, 3, 4) + 1,
+    lambda: HurwitzQuaternion(1, 2, 3, 4) * "x",
+]
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_matches_pure_python(core, seed):
+    ops = operations(seed)
+    use_speedups(False)
+    expected = [outcome(op) for op in ops]
+    use_speedups(core)
+    assert [outcome(op) for op in ops] == expected
+
+
+@pytest.mark.parametrize("error", range(len(ERRORS)))
+def test_errors(core, error):
+    use_speedups(False)
+    expected = outcome(ERRORS[error])
+    use_speedups(core)
+    assert expected[0] == "raised"
+    assert outcome(ERRORS[error]) == expected
+
+
+@pytest.mark.parametrize("bits", BITS)
+def test_arithmetic_at_the_limits(core, bits):
+    rng = random.Random(bits)
+    mul = HurwitzQuaternion.general_quaternion_multiplication
+    for _ in range(100):
+        x, y = random_quaternion(rng, bits), random_quaternion(rng, bits)
+        dx, dy = x.doubled(), y.doubled()
+        assert (x + y).doubled() == tuple(p + q for p, q in zip(dx, dy))
+        assert (x - y).doubled() == tuple(p - q for p, q in zip(dx, dy))
+        assert (x * y).doubled() == tuple(val // 2 for val in mul(dx, dy))
+        assert x.reduced_norm() == sum(val * val for val in dx) // 4
+        q, r = x.euclidean_division(y)
+        assert q * y + r == x and r.reduced_norm() < y.reduced_norm()
+        q, r = x.left_euclidean_division(y)
+        assert y * q + r == x and r.reduced_norm() < y.reduced_norm()
+
+
+def test_use_speedups_switches_methods(core):
+    installed = {name: HurwitzQuaternion.__dict__[name] for name in hurwitz.PURE_PYTHON}
+    if core:
+        assert not any(installed[name] is method for name, method in hurwitz.PURE_PYTHON.items())
+    else:
+        assert all(installed[name] is method for name, method in hurwitz.PURE_PYTHON.items())
@@ -0,0 +1,47 @@
+import random
+
+import pytest
+
+from conftest import random_quaternion
+from hurwitz.hurwitz import HurwitzQuaternion
+from hurwitz.store import HurwitzStore, decode_varint_record, encode_varint_record
+
+
+@pytest.mark.parametrize("width, half, bits", [(4, True, 30), (4, False, 30), (8, True, 62), (8, False, 62), (0, True, 200)])
+def test_roundtrip(tmp_path, width, half, bits):
+    rng = random.Random(bits)
+    quaternions = [random_quaternion(rng, rng.randrange(1, bits), half and None) for _ in range(300)]
+    path = str(tmp_path / "store.hq")
+    store = HurwitzStore.write(path, quaternions, width=width, half=half)
+    assert list(store) == quaternions
+    assert store[7] == quaternions[7] and store[-1] == quaternions[-1]
+    assert store[10:20] == quaternions[10:20]
+    store.close()
+    with HurwitzStore(path, 'a') as store:
+        store.append(quaternions[0])
+    store = HurwitzStore(path)
+    assert len(store) == 301 and store[300] == quaternions[0]
+    store.close()
+
+
+@pytest.mark.parametrize("width, value", [(4, 2 ** 31 - 1), (4, -2 ** 31), (4, 2 ** 30 + 1), (8, 2 ** 62 + 1), (8, -2 ** 63)])
+def test_to_array_whole_extremes(tmp_path, width, value):
+    pytest.importorskip("numpy")
+    q = HurwitzQuaternion(value, 0, 1, -1)
+    store = HurwitzStore.write(str(tmp_path / "store.hq"), [q, HurwitzQuaternion(1, 2, 3, 4)], width=width, half=False)
+    assert list(store.to_array()) == [q, HurwitzQuaternion(1, 2, 3, 4)]
+    store.close()
+
+
+def test_overflow(tmp_path):
+    with HurwitzStore(str(tmp_path / "store.hq"), 'w', width=4) as store:
+        with pytest.raises(OverflowError):
+            store.append(HurwitzQuaternion(2 ** 40, 0, 0, 0))
+        with pytest.raises(ValueError):
+            HurwitzStore(str(tmp_path / "whole.hq"), 'w', half=False).append(HurwitzQuaternion(1, 1, 1, 1, True))
+
+
+def test_varint_records():
+    for coordinates in [(0, 1, -1, 2 ** 100), (-2 ** 63, 127, 128, -129)]:
+        record = encode_varint_record(coordinates)
+        assert decode_varint_record(record + b'\xff', 0) == (coordinates, len(record))